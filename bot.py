@@ -1,154 +1,120 @@
 import discord
-from discord.ext import tasks
 import os
 import asyncio
-from datetime import datetime, timedelta
-import pytz
-
-# === ENABLE/DISABLE EVENTS ===
-ENABLE_48H_EVENTS = True
-ENABLE_WEEKLY_EVENTS = False
-ENABLE_BIWEEKLY_EVENTS = True
-ENABLE_4WEEKLY_EVENTS = True
-ENABLE_TEST_ALERT = False  # Set to True to enable test alerts every 5 minutes
-ENABLE_DAILY_SUMMARY = True  # Set to True to send daily event summary at 00:00 UTC
+import hashlib
+import io
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from reminders.alerts import InvalidAlert, validate_custom_alert
+from reminders.config import (
+    CATCH_UP_GRACE_MINUTES, COLLAPSE_MISSED_ALERTS, ENABLE_DAILY_SUMMARY, ENABLE_TEST_ALERT, EVENTS,
+    SCHEDULE_DIR, SCHEDULE_PATH, SCHEDULE_POLL_SECONDS,
+)
+from reminders.events import EVENT_KINDS, format_offsets
+from reminders.guilds import GuildManager
+from reminders.leader import LeaderLease
+from reminders.lifecycle import Lifecycle
+from reminders.metrics import MetricsServer, SchedulerMetrics
+from reminders.outbound import FanOut, Outbox
+from reminders.schedule import ScheduleError
+from reminders.service import next_alert_time
+from reminders.store import Store
 
 TOKEN = os.getenv("TOKEN")
-CHANNEL_ID = int(os.getenv("CHANNEL_ID"))
+CHANNEL_ID = int(os.getenv("CHANNEL_ID", "0"))  # Optional: alert channel of a single-server install, set up on first start
 GUILD_ID = os.getenv("GUILD_ID")  # Optional: Set your server ID for instant command sync
+DB_PATH = os.getenv("DB_PATH", "reminders.db")  # SQLite file holding custom alerts and the delivery ledger
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))  # Prometheus endpoint; 0 disables it
 
 intents = discord.Intents.default()
-bot = discord.Client(intents=intents)
+bot = discord.AutoShardedClient(intents=intents)
 tree = discord.app_commands.CommandTree(bot)
 
-UTC = pytz.UTC
-
-# ====================================================================
-# === EVENT CONFIGURATION - EDIT THIS SECTION FOR ALL YOUR EVENTS ===
-# ====================================================================
-
-# 48-HOUR EVENTS
-EVENT_48H_1_NAME = "🐻 Bear 1"
-EVENT_48H_1_START = datetime(2026, 2, 13, 11, 30, 0)
-EVENT_48H_1_ALERT_BEFORE = 10
-EVENT_48H_1_MESSAGE = "@everyone 🐻 Bear 1 starts in {ALERT_MINUTES} minutes!"
-
-EVENT_48H_2_NAME = "🐻 Bear 2"
-EVENT_48H_2_START = datetime(2026, 2, 13, 20, 0, 0)
-EVENT_48H_2_ALERT_BEFORE = 10
-EVENT_48H_2_MESSAGE = "@everyone 🐻 Bear 2 starts in {ALERT_MINUTES} minutes!"
-
-# WEEKLY EVENTS
-WEEKLY_1_NAME = "⚔️ Weekly Event 1"
-WEEKLY_1_DAY = 6  # 0=Monday, 6=Sunday
-WEEKLY_1_HOUR = 14
-WEEKLY_1_MINUTE = 0
-WEEKLY_1_ALERT_BEFORE = 10
-WEEKLY_1_MESSAGE = "@everyone ⚔️ Weekly Event 1 starts in {ALERT_MINUTES} minutes!"
-
-WEEKLY_2_NAME = "🎯 Weekly Event 2"
-WEEKLY_2_DAY = 2  # Wednesday
-WEEKLY_2_HOUR = 20
-WEEKLY_2_MINUTE = 0
-WEEKLY_2_ALERT_BEFORE = 10
-WEEKLY_2_MESSAGE = "@everyone 🎯 Weekly Event 2 starts in {ALERT_MINUTES} minutes!"
-
-# BIWEEKLY EVENTS
-BIWEEKLY_1_NAME = "⚔️ Foundry legion 2"
-BIWEEKLY_1_REFERENCE = datetime(2026, 2, 8, 12, 0, 0)
-BIWEEKLY_1_DAY = 6  # Sunday
-BIWEEKLY_1_HOUR = 12
-BIWEEKLY_1_MINUTE = 0
-BIWEEKLY_1_ALERT_BEFORE = 10
-BIWEEKLY_1_MESSAGE = "@everyone ⚔️ Foundry legion 2 starts in {ALERT_MINUTES} minutes!"
-
-BIWEEKLY_2_NAME = "⚔️ Foundry legion 1"
-BIWEEKLY_2_REFERENCE = datetime(2026, 2, 8, 20, 0, 0)
-BIWEEKLY_2_DAY = 6  # Sunday
-BIWEEKLY_2_HOUR = 19
-BIWEEKLY_2_MINUTE = 0
-BIWEEKLY_2_ALERT_BEFORE = 10
-BIWEEKLY_2_MESSAGE = "@everyone ⚔️ Foundry legion 1 starts in {ALERT_MINUTES} minutes!"
-
-BIWEEKLY_3_NAME = "😈 Crazy Joe (Tuesday)"
-BIWEEKLY_3_REFERENCE = datetime(2026, 1, 27, 12, 0, 0)
-BIWEEKLY_3_DAY = 1  # Tuesday
-BIWEEKLY_3_HOUR = 12
-BIWEEKLY_3_MINUTE = 0
-BIWEEKLY_3_ALERT_BEFORE = 10
-BIWEEKLY_3_MESSAGE = "@everyone 😈 Crazy Joe starts in {ALERT_MINUTES} minutes!"
-
-BIWEEKLY_4_NAME = "😈 Crazy Joe (Thursday)"
-BIWEEKLY_4_REFERENCE = datetime(2026, 1, 29, 20, 0, 0)
-BIWEEKLY_4_DAY = 3  # Thursday
-BIWEEKLY_4_HOUR = 20
-BIWEEKLY_4_MINUTE = 0
-BIWEEKLY_4_ALERT_BEFORE = 10
-BIWEEKLY_4_MESSAGE = "@everyone 😈 Crazy Joe starts in {ALERT_MINUTES} minutes!"
-
-# 4-WEEKLY EVENTS
-FOURWEEKLY_1_NAME = "✈️ Canyon legion 1"
-FOURWEEKLY_1_REFERENCE = datetime(2026, 1, 24, 12, 0, 0)
-FOURWEEKLY_1_DAY = 5  # Saturday
-FOURWEEKLY_1_HOUR = 12
-FOURWEEKLY_1_MINUTE = 0
-FOURWEEKLY_1_ALERT_BEFORE = 10
-FOURWEEKLY_1_MESSAGE = "@everyone ✈️ Canyon legion 1 starts in {ALERT_MINUTES} minutes!"
-
-FOURWEEKLY_2_NAME = "✈️ Canyon legion 2"
-FOURWEEKLY_2_REFERENCE = datetime(2026, 1, 24, 20, 0, 0)
-FOURWEEKLY_2_DAY = 5  # Saturday
-FOURWEEKLY_2_HOUR = 19
-FOURWEEKLY_2_MINUTE = 0
-FOURWEEKLY_2_ALERT_BEFORE = 10
-FOURWEEKLY_2_MESSAGE = "@everyone ✈️ Canyon legion 2 starts in {ALERT_MINUTES} minutes!"
-
-# ====================================================================
-# === END OF EVENT CONFIGURATION ===
-# ====================================================================
-
-# === TRACK LAST RUN TIMES ===
-last_run = {
-    '48h_event_1': None,
-    '48h_event_2': None,
-    'weekly_event_1': None,
-    'weekly_event_2': None,
-    'biweekly_event_1': None,
-    'biweekly_event_2': None,
-    'biweekly_event_3': None,
-    'biweekly_event_4': None,
-    '4weekly_event_1': None,
-    '4weekly_event_2': None,
-    'test_alert': None,
-    'daily_summary': None
-}
-
-# === CUSTOM ONE-TIME ALERTS ===
-custom_alerts = []  # List of tuples: (datetime, name, message, alert_before_minutes)
-
-async def send_message(message):
+UTC = timezone.utc
+
+# === METRICS ===
+# Served in Prometheus text format at http://METRICS_HOST:METRICS_PORT/metrics
+metrics = SchedulerMetrics()
+metrics_server = MetricsServer(metrics.render, METRICS_HOST, METRICS_PORT)
+
+class RateLimitCounter(logging.Handler):
+    """discord.py retries 429s itself and only logs them, so count them from its log"""
+
+    def emit(self, record):
+        if "rate limited" in record.getMessage():
+            metrics.rate_limited.inc()
+
+logging.getLogger("discord.http").addHandler(RateLimitCounter(logging.WARNING))
+
+# === OUTBOUND MESSAGES ===
+# Alerts are queued and posted by a single sender task, which merges messages
+# for the same channel and paces posts per channel.
+channel_cache = {}  # channel ID -> channel fetched over HTTP (not in the gateway cache)
+
+async def resolve_channel(channel_id):
+    """Find a channel in the gateway cache, falling back to a cached HTTP fetch"""
+    channel = bot.get_channel(channel_id) or channel_cache.get(channel_id)
+    if channel is None:
+        channel = await bot.fetch_channel(channel_id)
+        channel_cache[channel_id] = channel
+    return channel
+
+async def deliver_message(channel_id, message):
     await bot.wait_until_ready()
-    channel = bot.get_channel(CHANNEL_ID)
-    if channel:
+    channel = await resolve_channel(channel_id)
+    started = time.perf_counter()
+    try:
         await channel.send(message)
+    except discord.HTTPException as e:
+        # 429s are counted from discord.py's log (RateLimitCounter), which sees every one
+        metrics.send_failures.inc(error=type(e).__name__)
+        raise
+    finally:
+        metrics.send_latency.observe(time.perf_counter() - started)
+
+def retryable(error):
+    """Rate limits and server errors may pass; other 4xx errors (bad request, missing permissions, deleted channel) won't fix themselves"""
+    if isinstance(error, discord.HTTPException):
+        return error.status == 429 or not 400 <= error.status < 500
+    return True
+
+outbox = Outbox(deliver_message, retryable=retryable)
+
+async def send_message(channel_id, message):
+    """Queue a message for a channel; returns without waiting for the post"""
+    outbox.enqueue(channel_id, message)
+
+# === DIRECT MESSAGES ===
+# Members subscribed to an event get a DM when its alert fires, sent by a
+# small pool of workers so thousands of subscribers never hold up alerts.
+dm_channels = {}  # user ID -> DM channel ID
+dms_closed = set()  # users whose DMs rejected us; skipped until they subscribe again
+
+async def deliver_dm(user_id, message):
+    channel_id = dm_channels.get(user_id)
+    if channel_id is None:
+        user = bot.get_user(user_id) or await bot.fetch_user(user_id)
+        channel_id = dm_channels[user_id] = (await user.create_dm()).id
+    await bot.get_partial_messageable(channel_id).send(message)
+
+def dm_failed(user_id, error):
+    if isinstance(error, discord.Forbidden):
+        dms_closed.add(user_id)  # DMs closed or the bot is blocked
+    else:
+        print(f"⚠️ Failed to DM user {user_id}: {error!r}")
 
-def should_run_event(event_key, now, cooldown_minutes=55):
-    """
-    Check if enough time has passed since the last run of this event.
-    Uses a cooldown to prevent duplicate triggers.
-    """
-    global last_run
-    
-    if last_run[event_key] is None:
-        return True
-    
-    time_since_last = now - last_run[event_key]
-    return time_since_last.total_seconds() >= (cooldown_minutes * 60)
+direct_messages = FanOut(
+    deliver_dm,
+    retryable=retryable,
+    on_failure=dm_failed,
+)
 
-def mark_event_run(event_key, now):
-    """Mark an event as having run at the current time"""
-    global last_run
-    last_run[event_key] = now
+def send_dms(user_ids, message):
+    direct_messages.send((user_id for user_id in user_ids if user_id not in dms_closed), message)
 
 def format_time_remaining(td):
     """Format a timedelta into a human-readable string"""
@@ -171,384 +137,80 @@ def format_time_remaining(td):
     
     return " ".join(parts) if parts else "Less than 1 minute"
 
-def get_next_48h_event_time(start_date, now):
-    """Calculate the next occurrence of a 48-hour event"""
-    if start_date.tzinfo is None:
-        start_date = UTC.localize(start_date)
-    
-    time_diff = now - start_date
-    
-    if time_diff.total_seconds() < 0:
-        return start_date
-    
-    hours_since_start = time_diff.total_seconds() / 3600
-    intervals_passed = int(hours_since_start / 48)
-    next_interval = intervals_passed + 1
-    next_time = start_date + timedelta(hours=next_interval * 48)
-    
-    return next_time
-
-def get_next_weekly_event_time(target_weekday, target_hour, target_minute, now):
-    """Calculate the next occurrence of a weekly event"""
-    current_weekday = now.weekday()
-    days_until = (target_weekday - current_weekday) % 7
-    
-    next_date = now.date() + timedelta(days=days_until)
-    next_time = datetime.combine(next_date, datetime.min.time()).replace(
-        hour=target_hour, minute=target_minute, tzinfo=UTC
-    )
-    
-    if next_time <= now:
-        next_time += timedelta(days=7)
-    
-    return next_time
-
-def get_next_biweekly_event_time(reference_date, target_weekday, target_hour, target_minute, now):
-    """Calculate the next occurrence of a biweekly event"""
-    if reference_date.tzinfo is None:
-        reference_date = UTC.localize(reference_date)
-    
-    current_weekday = now.weekday()
-    days_until = (target_weekday - current_weekday) % 7
-    
-    candidate_date = now.date() + timedelta(days=days_until)
-    candidate_time = datetime.combine(candidate_date, datetime.min.time()).replace(
-        hour=target_hour, minute=target_minute, tzinfo=UTC
-    )
-    
-    if candidate_time <= now:
-        candidate_time += timedelta(days=7)
-        candidate_date = candidate_time.date()
-    
-    days_diff = (candidate_date - reference_date.date()).days
-    weeks_diff = days_diff // 7
-    
-    if weeks_diff % 2 != 0:
-        candidate_time += timedelta(days=7)
-    
-    return candidate_time
-
-def get_next_4weekly_event_time(reference_date, target_weekday, target_hour, target_minute, now):
-    """Calculate the next occurrence of a 4-weekly event"""
-    if reference_date.tzinfo is None:
-        reference_date = UTC.localize(reference_date)
-    
-    current_weekday = now.weekday()
-    days_until = (target_weekday - current_weekday) % 7
-    
-    candidate_date = now.date() + timedelta(days=days_until)
-    candidate_time = datetime.combine(candidate_date, datetime.min.time()).replace(
-        hour=target_hour, minute=target_minute, tzinfo=UTC
+# === ALERT SCHEDULING ===
+# Instead of waking up every minute, every alert is armed in a priority queue
+# and the engine sleeps until the earliest send time. All guilds share that
+# one queue; each has its own channel, schedule, custom alerts and run state.
+# Recurring events live in schedule.toml (see reminders/schedule.py).
+guilds = GuildManager(
+    Store(DB_PATH), send_message, SCHEDULE_PATH, SCHEDULE_DIR,
+    default_events=EVENTS,
+    poll_seconds=SCHEDULE_POLL_SECONDS,
+    on_tick=metrics.on_tick,
+    daily_summary=ENABLE_DAILY_SUMMARY,
+    test_alert=ENABLE_TEST_ALERT,
+    grace_minutes=CATCH_UP_GRACE_MINUTES,
+    collapse_missed=COLLAPSE_MISSED_ALERTS,
+    on_fire=metrics.on_fire,
+    direct=send_dms,
+)
+guilds.load()
+metrics.watch(guilds, outbox, direct_messages)
+CUSTOM_ALERTS_PAGE_SIZE = 10
+
+# Starts the engine once; pauses posting while a shard is disconnected. When a
+# deploy briefly runs two workers on the same DB_PATH, only the holder of the
+# scheduler lease posts alerts and accepts changes; the other answers read-only
+# commands (with its schedule files still watched) until it takes over.
+lifecycle = Lifecycle(guilds, outbox, services=[direct_messages], on_outage=metrics.on_outage,
+                      lease=LeaderLease(guilds.store), on_lead=lambda: adopt_legacy_channel())
+
+async def standing_by(interaction):
+    """
+    True (after telling the user) when another instance holds the scheduler lease.
+    Only the leader changes alerts, so the two never hand out the same alert ID
+    or write state the other never reads.
+    """
+    if lifecycle.leading:
+        return False
+    await interaction.response.send_message(
+        "⏳ This bot instance is standing by while another one takes over (e.g. during a deploy). "
+        "Try again in a few seconds.",
+        ephemeral=True
     )
-    
-    if candidate_time <= now:
-        candidate_time += timedelta(days=7)
-        candidate_date = candidate_time.date()
-    
-    days_diff = (candidate_date - reference_date.date()).days
-    weeks_diff = days_diff // 7
-    
-    while weeks_diff % 4 != 0:
-        candidate_time += timedelta(days=7)
-        candidate_date = candidate_time.date()
-        days_diff = (candidate_date - reference_date.date()).days
-        weeks_diff = days_diff // 7
-    
-    return candidate_time
+    return True
 
-def is_time_match(now, target_hour, target_minute):
-    """Check if current time matches target time (with 1-minute window)"""
-    return now.hour == target_hour and abs(now.minute - target_minute) <= 1
-
-def get_todays_events(now):
-    """Get all events scheduled for today with their times and finished status"""
-    today = now.date()
-    today_events = []
-    
-    # Check 48-hour events
-    if ENABLE_48H_EVENTS:
-        next_bear1 = get_next_48h_event_time(EVENT_48H_1_START, now)
-        if next_bear1.date() == today:
-            today_events.append((next_bear1, EVENT_48H_1_NAME, next_bear1 < now))
-        
-        prev_bear1 = next_bear1 - timedelta(hours=48)
-        if prev_bear1.date() == today:
-            today_events.append((prev_bear1, EVENT_48H_1_NAME, prev_bear1 < now))
-        
-        next_bear2 = get_next_48h_event_time(EVENT_48H_2_START, now)
-        if next_bear2.date() == today:
-            today_events.append((next_bear2, EVENT_48H_2_NAME, next_bear2 < now))
-        
-        prev_bear2 = next_bear2 - timedelta(hours=48)
-        if prev_bear2.date() == today:
-            today_events.append((prev_bear2, EVENT_48H_2_NAME, prev_bear2 < now))
-    
-    # Check weekly events
-    if ENABLE_WEEKLY_EVENTS:
-        if now.weekday() == WEEKLY_1_DAY:
-            event_time = datetime.combine(today, datetime.min.time()).replace(
-                hour=WEEKLY_1_HOUR, minute=WEEKLY_1_MINUTE, tzinfo=UTC
-            )
-            today_events.append((event_time, WEEKLY_1_NAME, event_time < now))
-        
-        if now.weekday() == WEEKLY_2_DAY:
-            event_time = datetime.combine(today, datetime.min.time()).replace(
-                hour=WEEKLY_2_HOUR, minute=WEEKLY_2_MINUTE, tzinfo=UTC
-            )
-            today_events.append((event_time, WEEKLY_2_NAME, event_time < now))
-    
-    # Check biweekly events
-    if ENABLE_BIWEEKLY_EVENTS:
-        if now.weekday() == BIWEEKLY_1_DAY:
-            days_diff = (today - BIWEEKLY_1_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 2 == 0:
-                event_time = datetime.combine(today, datetime.min.time()).replace(
-                    hour=BIWEEKLY_1_HOUR, minute=BIWEEKLY_1_MINUTE, tzinfo=UTC
-                )
-                today_events.append((event_time, BIWEEKLY_1_NAME, event_time < now))
-        
-        if now.weekday() == BIWEEKLY_2_DAY:
-            days_diff = (today - BIWEEKLY_2_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 2 == 0:
-                event_time = datetime.combine(today, datetime.min.time()).replace(
-                    hour=BIWEEKLY_2_HOUR, minute=BIWEEKLY_2_MINUTE, tzinfo=UTC
-                )
-                today_events.append((event_time, BIWEEKLY_2_NAME, event_time < now))
-        
-        if now.weekday() == BIWEEKLY_3_DAY:
-            days_diff = (today - BIWEEKLY_3_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 2 == 0:
-                event_time = datetime.combine(today, datetime.min.time()).replace(
-                    hour=BIWEEKLY_3_HOUR, minute=BIWEEKLY_3_MINUTE, tzinfo=UTC
-                )
-                today_events.append((event_time, BIWEEKLY_3_NAME, event_time < now))
-        
-        if now.weekday() == BIWEEKLY_4_DAY:
-            days_diff = (today - BIWEEKLY_4_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 2 == 0:
-                event_time = datetime.combine(today, datetime.min.time()).replace(
-                    hour=BIWEEKLY_4_HOUR, minute=BIWEEKLY_4_MINUTE, tzinfo=UTC
-                )
-                today_events.append((event_time, BIWEEKLY_4_NAME, event_time < now))
-    
-    # Check 4-weekly events
-    if ENABLE_4WEEKLY_EVENTS:
-        if now.weekday() == FOURWEEKLY_1_DAY:
-            days_diff = (today - FOURWEEKLY_1_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 4 == 0:
-                event_time = datetime.combine(today, datetime.min.time()).replace(
-                    hour=FOURWEEKLY_1_HOUR, minute=FOURWEEKLY_1_MINUTE, tzinfo=UTC
-                )
-                today_events.append((event_time, FOURWEEKLY_1_NAME, event_time < now))
-        
-        if now.weekday() == FOURWEEKLY_2_DAY:
-            days_diff = (today - FOURWEEKLY_2_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 4 == 0:
-                event_time = datetime.combine(today, datetime.min.time()).replace(
-                    hour=FOURWEEKLY_2_HOUR, minute=FOURWEEKLY_2_MINUTE, tzinfo=UTC
-                )
-                today_events.append((event_time, FOURWEEKLY_2_NAME, event_time < now))
-    
-    # Check custom alerts
-    for alert_time, name, message, alert_before in custom_alerts:
-        if alert_time.date() == today:
-            today_events.append((alert_time, f"🔔 {name}", alert_time < now))
-    
-    # Sort by time
-    today_events.sort(key=lambda x: x[0])
-    
-    return today_events
-
-@tasks.loop(minutes=1)
-async def scheduler():
-    now = datetime.now(UTC)
-    
-    # === DAILY SUMMARY at 00:00 UTC ===
-    if ENABLE_DAILY_SUMMARY:
-        if now.hour == 0 and now.minute == 0 and should_run_event('daily_summary', now, cooldown_minutes=1400):  # ~23 hours
-            today_events = get_todays_events(now)
-            
-            if today_events:
-                message = f"📅 **TODAY'S EVENTS** - {now.strftime('%A, %B %d, %Y')}\n\n"
-                
-                for event_time, event_name, _ in today_events:
-                    time_str = event_time.strftime('%H:%M UTC')
-                    message += f"• **{time_str}** - {event_name}\n"
-                
-                message += f"\n{len(today_events)} event(s) scheduled today! 🎯"
-                await send_message(message)
-            else:
-                await send_message(f"📅 **TODAY'S EVENTS** - {now.strftime('%A, %B %d, %Y')}\n\nNo events scheduled for today. Enjoy your day! ☀️")
-            
-            mark_event_run('daily_summary', now)
-    
-    # === CUSTOM ONE-TIME ALERTS ===
-    global custom_alerts
-    triggered_alerts = []
-    for alert_time, name, message, alert_before in custom_alerts:
-        alert_send_time = alert_time - timedelta(minutes=alert_before)
-        if is_time_match(now, alert_send_time.hour, alert_send_time.minute) and now.date() == alert_send_time.date():
-            final_message = message.replace("{ALERT_MINUTES}", str(alert_before))
-            await send_message(final_message)
-            triggered_alerts.append((alert_time, name, message, alert_before))
-    
-    # Remove triggered alerts
-    for alert in triggered_alerts:
-        custom_alerts.remove(alert)
-    
-    # === TEST ALERT ===
-    if ENABLE_TEST_ALERT:
-        if now.minute % 5 == 0 and should_run_event('test_alert', now, cooldown_minutes=4):
-            await send_message("🧪 **TEST ALERT** - Bot is running! Current time: " + now.strftime("%H:%M UTC"))
-            mark_event_run('test_alert', now)
-    
-    # === 48-HOUR INTERVAL EVENTS ===
-    if ENABLE_48H_EVENTS:
-        next_48h_1 = get_next_48h_event_time(EVENT_48H_1_START, now)
-        alert_time_48h_1 = next_48h_1 - timedelta(minutes=EVENT_48H_1_ALERT_BEFORE)
-        if is_time_match(now, alert_time_48h_1.hour, alert_time_48h_1.minute) and now.date() == alert_time_48h_1.date() and should_run_event('48h_event_1', now, cooldown_minutes=2880):
-            message = EVENT_48H_1_MESSAGE.replace("{ALERT_MINUTES}", str(EVENT_48H_1_ALERT_BEFORE))
-            await send_message(message)
-            mark_event_run('48h_event_1', now)
-        
-        next_48h_2 = get_next_48h_event_time(EVENT_48H_2_START, now)
-        alert_time_48h_2 = next_48h_2 - timedelta(minutes=EVENT_48H_2_ALERT_BEFORE)
-        if is_time_match(now, alert_time_48h_2.hour, alert_time_48h_2.minute) and now.date() == alert_time_48h_2.date() and should_run_event('48h_event_2', now, cooldown_minutes=2880):
-            message = EVENT_48H_2_MESSAGE.replace("{ALERT_MINUTES}", str(EVENT_48H_2_ALERT_BEFORE))
-            await send_message(message)
-            mark_event_run('48h_event_2', now)
-    
-    # === WEEKLY EVENTS ===
-    if ENABLE_WEEKLY_EVENTS:
-        next_weekly1 = get_next_weekly_event_time(WEEKLY_1_DAY, WEEKLY_1_HOUR, WEEKLY_1_MINUTE, now)
-        alert_time_weekly1 = next_weekly1 - timedelta(minutes=WEEKLY_1_ALERT_BEFORE)
-        if is_time_match(now, alert_time_weekly1.hour, alert_time_weekly1.minute) and now.date() == alert_time_weekly1.date() and should_run_event('weekly_event_1', now, cooldown_minutes=10000):
-            message = WEEKLY_1_MESSAGE.replace("{ALERT_MINUTES}", str(WEEKLY_1_ALERT_BEFORE))
-            await send_message(message)
-            mark_event_run('weekly_event_1', now)
-        
-        next_weekly2 = get_next_weekly_event_time(WEEKLY_2_DAY, WEEKLY_2_HOUR, WEEKLY_2_MINUTE, now)
-        alert_time_weekly2 = next_weekly2 - timedelta(minutes=WEEKLY_2_ALERT_BEFORE)
-        if is_time_match(now, alert_time_weekly2.hour, alert_time_weekly2.minute) and now.date() == alert_time_weekly2.date() and should_run_event('weekly_event_2', now, cooldown_minutes=10000):
-            message = WEEKLY_2_MESSAGE.replace("{ALERT_MINUTES}", str(WEEKLY_2_ALERT_BEFORE))
-            await send_message(message)
-            mark_event_run('weekly_event_2', now)
-    
-    # === BIWEEKLY EVENTS ===
-    if ENABLE_BIWEEKLY_EVENTS:
-        if now.weekday() == BIWEEKLY_1_DAY:
-            days_diff = (now.date() - BIWEEKLY_1_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 2 == 0:
-                event_time_bw1 = datetime.combine(now.date(), datetime.min.time()).replace(
-                    hour=BIWEEKLY_1_HOUR, minute=BIWEEKLY_1_MINUTE, tzinfo=UTC
-                )
-                alert_time_bw1 = event_time_bw1 - timedelta(minutes=BIWEEKLY_1_ALERT_BEFORE)
-                if is_time_match(now, alert_time_bw1.hour, alert_time_bw1.minute) and should_run_event('biweekly_event_1', now, cooldown_minutes=20000):
-                    message = BIWEEKLY_1_MESSAGE.replace("{ALERT_MINUTES}", str(BIWEEKLY_1_ALERT_BEFORE))
-                    await send_message(message)
-                    mark_event_run('biweekly_event_1', now)
-        
-        if now.weekday() == BIWEEKLY_2_DAY:
-            days_diff = (now.date() - BIWEEKLY_2_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 2 == 0:
-                event_time_bw2 = datetime.combine(now.date(), datetime.min.time()).replace(
-                    hour=BIWEEKLY_2_HOUR, minute=BIWEEKLY_2_MINUTE, tzinfo=UTC
-                )
-                alert_time_bw2 = event_time_bw2 - timedelta(minutes=BIWEEKLY_2_ALERT_BEFORE)
-                if is_time_match(now, alert_time_bw2.hour, alert_time_bw2.minute) and should_run_event('biweekly_event_2', now, cooldown_minutes=20000):
-                    message = BIWEEKLY_2_MESSAGE.replace("{ALERT_MINUTES}", str(BIWEEKLY_2_ALERT_BEFORE))
-                    await send_message(message)
-                    mark_event_run('biweekly_event_2', now)
-        
-        if now.weekday() == BIWEEKLY_3_DAY:
-            days_diff = (now.date() - BIWEEKLY_3_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 2 == 0:
-                event_time_bw3 = datetime.combine(now.date(), datetime.min.time()).replace(
-                    hour=BIWEEKLY_3_HOUR, minute=BIWEEKLY_3_MINUTE, tzinfo=UTC
-                )
-                alert_time_bw3 = event_time_bw3 - timedelta(minutes=BIWEEKLY_3_ALERT_BEFORE)
-                if is_time_match(now, alert_time_bw3.hour, alert_time_bw3.minute) and should_run_event('biweekly_event_3', now, cooldown_minutes=20000):
-                    message = BIWEEKLY_3_MESSAGE.replace("{ALERT_MINUTES}", str(BIWEEKLY_3_ALERT_BEFORE))
-                    await send_message(message)
-                    mark_event_run('biweekly_event_3', now)
-        
-        if now.weekday() == BIWEEKLY_4_DAY:
-            days_diff = (now.date() - BIWEEKLY_4_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 2 == 0:
-                event_time_bw4 = datetime.combine(now.date(), datetime.min.time()).replace(
-                    hour=BIWEEKLY_4_HOUR, minute=BIWEEKLY_4_MINUTE, tzinfo=UTC
-                )
-                alert_time_bw4 = event_time_bw4 - timedelta(minutes=BIWEEKLY_4_ALERT_BEFORE)
-                if is_time_match(now, alert_time_bw4.hour, alert_time_bw4.minute) and should_run_event('biweekly_event_4', now, cooldown_minutes=20000):
-                    message = BIWEEKLY_4_MESSAGE.replace("{ALERT_MINUTES}", str(BIWEEKLY_4_ALERT_BEFORE))
-                    await send_message(message)
-                    mark_event_run('biweekly_event_4', now)
-    
-    # === 4-WEEKLY EVENTS ===
-    if ENABLE_4WEEKLY_EVENTS:
-        if now.weekday() == FOURWEEKLY_1_DAY:
-            days_diff = (now.date() - FOURWEEKLY_1_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 4 == 0:
-                event_time_4w1 = datetime.combine(now.date(), datetime.min.time()).replace(
-                    hour=FOURWEEKLY_1_HOUR, minute=FOURWEEKLY_1_MINUTE, tzinfo=UTC
-                )
-                alert_time_4w1 = event_time_4w1 - timedelta(minutes=FOURWEEKLY_1_ALERT_BEFORE)
-                if is_time_match(now, alert_time_4w1.hour, alert_time_4w1.minute) and should_run_event('4weekly_event_1', now, cooldown_minutes=40000):
-                    message = FOURWEEKLY_1_MESSAGE.replace("{ALERT_MINUTES}", str(FOURWEEKLY_1_ALERT_BEFORE))
-                    await send_message(message)
-                    mark_event_run('4weekly_event_1', now)
-        
-        if now.weekday() == FOURWEEKLY_2_DAY:
-            days_diff = (now.date() - FOURWEEKLY_2_REFERENCE.date()).days
-            if days_diff >= 0 and (days_diff // 7) % 4 == 0:
-                event_time_4w2 = datetime.combine(now.date(), datetime.min.time()).replace(
-                    hour=FOURWEEKLY_2_HOUR, minute=FOURWEEKLY_2_MINUTE, tzinfo=UTC
-                )
-                alert_time_4w2 = event_time_4w2 - timedelta(minutes=FOURWEEKLY_2_ALERT_BEFORE)
-                if is_time_match(now, alert_time_4w2.hour, alert_time_4w2.minute) and should_run_event('4weekly_event_2', now, cooldown_minutes=40000):
-                    message = FOURWEEKLY_2_MESSAGE.replace("{ALERT_MINUTES}", str(FOURWEEKLY_2_ALERT_BEFORE))
-                    await send_message(message)
-                    mark_event_run('4weekly_event_2', now)
+async def guild_service(interaction, changes=False):
+    """
+    The calling guild's scheduler, or None after telling the user how to set one up
+    (or, for commands that make `changes`, that this instance is standing by)
+    """
+    if changes and await standing_by(interaction):
+        return None
+    service = guilds.get(interaction.guild_id)
+    if service is None:
+        await interaction.response.send_message(
+            "⚙️ Alerts aren't set up in this server yet. An admin can run `/setup` to pick the alert channel.",
+            ephemeral=True
+        )
+    return service
 
 @tree.command(name="events", description="Show when all events are scheduled")
 async def show_events(interaction: discord.Interaction):
     """Display all upcoming events with countdowns, sorted by time"""
+    service = await guild_service(interaction)
+    if service is None:
+        return
     now = datetime.now(UTC)
     
-    # Collect all events with their next occurrence time
+    # Next occurrence of every event and custom alert, already sorted by time
     all_events = []
     
-    if ENABLE_48H_EVENTS:
-        next_bear1 = get_next_48h_event_time(EVENT_48H_1_START, now)
-        next_bear2 = get_next_48h_event_time(EVENT_48H_2_START, now)
-        all_events.append((next_bear1, EVENT_48H_1_NAME + " (Every 48 hours)", next_bear1))
-        all_events.append((next_bear2, EVENT_48H_2_NAME + " (Every 48 hours)", next_bear2))
-    
-    if ENABLE_WEEKLY_EVENTS:
-        next_weekly1 = get_next_weekly_event_time(WEEKLY_1_DAY, WEEKLY_1_HOUR, WEEKLY_1_MINUTE, now)
-        next_weekly2 = get_next_weekly_event_time(WEEKLY_2_DAY, WEEKLY_2_HOUR, WEEKLY_2_MINUTE, now)
-        all_events.append((next_weekly1, WEEKLY_1_NAME, next_weekly1))
-        all_events.append((next_weekly2, WEEKLY_2_NAME, next_weekly2))
-    
-    if ENABLE_BIWEEKLY_EVENTS:
-        next_biweekly1 = get_next_biweekly_event_time(BIWEEKLY_1_REFERENCE, BIWEEKLY_1_DAY, BIWEEKLY_1_HOUR, BIWEEKLY_1_MINUTE, now)
-        next_biweekly2 = get_next_biweekly_event_time(BIWEEKLY_2_REFERENCE, BIWEEKLY_2_DAY, BIWEEKLY_2_HOUR, BIWEEKLY_2_MINUTE, now)
-        next_biweekly3 = get_next_biweekly_event_time(BIWEEKLY_3_REFERENCE, BIWEEKLY_3_DAY, BIWEEKLY_3_HOUR, BIWEEKLY_3_MINUTE, now)
-        next_biweekly4 = get_next_biweekly_event_time(BIWEEKLY_4_REFERENCE, BIWEEKLY_4_DAY, BIWEEKLY_4_HOUR, BIWEEKLY_4_MINUTE, now)
-        all_events.append((next_biweekly1, BIWEEKLY_1_NAME, next_biweekly1))
-        all_events.append((next_biweekly2, BIWEEKLY_2_NAME, next_biweekly2))
-        all_events.append((next_biweekly3, BIWEEKLY_3_NAME, next_biweekly3))
-        all_events.append((next_biweekly4, BIWEEKLY_4_NAME, next_biweekly4))
-    
-    if ENABLE_4WEEKLY_EVENTS:
-        next_4weekly1 = get_next_4weekly_event_time(FOURWEEKLY_1_REFERENCE, FOURWEEKLY_1_DAY, FOURWEEKLY_1_HOUR, FOURWEEKLY_1_MINUTE, now)
-        next_4weekly2 = get_next_4weekly_event_time(FOURWEEKLY_2_REFERENCE, FOURWEEKLY_2_DAY, FOURWEEKLY_2_HOUR, FOURWEEKLY_2_MINUTE, now)
-        all_events.append((next_4weekly1, FOURWEEKLY_1_NAME, next_4weekly1))
-        all_events.append((next_4weekly2, FOURWEEKLY_2_NAME, next_4weekly2))
-    
-    # Add custom alerts
-    for alert_time, name, message, alert_before in custom_alerts:
-        all_events.append((alert_time, f"🔔 {name}", alert_time))
+    for next_time, key, name in service.timeline.upcoming(now):
+        event = service.events.get(key)
+        if event is not None and event.kind == '48h':
+            name += " (Every 48 hours)"
+        all_events.append((next_time, name, next_time))
     
     if not all_events:
         embed = discord.Embed(
@@ -559,9 +221,6 @@ async def show_events(interaction: discord.Interaction):
         await interaction.response.send_message(embed=embed)
         return
     
-    # Sort by time (earliest first)
-    all_events.sort(key=lambda x: x[0])
-    
     embed = discord.Embed(
         title="📅 SEA Events Schedule 💜",
         description="Times are local • Sorted by next occurrence",
@@ -581,38 +240,18 @@ async def show_events(interaction: discord.Interaction):
 @tree.command(name="next", description="Show the next upcoming event")
 async def next_event(interaction: discord.Interaction):
     """Display only the next event"""
+    service = await guild_service(interaction)
+    if service is None:
+        return
     now = datetime.now(UTC)
     
-    next_events = []
-    
-    if ENABLE_48H_EVENTS:
-        next_events.append((EVENT_48H_1_NAME, get_next_48h_event_time(EVENT_48H_1_START, now)))
-        next_events.append((EVENT_48H_2_NAME, get_next_48h_event_time(EVENT_48H_2_START, now)))
-    
-    if ENABLE_WEEKLY_EVENTS:
-        next_events.append((WEEKLY_1_NAME, get_next_weekly_event_time(WEEKLY_1_DAY, WEEKLY_1_HOUR, WEEKLY_1_MINUTE, now)))
-        next_events.append((WEEKLY_2_NAME, get_next_weekly_event_time(WEEKLY_2_DAY, WEEKLY_2_HOUR, WEEKLY_2_MINUTE, now)))
+    upcoming = service.timeline.next(now)
     
-    if ENABLE_BIWEEKLY_EVENTS:
-        next_events.append((BIWEEKLY_1_NAME, get_next_biweekly_event_time(BIWEEKLY_1_REFERENCE, BIWEEKLY_1_DAY, BIWEEKLY_1_HOUR, BIWEEKLY_1_MINUTE, now)))
-        next_events.append((BIWEEKLY_2_NAME, get_next_biweekly_event_time(BIWEEKLY_2_REFERENCE, BIWEEKLY_2_DAY, BIWEEKLY_2_HOUR, BIWEEKLY_2_MINUTE, now)))
-        next_events.append((BIWEEKLY_3_NAME, get_next_biweekly_event_time(BIWEEKLY_3_REFERENCE, BIWEEKLY_3_DAY, BIWEEKLY_3_HOUR, BIWEEKLY_3_MINUTE, now)))
-        next_events.append((BIWEEKLY_4_NAME, get_next_biweekly_event_time(BIWEEKLY_4_REFERENCE, BIWEEKLY_4_DAY, BIWEEKLY_4_HOUR, BIWEEKLY_4_MINUTE, now)))
-    
-    if ENABLE_4WEEKLY_EVENTS:
-        next_events.append((FOURWEEKLY_1_NAME, get_next_4weekly_event_time(FOURWEEKLY_1_REFERENCE, FOURWEEKLY_1_DAY, FOURWEEKLY_1_HOUR, FOURWEEKLY_1_MINUTE, now)))
-        next_events.append((FOURWEEKLY_2_NAME, get_next_4weekly_event_time(FOURWEEKLY_2_REFERENCE, FOURWEEKLY_2_DAY, FOURWEEKLY_2_HOUR, FOURWEEKLY_2_MINUTE, now)))
-    
-    # Add custom alerts
-    for alert_time, name, message, alert_before in custom_alerts:
-        next_events.append((f"🔔 {name}", alert_time))
-    
-    if not next_events:
+    if upcoming is None:
         await interaction.response.send_message("No events are currently enabled.")
         return
     
-    next_events.sort(key=lambda x: x[1])
-    event_name, event_time = next_events[0]
+    event_time, _, event_name = upcoming
     
     time_remaining = event_time - now
     
@@ -637,25 +276,29 @@ async def next_event(interaction: discord.Interaction):
 @tree.command(name="test", description="Send a test notification to verify the bot is working")
 async def test_notification(interaction: discord.Interaction):
     """Send a test notification"""
+    service = await guild_service(interaction)
+    if service is None:
+        return
     now = datetime.now(UTC)
     
     # Send response to user first
     await interaction.response.send_message("✅ Sending test notification...", ephemeral=True)
     
     # Send test message to the channel
-    await send_message(f"🧪 **TEST NOTIFICATION**\nBot is working correctly!\nCurrent time: {now.strftime('%Y-%m-%d %H:%M:%S UTC')}\nTriggered by: {interaction.user.mention}")
+    await send_message(guilds.channels[interaction.guild_id], f"🧪 **TEST NOTIFICATION**\nBot is working correctly!\nCurrent time: {now.strftime('%Y-%m-%d %H:%M:%S UTC')}\nTriggered by: {interaction.user.mention}")
 
 @tree.command(name="toggle_test", description="Toggle automatic test alerts on/off")
 async def toggle_test_alerts(interaction: discord.Interaction):
     """Toggle the automatic test alert feature"""
-    global ENABLE_TEST_ALERT
-    
-    ENABLE_TEST_ALERT = not ENABLE_TEST_ALERT
+    service = await guild_service(interaction, changes=True)
+    if service is None:
+        return
+    service.set_test_alert(not service.test_alert)
     
-    status = "✅ ENABLED" if ENABLE_TEST_ALERT else "❌ DISABLED"
+    status = "✅ ENABLED" if service.test_alert else "❌ DISABLED"
     message = f"Test alerts are now **{status}**"
     
-    if ENABLE_TEST_ALERT:
+    if service.test_alert:
         message += "\n📢 The bot will send automatic test messages every 5 minutes."
     else:
         message += "\n🔇 Automatic test messages are disabled. Use `/test` for manual testing."
@@ -665,6 +308,9 @@ async def toggle_test_alerts(interaction: discord.Interaction):
 @tree.command(name="help_scheduler", description="Show all available commands and event information")
 async def help_scheduler(interaction: discord.Interaction):
     """Display help menu with all commands and event types"""
+    service = await guild_service(interaction)
+    if service is None:
+        return
     
     embed = discord.Embed(
         title="📚 Event Scheduler Bot - Help Menu",
@@ -679,11 +325,19 @@ async def help_scheduler(interaction: discord.Interaction):
             "**`/events`** - View all scheduled events with countdowns\n"
             "**`/next`** - Show only the next upcoming event\n"
             "**`/today`** - Show all events happening today\n"
+            "**`/calendar`** - Show every event in a week or month\n"
+            "**`/export_calendar`** - Download the schedule as an .ics file\n"
             "**`/test`** - Send a one-time test notification\n"
             "**`/toggle_test`** - Enable/disable automatic test alerts (every 5 min)\n"
-            "**`/add`** - Add a custom one-time alert\n"
+            "**`/add`** - Add a custom alert (`repeat:` for every N days/weeks or cron)\n"
+            "**`/import`** - Add many custom alerts from a CSV or .ics file\n"
             "**`/list_custom`** - View all pending custom alerts\n"
-            "**`/help_scheduler`** - Show this help menu"
+            "**`/subscribe`** - Get a DM whenever an event's alert goes out\n"
+            "**`/unsubscribe`** - Stop DMs for an event\n"
+            "**`/subscriptions`** - Show the events you get DMs for\n"
+            "**`/help_scheduler`** - Show this help menu\n"
+            "**`/setup`** - Pick this server's alert channel and schedule (admins)\n"
+            "**`/sync_commands`** - Force a slash command sync (admins)"
         ),
         inline=False
     )
@@ -691,27 +345,19 @@ async def help_scheduler(interaction: discord.Interaction):
     # Event types section
     embed.add_field(
         name="🗓️ Event Types",
-        value=(
-            f"**48-Hour Events:** {len([x for x in [ENABLE_48H_EVENTS] if x])*2} events - Repeats every 2 days\n"
-            f"**Weekly Events:** {len([x for x in [ENABLE_WEEKLY_EVENTS] if x])*2} events - Repeats every week\n"
-            f"**Biweekly Events:** {len([x for x in [ENABLE_BIWEEKLY_EVENTS] if x])*4} events - Repeats every 2 weeks\n"
-            f"**4-Weekly Events:** {len([x for x in [ENABLE_4WEEKLY_EVENTS] if x])*2} events - Repeats every 4 weeks\n"
-            f"**Custom Alerts:** {len(custom_alerts)} pending - One-time notifications"
-        ),
+        value="".join((
+            *(f"**{title}:** {service.events.count(kind)} events - {cadence}\n" for kind, (title, cadence) in EVENT_KINDS.items()),
+            f"**Custom Alerts:** {len(service.custom_alerts)} pending - One-time or repeating notifications",
+        )),
         inline=False
     )
     
     # Current status section
     status_text = []
-    if ENABLE_48H_EVENTS:
-        status_text.append("✅ 48-Hour Events")
-    if ENABLE_WEEKLY_EVENTS:
-        status_text.append("✅ Weekly Events")
-    if ENABLE_BIWEEKLY_EVENTS:
-        status_text.append("✅ Biweekly Events")
-    if ENABLE_4WEEKLY_EVENTS:
-        status_text.append("✅ 4-Weekly Events")
-    if ENABLE_TEST_ALERT:
+    for kind, (title, _) in EVENT_KINDS.items():
+        if service.events.kind_enabled(kind):
+            status_text.append(f"✅ {title}")
+    if service.test_alert:
         status_text.append("✅ Auto Test Alerts")
     
     if not status_text:
@@ -730,44 +376,47 @@ async def help_scheduler(interaction: discord.Interaction):
             "• **Automatic Reminders** - Get notified before events start\n"
             "• **Timezone Support** - Times shown in your local timezone\n"
             "• **Countdown Timers** - See exactly when events begin\n"
-            "• **Duplicate Prevention** - Smart cooldowns prevent spam\n"
+            "• **Duplicate Prevention** - Every reminder is sent once, tracked per occurrence\n"
             "• **Custom Alerts** - Add one-time notifications anytime"
         ),
         inline=False
     )
     
     # Footer
-    embed.set_footer(text="All event times are in UTC • Bot checks every minute")
+    embed.set_footer(text="All event times are in UTC • Alerts fire at their exact send time")
     
     await interaction.response.send_message(embed=embed)
 
-@tree.command(name="add", description="Add a custom one-time alert")
+@tree.command(name="add", description="Add a custom alert (one-time, or repeating with repeat:)")
 async def add_custom_alert(
     interaction: discord.Interaction,
     name: str,
     hour: int,
     minute: int,
     message: str,
-    alert_before: int = 10,
+    alert_before: str = "10",
     day: int = None,
     month: int = None,
-    year: int = None
+    year: int = None,
+    repeat: str = None
 ):
     """
-    Add a custom one-time alert
+    Add a custom alert
     
     Parameters:
     name: Short name for the alert (e.g., "Boss Spawn", "Guild Meeting")
     hour: Hour in UTC (0-23)
     minute: Minute (0-59)
     message: The message to send (use {ALERT_MINUTES} as placeholder for the alert time)
-    alert_before: Minutes before the event to send the alert (default: 10)
+    alert_before: Minutes before the event to send the alert (default: 10); several comma-separated for extra reminders, e.g. 60,10
     day: Day of month (defaults to today if not specified)
     month: Month (defaults to current month if not specified)
     year: Year (defaults to current year if not specified)
+    repeat: "every N days", "every N weeks" or a cron rule like "0 18 * * 1-5" (UTC); the date/time is the first occurrence (or when the cron rule starts)
     """
-    global custom_alerts
-    
+    service = await guild_service(interaction, changes=True)
+    if service is None:
+        return
     now = datetime.now(UTC)
     
     # Validate hour and minute
@@ -779,10 +428,6 @@ async def add_custom_alert(
         await interaction.response.send_message("❌ Minute must be between 0 and 59", ephemeral=True)
         return
     
-    if not (0 <= alert_before <= 1440):
-        await interaction.response.send_message("❌ Alert before must be between 0 and 1440 minutes", ephemeral=True)
-        return
-    
     # Use current date if not specified
     target_year = year if year is not None else now.year
     target_month = month if month is not None else now.month
@@ -794,20 +439,22 @@ async def add_custom_alert(
         await interaction.response.send_message(f"❌ Invalid date: {e}", ephemeral=True)
         return
     
-    # The alert will fire alert_before minutes BEFORE the event time
-    alert_send_time = alert_time - timedelta(minutes=alert_before)
-    
-    # Check if the send time is in the past
-    if alert_send_time < now:
-        await interaction.response.send_message(
-            f"❌ Alert would fire in the past!\nEvent time: {alert_time.strftime('%Y-%m-%d %H:%M UTC')}\nAlert send time: {alert_send_time.strftime('%Y-%m-%d %H:%M UTC')}\nCurrent time: {now.strftime('%Y-%m-%d %H:%M UTC')}",
-            ephemeral=True
-        )
+    # Same rules as bulk imports (range of alert_before, send time not in the past, ...)
+    try:
+        validate_custom_alert(alert_time, name, message, alert_before, now, rule=repeat)
+    except InvalidAlert as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
         return
     
     # Add the alert
-    custom_alerts.append((alert_time, name, message, alert_before))
-    custom_alerts.sort(key=lambda x: x[0])  # Keep sorted by time
+    alert = service.add_custom_alert(alert_time, name, message, alert_before, rule=repeat)
+    
+    # The first reminder fires alert.alert_before minutes BEFORE the (next) event time
+    if alert.recurrence is not None:
+        alert_send_time = next_alert_time(alert.recurrence, alert.alert_before, now)
+        alert_time = alert_send_time + timedelta(minutes=alert.alert_before)
+    else:
+        alert_send_time = alert.send_time
     
     embed = discord.Embed(
         title="✅ Custom Alert Added",
@@ -815,17 +462,23 @@ async def add_custom_alert(
     )
     embed.add_field(
         name="Alert Name",
-        value=f"🔔 {name}",
+        value=f"{'🔁' if alert.recurrence is not None else '🔔'} {name} (ID {alert.id})",
         inline=False
     )
+    if alert.recurrence is not None:
+        embed.add_field(
+            name="Repeats",
+            value=alert.recurrence.describe(),
+            inline=False
+        )
     embed.add_field(
-        name="Event Time",
+        name="Next Event" if alert.recurrence is not None else "Event Time",
         value=f"<t:{int(alert_time.timestamp())}:F>",
         inline=False
     )
     embed.add_field(
         name="Alert Fires",
-        value=f"<t:{int(alert_send_time.timestamp())}:F> ({alert_before} min before)",
+        value=f"<t:{int(alert_send_time.timestamp())}:F> ({format_offsets(alert.offsets)} before)",
         inline=False
     )
     embed.add_field(
@@ -835,21 +488,74 @@ async def add_custom_alert(
     )
     embed.add_field(
         name="Message",
-        value=message.replace("{ALERT_MINUTES}", str(alert_before)),
+        value=alert.render(),
         inline=False
     )
     
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
+@tree.command(name="import", description="Add many custom alerts from a CSV or .ics file")
+async def import_custom_alerts(interaction: discord.Interaction, file: discord.Attachment):
+    """
+    Bulk-add custom alerts
+    
+    Parameters:
+    file: A .csv with columns name,date,time,message[,alert_before] (UTC, YYYY-MM-DD and HH:MM; alert_before may list several minutes) or an .ics calendar
+    """
+    # csv and zoneinfo are only needed here, so they aren't loaded at startup
+    from reminders.importer import ImportFailed, format_rejects, parse_alerts
+    
+    service = await guild_service(interaction, changes=True)
+    if service is None:
+        return
+    
+    await interaction.response.defer(ephemeral=True)
+    try:
+        data = await file.read()
+        # Parsing and validation run off the event loop
+        entries, rejects = await asyncio.to_thread(parse_alerts, data, file.filename, datetime.now(UTC))
+    except ImportFailed as e:
+        await interaction.followup.send(f"❌ {e}", ephemeral=True)
+        return
+    except discord.HTTPException as e:
+        await interaction.followup.send(f"❌ Couldn't download the file: {e}", ephemeral=True)
+        return
+    
+    alerts = service.add_custom_alerts(entries)
+    print(f"📥 Imported {len(alerts)} custom alert(s), rejected {len(rejects)}, from {file.filename}")
+    
+    embed = discord.Embed(
+        title="📥 Import Finished",
+        description=f"✅ **{len(alerts)}** alert(s) added • ❌ **{len(rejects)}** rejected",
+        color=discord.Color.green() if not rejects else discord.Color.orange()
+    )
+    if alerts:
+        embed.add_field(
+            name="Next Up",
+            value="\n".join(f"• `{alert.id}` {alert.name} - <t:{int(alert.event_time.timestamp())}:f>"
+                            for alert in sorted(alerts, key=lambda a: a.send_time)[:5]),
+            inline=False
+        )
+    if rejects:
+        embed.add_field(name="Rejected", value=format_rejects(rejects)[:1024], inline=False)
+    
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
 @tree.command(name="list_custom", description="View all pending custom alerts")
-async def list_custom_alerts(interaction: discord.Interaction):
-    """List all pending custom alerts"""
+async def list_custom_alerts(interaction: discord.Interaction, page: int = 1):
+    """List pending custom alerts, 10 per page, in send-time order"""
+    service = await guild_service(interaction)
+    if service is None:
+        return
     
+    custom_alerts = service.custom_alerts
     if not custom_alerts:
         await interaction.response.send_message("📭 No custom alerts scheduled.", ephemeral=True)
         return
     
     now = datetime.now(UTC)
+    page_count = (len(custom_alerts) + CUSTOM_ALERTS_PAGE_SIZE - 1) // CUSTOM_ALERTS_PAGE_SIZE
+    page = min(max(page, 1), page_count)
     
     embed = discord.Embed(
         title="📋 Pending Custom Alerts",
@@ -857,63 +563,68 @@ async def list_custom_alerts(interaction: discord.Interaction):
         color=discord.Color.blue()
     )
     
-    for i, (alert_time, name, message, alert_before) in enumerate(custom_alerts[:10], 1):  # Show max 10
-        alert_send_time = alert_time - timedelta(minutes=alert_before)
-        time_remaining = alert_send_time - now
-        message_preview = message[:100] + "..." if len(message) > 100 else message
+    for alert in custom_alerts.page((page - 1) * CUSTOM_ALERTS_PAGE_SIZE, CUSTOM_ALERTS_PAGE_SIZE):
+        message_preview = alert.message[:100] + "..." if len(alert.message) > 100 else alert.message
+        if alert.recurrence is not None:
+            send_time = next_alert_time(alert.recurrence, alert.alert_before, now)
+            embed.add_field(
+                name=f"ID {alert.id} - 🔁 {alert.name}",
+                value=f"**Repeats:** {alert.recurrence.describe()}\n**Next alert:** <t:{int(send_time.timestamp())}:R> ({format_offsets(alert.offsets)} before)\n**Message:** {message_preview}",
+                inline=False
+            )
+            continue
+        time_remaining = alert.send_time - now
         embed.add_field(
-            name=f"#{i} - 🔔 {name}",
-            value=f"**Event:** <t:{int(alert_time.timestamp())}:F>\n**Alert fires:** <t:{int(alert_send_time.timestamp())}:R> ({alert_before} min before)\n**In:** {format_time_remaining(time_remaining)}\n**Message:** {message_preview}",
+            name=f"ID {alert.id} - 🔔 {alert.name}",
+            value=f"**Event:** <t:{int(alert.event_time.timestamp())}:F>\n**Alert fires:** <t:{int(alert.send_time.timestamp())}:R> ({format_offsets(alert.offsets)} before)\n**In:** {format_time_remaining(time_remaining)}\n**Message:** {message_preview}",
             inline=False
         )
     
-    if len(custom_alerts) > 10:
-        embed.set_footer(text=f"Showing 10 of {len(custom_alerts)} alerts")
+    if page_count > 1:
+        embed.set_footer(text=f"Page {page} of {page_count} • Use /list_custom page:<n> to see more")
     
     await interaction.response.send_message(embed=embed)
-@tree.command(name="remove", description="Remove a custom alert by its number")
-async def remove_custom_alert(interaction: discord.Interaction, index: int):
+
+@tree.command(name="remove", description="Remove a custom alert by its ID")
+async def remove_custom_alert(interaction: discord.Interaction, alert_id: int):
     """
-    Remove a custom alert using its number from /list_custom
+    Remove a custom alert using its ID from /list_custom
     """
-    global custom_alerts
-
-    if not custom_alerts:
-        await interaction.response.send_message("📭 No custom alerts to remove.", ephemeral=True)
+    service = await guild_service(interaction, changes=True)
+    if service is None:
         return
-
-    if index < 1 or index > len(custom_alerts):
+    removed_alert = service.remove_custom_alert(alert_id)
+    
+    if removed_alert is None:
         await interaction.response.send_message(
-            f"❌ Invalid index. Please choose a number between 1 and {len(custom_alerts)}.",
+            f"❌ No pending custom alert with ID {alert_id}. Use `/list_custom` to see IDs.",
             ephemeral=True
         )
         return
-
-    # Remove alert (index-1 because list starts at 0)
-    removed_alert = custom_alerts.pop(index - 1)
-
-    alert_time, name, message, alert_before = removed_alert
-
+    
     embed = discord.Embed(
         title="🗑️ Custom Alert Removed",
         color=discord.Color.red()
     )
-
+    
     embed.add_field(
         name="Removed Alert",
-        value=f"🔔 {name}\n<t:{int(alert_time.timestamp())}:F>",
+        value=f"🔔 {removed_alert.name}\n<t:{int(removed_alert.event_time.timestamp())}:F>",
         inline=False
     )
-
+    
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
 @tree.command(name="today", description="Show all events scheduled for today")
 async def today_events(interaction: discord.Interaction):
     """Display all events happening today, marking finished ones"""
+    service = await guild_service(interaction)
+    if service is None:
+        return
     now = datetime.now(UTC)
     today = now.date()
     
-    today_events_list = get_todays_events(now)
+    today_events_list = service.todays_events(now)
     
     if not today_events_list:
         embed = discord.Embed(
@@ -942,47 +653,313 @@ async def today_events(interaction: discord.Interaction):
     
     await interaction.response.send_message(embed=embed)
 
+@tree.command(name="setup", description="Pick this server's alert channel and (optionally) its event schedule")
+@discord.app_commands.default_permissions(manage_guild=True)
+async def setup_guild(interaction: discord.Interaction, channel: discord.TextChannel, schedule: str = None):
+    """
+    Enable alerts for this server, or change where they go
+    
+    Parameters:
+    channel: Channel that receives the alerts
+    schedule: Named schedule to use instead of the default one
+    """
+    if interaction.guild_id is None:
+        await interaction.response.send_message("❌ Run this inside a server.", ephemeral=True)
+        return
+    if await standing_by(interaction):
+        return
+    
+    try:
+        service = guilds.configure(interaction.guild_id, channel.id, schedule)
+    except ScheduleError as e:
+        available = ", ".join(guilds.available_schedules()) or "none"
+        await interaction.response.send_message(f"❌ {e}\nAvailable schedules: {available}", ephemeral=True)
+        return
+    
+    await interaction.response.send_message(
+        f"✅ Alerts will be posted in {channel.mention} using the **{schedule or 'default'}** schedule "
+        f"({len(service.events.enabled())} event(s)).",
+        ephemeral=True
+    )
 
-@bot.event
-async def on_ready():
-    print(f"Logged in as {bot.user}")
-    print(f"Bot is monitoring events in channel ID: {CHANNEL_ID}")
-    print(f"\nScheduled Events (all times in UTC):")
-    print(f"  Daily Summary: {'ENABLED (00:00 UTC)' if ENABLE_DAILY_SUMMARY else 'DISABLED'}")
-    print(f"  Test Alert: {'ENABLED (every 5 minutes)' if ENABLE_TEST_ALERT else 'DISABLED'}")
-    print(f"  48h Events: {'ENABLED' if ENABLE_48H_EVENTS else 'DISABLED'}")
-    if ENABLE_48H_EVENTS:
-        print(f"    - {EVENT_48H_1_NAME}: Every 48 hours starting {EVENT_48H_1_START} (alert {EVENT_48H_1_ALERT_BEFORE} min before)")
-        print(f"    - {EVENT_48H_2_NAME}: Every 48 hours starting {EVENT_48H_2_START} (alert {EVENT_48H_2_ALERT_BEFORE} min before)")
-    print(f"  Weekly Events: {'ENABLED' if ENABLE_WEEKLY_EVENTS else 'DISABLED'}")
-    print(f"  Biweekly Events: {'ENABLED' if ENABLE_BIWEEKLY_EVENTS else 'DISABLED'}")
-    print(f"  4-Weekly Events: {'ENABLED' if ENABLE_4WEEKLY_EVENTS else 'DISABLED'}")
-    
-    # Sync commands - use guild sync if GUILD_ID is set for instant updates
-    if GUILD_ID:
-        guild = discord.Object(id=int(GUILD_ID))
+@tree.command(name="subscribe", description="Get a DM whenever an event's alert goes out")
+async def subscribe(interaction: discord.Interaction, event_id: str):
+    """
+    Subscribe to DMs for one event
+    
+    Parameters:
+    event_id: Event ID, e.g. 48h_event_1 (see /subscriptions for the list)
+    """
+    service = await guild_service(interaction, changes=True)
+    if service is None:
+        return
+    
+    event = service.events.get(event_id)
+    if event is None or not event.enabled:
+        ids = ", ".join(f"`{event.id}`" for event in service.events.enabled())
+        problem = "is disabled" if event is not None else "is unknown"
+        await interaction.response.send_message(f"❌ Event `{event_id}` {problem}. Event IDs: {ids}", ephemeral=True)
+        return
+    
+    dms_closed.discard(interaction.user.id)
+    if service.subscribe(event.id, interaction.user.id):
+        message = f"✅ You'll get a DM {format_offsets(event.offsets)} before every **{event.name}**. Make sure DMs from this server are allowed."
+    else:
+        message = f"ℹ️ You're already subscribed to **{event.name}**."
+    await interaction.response.send_message(message, ephemeral=True)
+
+@tree.command(name="unsubscribe", description="Stop DMs for an event")
+async def unsubscribe(interaction: discord.Interaction, event_id: str):
+    """Unsubscribe from DMs for one event"""
+    service = await guild_service(interaction, changes=True)
+    if service is None:
+        return
+    
+    if service.unsubscribe(event_id, interaction.user.id):
+        message = f"🔕 You won't get DMs for `{event_id}` anymore."
+    else:
+        message = f"ℹ️ You weren't subscribed to `{event_id}`."
+    await interaction.response.send_message(message, ephemeral=True)
+
+@tree.command(name="subscriptions", description="Show the events you get DMs for")
+async def list_subscriptions(interaction: discord.Interaction):
+    """List the caller's subscriptions and the event IDs available"""
+    service = await guild_service(interaction)
+    if service is None:
+        return
+    
+    subscribed = service.subscriptions.for_user(interaction.user.id)
+    embed = discord.Embed(
+        title="📬 Your Event DMs",
+        description="Use `/subscribe event_id:<id>` or `/unsubscribe event_id:<id>`",
+        color=discord.Color.blue()
+    )
+    lines = []
+    for event_id in subscribed:
+        event = service.events.get(event_id)
+        lines.append(f"• `{event_id}` - {event.name if event is not None else '(no longer scheduled)'}")
+    embed.add_field(
+        name="Subscribed",
+        value="\n".join(lines) or "None yet",
+        inline=False
+    )
+    embed.add_field(
+        name="Available events",
+        value="\n".join(f"• `{event.id}` - {event.name}" for event in service.events.enabled()) or "No events are currently enabled.",
+        inline=False
+    )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+CALENDAR_VIEWS = ("week", "month")
+EMBED_DESCRIPTION_LIMIT = 4096
+
+def calendar_window(view, offset, now):
+    """[start, end) of the week (Monday-based) or month `offset` periods from now's"""
+    today = datetime(now.year, now.month, now.day, tzinfo=UTC)
+    if view == "week":
+        start = today - timedelta(days=today.weekday()) + timedelta(weeks=offset)
+        return start, start + timedelta(weeks=1)
+    
+    month_index = now.year * 12 + now.month - 1 + offset
+    start = datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=UTC)
+    month_index += 1
+    return start, datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=UTC)
+
+@tree.command(name="calendar", description="Show every event in a week or month")
+async def calendar(interaction: discord.Interaction, view: str = "week", offset: int = 0):
+    """
+    Calendar of all events and custom alerts
+    
+    Parameters:
+    view: "week" or "month"
+    offset: 0 for the current week/month, 1 for the next, -1 for the previous
+    """
+    service = await guild_service(interaction)
+    if service is None:
+        return
+    
+    view = view.lower()
+    if view not in CALENDAR_VIEWS:
+        await interaction.response.send_message("❌ View must be `week` or `month`", ephemeral=True)
+        return
+    if not (-12 <= offset <= 52):
+        await interaction.response.send_message("❌ Offset must be between -12 and 52", ephemeral=True)
+        return
+    
+    now = datetime.now(UTC)
+    start, end = calendar_window(view, offset, now)
+    
+    lines = []
+    shown = 0
+    total = 0
+    current_day = None
+    length = 0
+    for event_time, _, event_name in service.occurrences(start, end):
+        total += 1
+        if length > EMBED_DESCRIPTION_LIMIT - 200:
+            continue
+        if event_time.date() != current_day:
+            current_day = event_time.date()
+            lines.append(f"\n**{event_time.strftime('%a %d %b')}**")
+            length += len(lines[-1]) + 1
+        marker = "~~" if event_time < now else ""
+        lines.append(f"{marker}`{event_time.strftime('%H:%M')}` {event_name}{marker}")
+        length += len(lines[-1]) + 1
+        shown += 1
+    
+    if total > shown:
+        lines.append(f"\n…and {total - shown} more")
+    
+    if view == "week":
+        title = f"🗓️ Week of {start.strftime('%B %d, %Y')}"
+    else:
+        title = f"🗓️ {start.strftime('%B %Y')}"
+    
+    embed = discord.Embed(
+        title=title,
+        description="\n".join(lines).strip() or "No events scheduled.",
+        color=discord.Color.blue()
+    )
+    embed.set_footer(text=f"{total} event(s) • All times UTC • Use offset to move between {view}s")
+    
+    await interaction.response.send_message(embed=embed)
+
+@tree.command(name="export_calendar", description="Download the schedule as an .ics file for your calendar app")
+async def export_calendar(interaction: discord.Interaction):
+    """Attach the recurring events and pending custom alerts as an iCalendar file"""
+    service = await guild_service(interaction)
+    if service is None:
+        return
+    
+    name = interaction.guild.name if interaction.guild is not None else "Events"
+    data = service.export_ics(calendar_name=name)
+    await interaction.response.send_message(
+        "🗓️ Import this file into Google Calendar, Outlook or Apple Calendar. Recurring events repeat on their own; "
+        "custom alerts are included as one-off events.",
+        file=discord.File(io.BytesIO(data), filename="events.ics"),
+        ephemeral=True
+    )
+
+
+# === COMMAND SYNC ===
+# tree.sync() is a rate-limited API call and on_ready fires again after every
+# reconnect, so the tree is only pushed when its contents actually changed.
+
+def command_sync_scope():
+    """Guild to sync to (None for global) - use guild sync if GUILD_ID is set for instant updates"""
+    return discord.Object(id=int(GUILD_ID)) if GUILD_ID else None
+
+def command_tree_hash(guild):
+    """Hash of every command's name, description and parameters as sent to Discord"""
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands(guild=guild)), key=lambda c: c['name'])
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+async def sync_commands(force=False):
+    """Sync the command tree unless it matches the last synced hash; returns True if synced"""
+    guild = command_sync_scope()
+    if guild is not None:
         tree.copy_global_to(guild=guild)
-        await tree.sync(guild=guild)
+    setting = f"command_tree_hash:{GUILD_ID or 'global'}"
+    digest = command_tree_hash(guild)
+    
+    if not force and guilds.store.get_setting(setting) == digest:
+        print(f"\n✅ Slash commands unchanged since last sync, skipping sync")
+        return False
+    
+    await tree.sync(guild=guild)
+    guilds.store.set_setting(setting, digest)
+    if guild is not None:
         print(f"\n✅ Slash commands synced to guild {GUILD_ID} (instant)")
     else:
-        await tree.sync()
         print(f"\n⏳ Slash commands synced globally (may take up to 1 hour)")
+    return True
+
+@tree.command(name="sync_commands", description="Force a slash command sync with Discord")
+@discord.app_commands.default_permissions(administrator=True)
+async def force_sync_commands(interaction: discord.Interaction):
+    """Push the command tree even if it looks unchanged (e.g. after editing commands elsewhere)"""
+    await interaction.response.defer(ephemeral=True)
+    try:
+        await sync_commands(force=True)
+    except discord.HTTPException as e:
+        await interaction.followup.send(f"❌ Sync failed: {e}", ephemeral=True)
+        return
+    await interaction.followup.send("✅ Slash commands synced.", ephemeral=True)
+
+async def adopt_legacy_channel():
+    """
+    Single-server installs set CHANNEL_ID; give that channel's guild the existing state.
+    This writes to the store, so it runs when this instance becomes the leader.
+    """
+    if not CHANNEL_ID:
+        return
+    try:
+        channel = await resolve_channel(CHANNEL_ID)
+    except discord.HTTPException as e:
+        print(f"⚠️ Could not look up CHANNEL_ID {CHANNEL_ID}: {e}")
+        return
+    if channel.guild.id not in guilds:
+        await guilds.adopt_default(channel.guild.id, CHANNEL_ID)
+        print(f"Set up guild {channel.guild.id} with alert channel {CHANNEL_ID}")
+
+@bot.event
+async def on_ready():
+    # on_ready fires again after a reconnect with a new session; shards report those themselves
+    if lifecycle.started:
+        return
+    
+    print(f"Logged in as {bot.user} ({bot.shard_count} shard(s))")
+    print(f"Bot is posting alerts in {len(guilds)} server(s)")
+    print(f"\nDefault schedule (all times in UTC):")
+    print(f"  Daily Summary: {'ENABLED (00:00 UTC)' if ENABLE_DAILY_SUMMARY else 'DISABLED'}")
+    print(f"  Test Alert: {'ENABLED (every 5 minutes)' if ENABLE_TEST_ALERT else 'DISABLED'}")
+    for kind, (title, cadence) in EVENT_KINDS.items():
+        print(f"  {title}: {'ENABLED' if EVENTS.kind_enabled(kind) else 'DISABLED'}")
+        for event in EVENTS.enabled():
+            if event.kind == kind:
+                print(f"    - {event.name}: {event.recurrence.describe()} (alert {format_offsets(event.offsets)} before)")
+    
+    # Sync commands only when the command tree changed since the last sync
+    await sync_commands()
     
     print(f"\nAvailable commands:")
     print(f"  /events - Show all upcoming events")
     print(f"  /next - Show the next event")
     print(f"  /today - Show all events for today")
+    print(f"  /calendar - Show a week or month of events")
+    print(f"  /export_calendar - Download the schedule as an .ics file")
     print(f"  /test - Send a test notification")
     print(f"  /toggle_test - Toggle automatic test alerts on/off")
-    print(f"  /add - Add a custom one-time alert")
+    print(f"  /add - Add a custom one-time or repeating alert")
+    print(f"  /import - Add custom alerts from a CSV or .ics file")
     print(f"  /list_custom - View pending custom alerts")
+    print(f"  /subscribe, /unsubscribe, /subscriptions - Manage event DMs")
     print(f"  /help_scheduler - Show help menu with all commands")
+    print(f"  /setup - Pick the server's alert channel and schedule (admins)")
+    print(f"  /sync_commands - Force a slash command sync (admins)")
     
-    scheduler.start()
-
-bot.run(TOKEN)
+    if METRICS_PORT:
+        await metrics_server.start()
+    guilds.watch()
+    await lifecycle.ready()
 
+@bot.event
+async def on_shard_disconnect(shard_id):
+    lifecycle.disconnect(shard_id)
 
+@bot.event
+async def on_shard_resumed(shard_id):
+    await lifecycle.resume(shard_id)
 
+@bot.event
+async def on_shard_ready(shard_id):
+    # A shard that had to start a new session rather than resume
+    await lifecycle.resume(shard_id)
 
+@bot.event
+async def on_guild_remove(guild):
+    # Every instance stops serving it; only the leader deletes its stored state
+    guilds.remove(guild.id, persist=lifecycle.leading)
 
+if __name__ == "__main__":
+    bot.run(TOKEN)
@@ -0,0 +1 @@
+"""Scheduling core for the Reminders Discord bot (no discord.py imports)."""
@@ -0,0 +1,40 @@
+"""
+Command-line tools that run without Discord.
+
+    python -m reminders preview --from 2026-10-19 --to 2026-10-26
+    python -m reminders simulate --days 120
+    python -m reminders bench --json bench.json
+
+Each tool's module is imported only when it is picked, so `preview` never
+loads asyncio, SQLite or the scheduler engine.
+"""
+import importlib
+import sys
+
+COMMANDS = {
+    'preview': ('reminders.preview', "Print every alert send time and message in a window"),
+    'simulate': ('reminders.simulate', "Run the scheduler on a virtual clock and report duplicates and misses"),
+    'bench': ('reminders.bench', "Benchmark the scheduler's hot paths"),
+}
+
+
+def usage():
+    lines = ["usage: python -m reminders {" + ",".join(COMMANDS) + "} [options]", ""]
+    lines += [f"  {name:<10} {summary}" for name, (_, summary) in COMMANDS.items()]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    if argv[0] not in COMMANDS:
+        print(f"Unknown command {argv[0]!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+    module = importlib.import_module(COMMANDS[argv[0]][0])
+    return module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
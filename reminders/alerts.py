@@ -0,0 +1,225 @@
+"""Custom alerts (one-time or recurring) indexed by stable ID and by send time."""
+from datetime import timedelta
+
+from sortedcontainers import SortedList
+
+from reminders.events import normalize_offsets
+from reminders.recurrence import from_timestamp, to_timestamp
+from reminders.rules import RuleError, compile_rule
+
+MAX_ALERT_BEFORE = 1440  # minutes
+MAX_NAME_LENGTH = 100
+MAX_MESSAGE_LENGTH = 1800  # leaves room in a 2000-character post
+
+
+class InvalidAlert(ValueError):
+    """A custom alert failed validation; the message is shown to the user."""
+
+
+def validate_custom_alert(event_time, name, message, alert_before, now, rule=None):
+    """
+    The rules every custom alert must pass, whether from /add or an import.
+    `alert_before` is one offset or several. A recurring alert (`rule`
+    given) may start in the past but its rule must compile.
+    """
+    if not name.strip():
+        raise InvalidAlert("Name can't be empty")
+    if len(name) > MAX_NAME_LENGTH:
+        raise InvalidAlert(f"Name must be at most {MAX_NAME_LENGTH} characters")
+    if not message.strip():
+        raise InvalidAlert("Message can't be empty")
+    if len(message) > MAX_MESSAGE_LENGTH:
+        raise InvalidAlert(f"Message must be at most {MAX_MESSAGE_LENGTH} characters")
+    try:
+        offsets = normalize_offsets(alert_before)
+    except ValueError as e:
+        raise InvalidAlert(str(e)) from None
+    if not all(0 <= offset <= MAX_ALERT_BEFORE for offset in offsets):
+        raise InvalidAlert(f"Alert before must be between 0 and {MAX_ALERT_BEFORE} minutes")
+
+    if rule is not None:
+        try:
+            compile_rule(rule, event_time)
+        except RuleError as e:
+            raise InvalidAlert(f"Invalid repeat rule: {e}") from None
+        return
+
+    send_time = event_time - timedelta(minutes=offsets[0])
+    if send_time < now:
+        raise InvalidAlert(
+            f"Alert would fire in the past!\nEvent time: {event_time.strftime('%Y-%m-%d %H:%M UTC')}\n"
+            f"Alert send time: {send_time.strftime('%Y-%m-%d %H:%M UTC')}\n"
+            f"Current time: {now.strftime('%Y-%m-%d %H:%M UTC')}"
+        )
+
+
+class CustomAlert:
+    """
+    An alert posted `alert_before` minutes before `event_time` - or once per
+    offset when `alert_before` lists several.
+
+    With a `rule` ("every 2 weeks", or cron) it recurs: `event_time` is the
+    first occurrence and `recurrence` the rule compiled once, with the same
+    next_after/between interface as an Event's Recurrence.
+    """
+
+    __slots__ = ('id', 'event_time', 'name', 'message', 'offsets', 'rule', 'recurrence')
+
+    def __init__(self, id, event_time, name, message, alert_before, rule=None):
+        self.id = id
+        self.event_time = event_time
+        self.name = name
+        self.message = message
+        self.offsets = normalize_offsets(alert_before)
+        self.rule = rule
+        self.recurrence = compile_rule(rule, event_time) if rule is not None else None
+
+    def __repr__(self):
+        return f"CustomAlert({self.id!r}, {self.name!r}, {self.event_time.isoformat()})"
+
+    @property
+    def alert_before(self):
+        """The earliest reminder's offset in minutes"""
+        return self.offsets[0]
+
+    @property
+    def send_time(self):
+        """When the earliest reminder goes out"""
+        return self.event_time - timedelta(minutes=self.offsets[0])
+
+    def triggers(self):
+        """(send timestamp, id, offset) for each reminder of a one-time alert"""
+        event_ts = to_timestamp(self.event_time)
+        return [(event_ts - offset * 60, self.id, offset) for offset in self.offsets]
+
+    def render(self, alert_before=None):
+        """Alert text with the {ALERT_MINUTES} placeholder filled in (for one offset; default the earliest)"""
+        return self.message.replace("{ALERT_MINUTES}", str(alert_before if alert_before is not None else self.offsets[0]))
+
+
+class AlertStore:
+    """
+    Pending custom alerts.
+
+    `_by_id` gives O(1) lookup; `_index` is a sorted (first send timestamp,
+    id) index of one-time alerts, so add/remove are O(log n) and pages are
+    sliced straight out of it without copying. `_triggers` holds one
+    (send timestamp, id, offset) entry per reminder, so "due now" is a
+    prefix pop and an alert leaves the store with its last reminder.
+    Recurring alerts never become due here - they are armed on the engine
+    like recurring events - and are kept in `_recurring`.
+    """
+
+    __slots__ = ('_by_id', '_index', '_triggers', '_recurring', '_next_id')
+
+    def __init__(self, alerts=()):
+        self._by_id = {}
+        self._index = SortedList()
+        self._triggers = SortedList()
+        self._recurring = {}
+        self._next_id = 1
+        for alert in alerts:
+            self.insert(alert)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __bool__(self):
+        return bool(self._by_id)
+
+    def __contains__(self, alert_id):
+        return alert_id in self._by_id
+
+    def __iter__(self):
+        """One-time alerts in send-time order"""
+        by_id = self._by_id
+        return (by_id[alert_id] for _, alert_id in self._index)
+
+    def get(self, alert_id):
+        return self._by_id.get(alert_id)
+
+    def recurring(self):
+        """Recurring alerts in creation order"""
+        return self._recurring.values()
+
+    def create(self, event_time, name, message, alert_before, rule=None):
+        """Build a new alert with the next free ID and index it"""
+        alert = CustomAlert(self._next_id, event_time, name, message, alert_before, rule)
+        self.insert(alert)
+        return alert
+
+    def create_many(self, entries):
+        """
+        Build and index alerts from (event_time, name, message, alert_before)
+        tuples in one batch; the index is merged once instead of per alert.
+        """
+        alerts = []
+        for event_time, name, message, alert_before in entries:
+            alert = CustomAlert(self._next_id, event_time, name, message, alert_before)
+            self._by_id[alert.id] = alert
+            self._next_id += 1
+            alerts.append(alert)
+        self._index.update((to_timestamp(alert.send_time), alert.id) for alert in alerts)
+        self._triggers.update(trigger for alert in alerts for trigger in alert.triggers())
+        return alerts
+
+    def insert(self, alert):
+        if alert.id in self._by_id:
+            raise ValueError(f"Duplicate custom alert ID {alert.id}")
+        self._by_id[alert.id] = alert
+        if alert.recurrence is not None:
+            self._recurring[alert.id] = alert
+        else:
+            self._index.add((to_timestamp(alert.send_time), alert.id))
+            self._triggers.update(alert.triggers())
+        self._next_id = max(self._next_id, alert.id + 1)
+
+    def remove(self, alert_id):
+        """Remove and return the alert with this ID, or None"""
+        alert = self._by_id.pop(alert_id, None)
+        if alert is None:
+            return None
+        if alert.recurrence is not None:
+            del self._recurring[alert_id]
+        else:
+            self._index.remove((to_timestamp(alert.send_time), alert_id))
+            for trigger in alert.triggers():
+                self._triggers.discard(trigger)
+        return alert
+
+    def next_send_time(self):
+        """Send time of the earliest pending reminder, or None"""
+        if not self._triggers:
+            return None
+        return from_timestamp(self._triggers[0][0])
+
+    def pop_due(self, now):
+        """
+        Remove and return (alert, offset) for every reminder whose send time
+        is at or before now, earliest first. An alert is removed with its
+        last reminder.
+        """
+        end = self._triggers.bisect_right((to_timestamp(now), float('inf')))
+        due = []
+        for _, alert_id, offset in self._triggers.islice(0, end):
+            alert = self._by_id[alert_id]
+            due.append((alert, offset))
+            if offset == alert.offsets[-1]:
+                del self._by_id[alert_id]
+                self._index.remove((to_timestamp(alert.send_time), alert_id))
+        del self._triggers[:end]
+        return due
+
+    def send_between(self, start, end):
+        """One-time alerts whose first send time is in [start, end), earliest first"""
+        by_id = self._by_id
+        keys = self._index.irange((to_timestamp(start),), (to_timestamp(end),), inclusive=(True, False))
+        return (by_id[alert_id] for _, alert_id in keys)
+
+    def page(self, offset, limit):
+        """Alerts [offset, offset + limit): recurring ones first, then one-time alerts in send-time order"""
+        recurring = list(self._recurring.values())[offset:offset + limit]
+        offset = max(offset - len(self._recurring), 0)
+        limit -= len(recurring)
+        by_id = self._by_id
+        return recurring + [by_id[alert_id] for _, alert_id in self._index.islice(offset, offset + limit)]
@@ -0,0 +1,288 @@
+"""
+Benchmarks for the scheduler's hot paths, with machine-readable output.
+
+    python -m reminders.bench
+    python -m reminders.bench --events 50 --alerts 500 --json bench.json
+
+Covers next-occurrence lookups for reference dates years in the past, one
+scheduler tick with N due events and M pending custom alerts, /today's
+event list and rendering the /events embed through a stubbed Discord
+client (no network). Each benchmark reports throughput and p50/p99
+latency.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import types
+from datetime import datetime, timedelta, timezone
+
+from reminders.clock import VirtualClock
+from reminders.events import Event, EventRegistry
+from reminders.recurrence import Recurrence
+from reminders.service import ReminderService
+from reminders.store import Store
+
+NOW = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+
+
+# === RESULTS ===
+
+def summarize(name, samples_ns, **params):
+    """Result dict for one benchmark from per-iteration timings in nanoseconds"""
+    samples = sorted(samples_ns)
+    count = len(samples)
+    total = sum(samples)
+    return {
+        'name': name,
+        'iterations': count,
+        'ops_per_sec': count / (total / 1e9) if total else float('inf'),
+        'p50_us': samples[count // 2] / 1000,
+        'p99_us': samples[min(count - 1, int(count * 0.99))] / 1000,
+        'params': params,
+    }
+
+
+def measure(fn, iterations):
+    perf = time.perf_counter_ns
+    samples = []
+    for _ in range(iterations):
+        start = perf()
+        fn()
+        samples.append(perf() - start)
+    return samples
+
+
+async def measure_async(fn, iterations):
+    perf = time.perf_counter_ns
+    samples = []
+    for _ in range(iterations):
+        start = perf()
+        await fn()
+        samples.append(perf() - start)
+    return samples
+
+
+# === FIXTURES ===
+
+def synthetic_events(count, anchor):
+    """`count` 48h events sharing one anchor, so they all fall due in the same tick"""
+    return EventRegistry(
+        Event(f"bench_{i}", f"Bench event {i}", Recurrence.every(anchor, hours=48),
+              f"@everyone Bench event {i} starts in {{ALERT_MINUTES}} minutes!", alert_before=10, kind='48h')
+        for i in range(count)
+    )
+
+
+async def _noop_sink(message):
+    pass
+
+
+def make_service(events, alerts, clock):
+    service = ReminderService(events, Store(":memory:"), _noop_sink, clock=clock, daily_summary=False)
+    # Far enough out that they stay pending (indexed, never due) for every tick
+    for i in range(alerts):
+        service.add_custom_alert(clock() + timedelta(days=365 * 20, minutes=i), f"Alert {i}", "Custom {ALERT_MINUTES}", 10)
+    return service
+
+
+def install_discord_stub():
+    """Register a minimal in-process `discord` module so bot.py imports without the network"""
+    discord = types.ModuleType("discord")
+
+    class Intents:
+        @staticmethod
+        def default():
+            return Intents()
+
+    class Client:
+        user = "bench#0000"
+
+        def __init__(self, **kwargs):
+            pass
+
+        def event(self, fn):
+            return fn
+
+        async def wait_until_ready(self):
+            pass
+
+        def get_channel(self, channel_id):
+            return None
+
+    class CommandTree:
+        def __init__(self, client):
+            pass
+
+        def command(self, **kwargs):
+            return lambda fn: fn
+
+    class _ColorMeta(type):
+        def __getattr__(cls, name):
+            return lambda *args: name
+
+    class Color(metaclass=_ColorMeta):
+        pass
+
+    class Embed:
+        def __init__(self, title=None, description=None, color=None):
+            self.title = title
+            self.description = description
+            self.fields = []
+            self.footer = None
+
+        def add_field(self, name, value, inline=True):
+            self.fields.append((name, value, inline))
+
+        def set_footer(self, text=None):
+            self.footer = text
+
+    class HTTPException(Exception):
+        pass
+
+    discord.Intents = Intents
+    discord.Client = Client
+    discord.AutoShardedClient = Client
+    discord.TextChannel = object
+    discord.Embed = Embed
+    discord.Color = Color
+    discord.Interaction = object
+    discord.Attachment = object
+    discord.Object = lambda id: types.SimpleNamespace(id=id)
+    discord.HTTPException = HTTPException
+    discord.Forbidden = type("Forbidden", (HTTPException,), {})
+    discord.NotFound = type("NotFound", (HTTPException,), {})
+    discord.app_commands = types.SimpleNamespace(
+        CommandTree=CommandTree,
+        default_permissions=lambda **kwargs: (lambda fn: fn),
+    )
+    sys.modules["discord"] = discord
+    return discord
+
+
+class StubInteraction:
+    """Just enough of discord.Interaction for read-only slash commands"""
+
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        self.sent = []
+        self.response = self
+        self.user = types.SimpleNamespace(mention="@bench")
+
+    async def send_message(self, content=None, embed=None, ephemeral=False):
+        self.sent.append(embed or content)
+
+
+# === BENCHMARKS ===
+
+def bench_next_occurrence(iterations):
+    results = []
+    for years in (0, 1, 10):
+        reference = NOW - timedelta(days=365 * years)
+        for name, recurrence in (
+            ("48h", Recurrence.every(reference, hours=48)),
+            ("weekly", Recurrence.weekly(reference.weekday(), 20, 0)),
+            ("biweekly", Recurrence.weekly(reference.weekday(), 12, 0, weeks=2, reference=reference)),
+            ("4weekly", Recurrence.weekly(reference.weekday(), 12, 0, weeks=4, reference=reference)),
+        ):
+            samples = measure(lambda: recurrence.next_after(NOW), iterations)
+            results.append(summarize(f"next_occurrence.{name}", samples, reference_years_ago=years))
+    return results
+
+
+async def bench_tick(events, alerts, iterations):
+    clock = VirtualClock(NOW)
+    service = make_service(synthetic_events(events, NOW - timedelta(days=365)), alerts, clock)
+    service.arm_all(clock())
+    engine = service.engine
+
+    async def tick():
+        clock.set(engine.next_deadline())
+        await engine.fire_due()
+
+    samples = await measure_async(tick, iterations)
+    arm = measure(lambda: service.arm_all(clock()), iterations)
+    service.store.close()
+    return [
+        summarize("scheduler.tick", samples, events=events, custom_alerts=alerts),
+        summarize("scheduler.arm_all", arm, events=events, custom_alerts=alerts),
+    ]
+
+
+def bench_todays_events(events, alerts, iterations):
+    clock = VirtualClock(NOW)
+    service = make_service(synthetic_events(events, NOW - timedelta(days=365)), alerts, clock)
+    warm = measure(lambda: service.todays_events(NOW), iterations)
+
+    def cold():
+        service.timeline.invalidate()
+        service.todays_events(NOW)
+
+    cold_samples = measure(cold, iterations)
+    service.store.close()
+    return [
+        summarize("todays_events.warm", warm, events=events, custom_alerts=alerts),
+        summarize("todays_events.cold", cold_samples, events=events, custom_alerts=alerts),
+    ]
+
+
+async def bench_events_embed(iterations):
+    install_discord_stub()
+    # Forced, not defaulted: on the bot's own host these point at live state,
+    # and the benchmark configures a fake guild.
+    os.environ["CHANNEL_ID"] = "0"
+    os.environ["DB_PATH"] = ":memory:"
+    import bot
+
+    service = bot.guilds.configure(1, 1)
+    show_events = getattr(bot.show_events, "callback", bot.show_events)
+    samples = await measure_async(lambda: show_events(StubInteraction(1)), iterations)
+    bot.guilds.store.close()
+    return [summarize("command.events_embed", samples, events=len(service.events.enabled()))]
+
+
+async def run_all(events, alerts, iterations):
+    results = bench_next_occurrence(iterations * 10)
+    results += await bench_tick(events, alerts, iterations)
+    results += bench_todays_events(events, alerts, iterations)
+    results += await bench_events_embed(iterations)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m reminders.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=50, help="Registered events for tick benchmarks (default: 50)")
+    parser.add_argument("--alerts", type=int, default=500, help="Pending custom alerts (default: 500)")
+    parser.add_argument("--iterations", type=int, default=1000, help="Iterations per benchmark (default: 1000)")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON to PATH ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_all(args.events, args.alerts, args.iterations))
+    report = {
+        'python': platform.python_version(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'results': results,
+    }
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return 0
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"{'benchmark':<28} {'params':<36} {'ops/s':>12} {'p50 µs':>10} {'p99 µs':>10}")
+    for result in results:
+        params = ", ".join(f"{k}={v}" for k, v in result['params'].items())
+        print(f"{result['name']:<28} {params:<36} {result['ops_per_sec']:>12,.0f} "
+              f"{result['p50_us']:>10.2f} {result['p99_us']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
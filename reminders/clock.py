@@ -0,0 +1,28 @@
+"""Clocks: the real UTC wall clock and a manually advanced one for simulations."""
+from datetime import datetime, timezone
+
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+class VirtualClock:
+    """Callable clock that only moves when told to."""
+
+    __slots__ = ('_now',)
+
+    def __init__(self, start):
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self._now = start
+
+    def __call__(self):
+        return self._now
+
+    def set(self, moment):
+        if moment < self._now:
+            raise ValueError("VirtualClock cannot move backwards")
+        self._now = moment
+
+    def advance(self, delta):
+        self.set(self._now + delta)
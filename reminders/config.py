@@ -0,0 +1,24 @@
+"""Feature switches and the location of the event schedule file."""
+import os
+
+from reminders.schedule import load_schedule
+
+# === FEATURES ===
+ENABLE_TEST_ALERT = False  # Set to True to enable test alerts every 5 minutes
+ENABLE_DAILY_SUMMARY = True  # Set to True to send daily event summary at 00:00 UTC
+
+
+# === MISSED ALERTS ===
+CATCH_UP_GRACE_MINUTES = 30  # Alerts missed by more than this are dropped instead of sent late
+COLLAPSE_MISSED_ALERTS = True  # Send several missed alerts as one "missed while offline" message
+
+# === EVENT SCHEDULE ===
+# Recurring events live in schedule.toml (or a .json file with the same
+# layout) and are reloaded while the bot runs whenever the file changes.
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEDULE_PATH = os.getenv("SCHEDULE_PATH", os.path.join(PROJECT_DIR, "schedule.toml"))
+SCHEDULE_POLL_SECONDS = 5  # How often the file's modification time is checked
+# Guilds can pick a named schedule instead with /setup: schedules/<name>.toml
+SCHEDULE_DIR = os.getenv("SCHEDULE_DIR", os.path.join(PROJECT_DIR, "schedules"))
+
+EVENTS = load_schedule(SCHEDULE_PATH)
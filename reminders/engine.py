@@ -0,0 +1,121 @@
+"""Deadline-driven scheduler that sleeps until the earliest pending alert."""
+import asyncio
+import heapq
+import itertools
+import time
+
+from reminders.clock import utc_now
+
+# Re-read the wall clock at least this often so a suspended host or an
+# NTP step cannot leave us sleeping past a deadline.
+MAX_SLEEP_SECONDS = 3600
+
+
+class DeadlineScheduler:
+    """
+    Priority queue of keyed deadlines.
+
+    Each key holds at most one pending deadline; scheduling a key again
+    replaces its previous deadline. The run loop awaits exactly until the
+    earliest deadline and is woken early whenever the queue changes.
+    """
+
+    def __init__(self, now=utc_now, on_wake=None, on_tick=None):
+        self._now = now
+        self._on_wake = on_wake  # called with the current time after each pass
+        self._on_tick = on_tick  # called with the seconds each pass spent firing jobs
+        self.last_wake = None  # time of the last completed pass of run()
+        self._heap = []  # (when, seq, key) - may contain stale entries
+        self._entries = {}  # key -> (when, seq, callback)
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def schedule(self, key, when, callback):
+        """Arm (or re-arm) key so that `await callback(when)` runs at `when`"""
+        seq = next(self._counter)
+        self._entries[key] = (when, seq, callback)
+        heapq.heappush(self._heap, (when, seq, key))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+        self._wakeup.set()
+
+    def cancel(self, key):
+        """Drop the pending deadline for key, if any"""
+        if self._entries.pop(key, None) is not None:
+            self._wakeup.set()
+
+    def deadline(self, key):
+        """Return the pending deadline for key, or None"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def next_deadline(self):
+        """Return the earliest pending deadline, or None when idle"""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def _is_live(self, item):
+        entry = self._entries.get(item[2])
+        return entry is not None and entry[1] == item[1]
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+
+    def _compact(self):
+        self._heap = [(when, seq, key) for key, (when, seq, _) in self._entries.items()]
+        heapq.heapify(self._heap)
+
+    async def fire_due(self):
+        """Run every callback whose deadline has passed, earliest first"""
+        now = self._now()
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return
+            when, _, key = heapq.heappop(self._heap)
+            _, _, callback = self._entries.pop(key)
+            try:
+                await callback(when)
+            except Exception as e:
+                print(f"⚠️ Scheduled job {key!r} failed: {e!r}")
+
+    async def run(self):
+        while True:
+            self._wakeup.clear()
+            started = time.perf_counter()
+            await self.fire_due()
+            if self._on_tick is not None:
+                self._on_tick(time.perf_counter() - started)
+            self.last_wake = self._now()
+            if self._on_wake is not None:
+                self._on_wake(self.last_wake)
+            deadline = self.next_deadline()
+            timeout = None
+            if deadline is not None:
+                delay = (deadline - self._now()).total_seconds()
+                timeout = min(max(delay, 0), MAX_SLEEP_SECONDS)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start the run loop on the current event loop (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    def stop(self):
+        """Cancel the run loop; pending deadlines stay queued for the next start()"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,128 @@
+"""Declarative registry of recurring events keyed by a stable event ID."""
+
+# kind -> (section title, cadence description)
+EVENT_KINDS = {
+    '48h': ("48-Hour Events", "Repeats every 2 days"),
+    'weekly': ("Weekly Events", "Repeats every week"),
+    'biweekly': ("Biweekly Events", "Repeats every 2 weeks"),
+    '4weekly': ("4-Weekly Events", "Repeats every 4 weeks"),
+}
+
+MAX_OFFSETS = 10  # Reminders per event or custom alert
+
+
+def normalize_offsets(value):
+    """
+    Alert offsets (minutes before the event) as a tuple, earliest reminder
+    first. Accepts one number, an iterable of numbers or text like "60, 10".
+    Raises ValueError.
+    """
+    if isinstance(value, str):
+        try:
+            value = [int(part) for part in value.replace(";", ",").split(",") if part.strip()]
+        except ValueError:
+            raise ValueError("Alert offsets must be whole numbers of minutes, e.g. 60,10") from None
+    elif isinstance(value, int):
+        value = [value]
+    offsets = tuple(sorted(set(value), reverse=True))
+    if not offsets:
+        raise ValueError("At least one alert offset is required")
+    if len(offsets) > MAX_OFFSETS:
+        raise ValueError(f"At most {MAX_OFFSETS} alert offsets are allowed")
+    if any(not isinstance(offset, int) or isinstance(offset, bool) or offset < 0 for offset in offsets):
+        raise ValueError("Alert offsets must be whole numbers of minutes")
+    return offsets
+
+
+def format_offsets(offsets):
+    """'10 min' or '1440, 60 and 10 min'"""
+    if len(offsets) == 1:
+        return f"{offsets[0]} min"
+    return f"{', '.join(str(offset) for offset in offsets[:-1])} and {offsets[-1]} min"
+
+
+def trigger_key(key, offset):
+    """Run-state and engine key for one offset of a recurring event or alert"""
+    return f"{key}@{offset}"
+
+
+class Event:
+    """
+    One recurring event: when it happens and what to post before it starts.
+
+    `alert_before` is one offset in minutes or several; each offset is its
+    own reminder for every occurrence.
+    """
+
+    __slots__ = ('id', 'name', 'recurrence', 'offsets', 'message', 'kind', 'enabled')
+
+    def __init__(self, id, name, recurrence, message, alert_before=10, kind='weekly', enabled=True):
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown event kind {kind!r}")
+        self.id = id
+        self.name = name
+        self.recurrence = recurrence
+        self.message = message
+        self.offsets = normalize_offsets(alert_before)
+        self.kind = kind
+        self.enabled = enabled
+
+    def __repr__(self):
+        return f"Event({self.id!r}, {self.name!r}, {self.recurrence!r})"
+
+    @property
+    def alert_before(self):
+        """The earliest reminder's offset in minutes"""
+        return self.offsets[0]
+
+    def render(self, alert_before=None):
+        """Alert text with the {ALERT_MINUTES} placeholder filled in (for one offset; default the earliest)"""
+        return self.message.replace("{ALERT_MINUTES}", str(alert_before if alert_before is not None else self.offsets[0]))
+
+
+class EventRegistry:
+    """Ordered mapping of event ID -> Event with a cached tuple of enabled events."""
+
+    __slots__ = ('_events', '_enabled')
+
+    def __init__(self, events=()):
+        self._events = {}
+        self._enabled = ()
+        for event in events:
+            self.add(event)
+
+    def add(self, event):
+        if event.id in self._events:
+            raise ValueError(f"Duplicate event ID {event.id!r}")
+        self._events[event.id] = event
+        self._refresh()
+
+    def remove(self, event_id):
+        event = self._events.pop(event_id)
+        self._refresh()
+        return event
+
+    def _refresh(self):
+        self._enabled = tuple(event for event in self._events.values() if event.enabled)
+
+    def get(self, event_id):
+        return self._events.get(event_id)
+
+    def __contains__(self, event_id):
+        return event_id in self._events
+
+    def __iter__(self):
+        return iter(self._events.values())
+
+    def __len__(self):
+        return len(self._events)
+
+    def enabled(self):
+        """Enabled events in registration order"""
+        return self._enabled
+
+    def kind_enabled(self, kind):
+        return any(event.kind == kind for event in self._enabled)
+
+    def count(self, kind):
+        return sum(1 for event in self._enabled if event.kind == kind)
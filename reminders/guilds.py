@@ -0,0 +1,226 @@
+"""Every guild's alert state in one process, scheduled from one shared time index."""
+import asyncio
+import os
+import re
+from datetime import timedelta
+
+from reminders.clock import utc_now
+from reminders.engine import DeadlineScheduler
+from reminders.schedule import POLL_SECONDS, ScheduleError, ScheduleWatcher, load_schedule
+from reminders.service import ReminderService, load_engine_tick, save_engine_tick
+
+SCHEDULE_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class GuildManager:
+    """
+    One ReminderService per configured guild.
+
+    Every guild's jobs live in a single DeadlineScheduler keyed by
+    (guild_id, key), so the next due alert across all guilds is the top of
+    one heap and a wake-up never loops over guilds. Guilds on the same
+    schedule file share one compiled EventRegistry, and each schedule file
+    has one watcher that re-applies it to the guilds using it.
+
+    `send(channel_id, message)` is the async sink for every guild; each
+    guild's alerts go to its configured channel.
+    """
+
+    def __init__(self, store, send, default_schedule, schedule_dir=None, default_events=None, clock=utc_now,
+                 poll_seconds=POLL_SECONDS, on_tick=None, **service_options):
+        self.store = store
+        self.send = send
+        self.default_schedule = default_schedule
+        self.schedule_dir = schedule_dir
+        self.clock = clock
+        self.poll_seconds = poll_seconds
+        self.service_options = service_options
+        self.engine = DeadlineScheduler(now=clock, on_wake=self.record_tick, on_tick=on_tick)
+        self.engine.last_wake = load_engine_tick(store)
+        self.started = False
+        self.watching = False
+
+        self._services = {}  # guild ID -> ReminderService
+        self.channels = {}  # guild ID -> alert channel ID
+        self.schedule_names = {}  # guild ID -> schedule name (None = default)
+        self._paths = {}  # guild ID -> schedule path
+        self._schedules = {}  # schedule path -> compiled EventRegistry
+        self._watchers = {}  # schedule path -> ScheduleWatcher
+        self._users = {}  # schedule path -> IDs of guilds on it
+        if default_events is not None:
+            self._schedules[default_schedule] = default_events
+
+    def __len__(self):
+        return len(self._services)
+
+    def __contains__(self, guild_id):
+        return guild_id in self._services
+
+    def __iter__(self):
+        return iter(self._services.values())
+
+    def get(self, guild_id):
+        """The guild's ReminderService, or None if it hasn't been set up"""
+        return self._services.get(guild_id)
+
+    def custom_alert_count(self):
+        return sum(len(service.custom_alerts) for service in self._services.values())
+
+    def record_tick(self, now):
+        save_engine_tick(self.store, now)
+
+    # === SCHEDULES ===
+
+    def schedule_path(self, name):
+        """File for a named schedule (None is the default schedule)"""
+        if name is None:
+            return self.default_schedule
+        if self.schedule_dir is None or not SCHEDULE_NAME.match(name):
+            raise ScheduleError(f"Unknown schedule {name!r}")
+        for extension in (".toml", ".json"):
+            path = os.path.join(self.schedule_dir, name + extension)
+            if os.path.exists(path):
+                return path
+        raise ScheduleError(f"Unknown schedule {name!r}")
+
+    def available_schedules(self):
+        """Names of the schedules in the schedule directory"""
+        if self.schedule_dir is None or not os.path.isdir(self.schedule_dir):
+            return []
+        names = {os.path.splitext(entry)[0] for entry in os.listdir(self.schedule_dir)
+                 if entry.endswith((".toml", ".json"))}
+        return sorted(name for name in names if SCHEDULE_NAME.match(name))
+
+    def _events_for(self, path):
+        """Compiled registry for a schedule file, loading and watching it on first use"""
+        events = self._schedules.get(path)
+        if events is None:
+            events = self._schedules[path] = load_schedule(path)
+        if path not in self._watchers:
+            watcher = ScheduleWatcher(path, lambda registry: self._reload(path, registry), self.poll_seconds)
+            self._watchers[path] = watcher
+            if self.watching:
+                watcher.start()
+        return events
+
+    def _reload(self, path, events):
+        self._schedules[path] = events
+        users = self._users.get(path, ())
+        for guild_id in users:
+            self._services[guild_id].replace_events(events)
+        print(f"🔄 Schedule reloaded from {path}: {len(events.enabled())} enabled event(s), {len(users)} guild(s)")
+
+    # === GUILDS ===
+
+    def load(self):
+        """Restore every configured guild from the store"""
+        for guild_id, (channel_id, schedule) in self.store.load_guilds().items():
+            self._restore(guild_id, channel_id, schedule)
+
+    def _restore(self, guild_id, channel_id, schedule):
+        try:
+            path = self.schedule_path(schedule)
+            events = self._events_for(path)
+        except ScheduleError as e:
+            print(f"⚠️ Guild {guild_id}: {e}; using the default schedule")
+            schedule, path = None, self.default_schedule
+            events = self._events_for(path)
+        return self._add(guild_id, channel_id, schedule, path, events)
+
+    def reload(self):
+        """Pick up guilds, alert channels and per-guild state another instance stored"""
+        self.engine.last_wake = load_engine_tick(self.store)
+        for guild_id, (channel_id, schedule) in self.store.load_guilds().items():
+            service = self._services.get(guild_id)
+            if service is None:
+                self._restore(guild_id, channel_id, schedule)
+                continue
+            self.channels[guild_id] = channel_id
+            service.reload()
+
+    def _add(self, guild_id, channel_id, schedule, path, events):
+        self.channels[guild_id] = channel_id
+        self.schedule_names[guild_id] = schedule
+        self._paths[guild_id] = path
+        self._users.setdefault(path, set()).add(guild_id)
+
+        async def send(message):
+            await self.send(self.channels[guild_id], message)
+
+        service = ReminderService(events, self.store, send, clock=self.clock, engine=self.engine,
+                                  guild_id=guild_id, **self.service_options)
+        self._services[guild_id] = service
+        if self.started:
+            service.arm_all(self.clock())
+        return service
+
+    def configure(self, guild_id, channel_id, schedule=None):
+        """
+        Set (or change) a guild's alert channel and schedule; returns its service.
+        Raises ScheduleError for an unknown or invalid schedule.
+        """
+        path = self.schedule_path(schedule)
+        events = self._events_for(path)
+        self.store.set_guild(guild_id, channel_id, schedule)
+
+        service = self._services.get(guild_id)
+        if service is None:
+            return self._add(guild_id, channel_id, schedule, path, events)
+
+        self.channels[guild_id] = channel_id
+        self.schedule_names[guild_id] = schedule
+        old_path = self._paths[guild_id]
+        if old_path != path:
+            self._users[old_path].discard(guild_id)
+            self._users.setdefault(path, set()).add(guild_id)
+            self._paths[guild_id] = path
+            service.replace_events(events)
+        return service
+
+    async def adopt_default(self, guild_id, channel_id):
+        """Move single-server state (custom alerts, delivery ledger, subscriptions) to a real guild and configure it"""
+        # The move runs on the writer thread; the guild's service reads its result
+        await asyncio.wrap_future(self.store.adopt_default_guild(guild_id))
+        return self.configure(guild_id, channel_id)
+
+    def remove(self, guild_id, persist=True):
+        """
+        Disarm and forget a guild (e.g. the bot was removed from it); with
+        `persist=False` (a standby) the stored guild is left to the leader.
+        """
+        service = self._services.pop(guild_id, None)
+        if service is None:
+            return
+        service.disarm_all()
+        self._users[self._paths.pop(guild_id)].discard(guild_id)
+        self.channels.pop(guild_id, None)
+        self.schedule_names.pop(guild_id, None)
+        if persist:
+            self.store.remove_guild(guild_id)
+
+    # === LIFECYCLE ===
+
+    async def catch_up(self, now=None):
+        now = now or self.clock()
+        for service in list(self._services.values()):
+            await service.catch_up(now, prune=False)
+        self.store.prune_history(now - timedelta(days=30))
+
+    def start(self):
+        """Arm every guild's jobs, start the schedule watchers and the shared engine"""
+        self.started = True
+        now = self.clock()
+        for service in self._services.values():
+            service.arm_all(now)
+        self.watch()
+        return self.engine.start()
+
+    def watch(self):
+        """Start reloading schedule files on change; standbys do this too so their commands stay current"""
+        self.watching = True
+        for watcher in self._watchers.values():
+            watcher.start()
+
+    def stop(self):
+        """Stop firing alerts (another instance took over); commands keep working"""
+        self.engine.stop()
@@ -0,0 +1,124 @@
+"""Streaming iCalendar (RFC 5545) export of recurring events and custom alerts."""
+from datetime import timedelta
+
+from reminders.recurrence import Recurrence, from_timestamp, to_timestamp
+
+PRODUCT_ID = "-//Reminders//Event Scheduler//EN"
+EVENT_DURATION = timedelta(hours=1)  # Events have no end time; calendars need one
+EXPAND_HORIZON = timedelta(days=90)  # How far ahead occurrences are listed when no RRULE fits
+
+
+def escape_text(value):
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold(line):
+    """Split a content line into 75-octet pieces (never inside a UTF-8 character)"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return encoded + b"\r\n"
+    pieces = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        pieces.append(encoded[:cut])
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return b"\r\n ".join(pieces) + b"\r\n"
+
+
+def format_utc(ts):
+    return from_timestamp(ts).strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_duration(seconds):
+    return f"PT{seconds // 60}M" if seconds % 60 == 0 else f"PT{seconds}S"
+
+
+def rrule(period):
+    """RRULE for a fixed period in seconds, or None if it can't be written as one"""
+    for unit, seconds in (("WEEKLY", 604800), ("DAILY", 86400), ("HOURLY", 3600), ("MINUTELY", 60)):
+        if period % seconds == 0:
+            return f"RRULE:FREQ={unit};INTERVAL={period // seconds}"
+    return None
+
+
+def recurrence_rule(recurrence):
+    """(first occurrence, RRULE line or None) for an event's or recurring alert's rule"""
+    if isinstance(recurrence, Recurrence):
+        return recurrence.anchor, rrule(recurrence.period)
+    return recurrence.next_ts(recurrence.start - 1), recurrence.rrule()
+
+
+def _recurring(uid, domain, stamp, recurrence, summary, description, offsets, now_ts, horizon):
+    start_ts, rule = recurrence_rule(recurrence)
+    if rule is not None:
+        yield from _vevent(f"{uid}@{domain}", stamp, start_ts, summary, description, offsets, rule)
+        return
+    for ts in recurrence.between_ts(now_ts, now_ts + int(horizon.total_seconds())):
+        yield from _vevent(f"{uid}-{ts}@{domain}", stamp, ts, summary, description, offsets)
+
+
+def _vevent(uid, stamp, start_ts, summary, description, offsets, rule=None):
+    yield "BEGIN:VEVENT"
+    yield f"UID:{uid}"
+    yield f"DTSTAMP:{stamp}"
+    yield f"DTSTART:{format_utc(start_ts)}"
+    yield f"DURATION:{format_duration(int(EVENT_DURATION.total_seconds()))}"
+    if rule:
+        yield rule
+    yield f"SUMMARY:{escape_text(summary)}"
+    if description:
+        yield f"DESCRIPTION:{escape_text(description)}"
+    for offset in offsets:
+        yield "BEGIN:VALARM"
+        yield "ACTION:DISPLAY"
+        yield f"DESCRIPTION:{escape_text(summary)}"
+        yield f"TRIGGER:-PT{offset}M"
+        yield "END:VALARM"
+    yield "END:VEVENT"
+
+
+def iter_ics(events, alerts, now, calendar_name="Events", domain="reminders", horizon=EXPAND_HORIZON):
+    """
+    Yield the calendar as unfolded content lines.
+
+    Each enabled recurring event (and recurring custom alert) becomes one
+    VEVENT with an RRULE starting at its first occurrence; a rule no RRULE
+    can express is expanded into single occurrences up to `horizon` from
+    now. One-time custom alerts are single VEVENTs. Every event carries one
+    VALARM per alert offset.
+    """
+    now_ts = to_timestamp(now)
+    stamp = format_utc(now_ts)
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield f"PRODID:{PRODUCT_ID}"
+    yield "CALSCALE:GREGORIAN"
+    yield f"X-WR-CALNAME:{escape_text(calendar_name)}"
+
+    for event in events.enabled():
+        description = event.render().replace("@everyone", "").strip()
+        yield from _recurring(event.id, domain, stamp, event.recurrence, event.name, description, event.offsets,
+                              now_ts, horizon)
+
+    for alert in alerts.recurring():
+        yield from _recurring(f"custom-{alert.id}", domain, stamp, alert.recurrence, alert.name, alert.render(),
+                              alert.offsets, now_ts, horizon)
+
+    for alert in alerts:
+        yield from _vevent(f"custom-{alert.id}@{domain}", stamp, to_timestamp(alert.event_time), alert.name,
+                           alert.render(), alert.offsets)
+
+    yield "END:VCALENDAR"
+
+
+def write_ics(stream, events, alerts, now, **options):
+    """Write the calendar to a binary stream line by line; returns the byte count"""
+    written = 0
+    for line in iter_ics(events, alerts, now, **options):
+        written += stream.write(fold(line))
+    return written
@@ -0,0 +1,211 @@
+"""Bulk import of custom alerts from CSV or iCalendar (.ics) files."""
+import csv
+import io
+import re
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from reminders.alerts import InvalidAlert, validate_custom_alert
+from reminders.events import normalize_offsets
+
+MAX_IMPORT_BYTES = 1024 * 1024
+MAX_IMPORT_ROWS = 1000
+DEFAULT_ALERT_BEFORE = 10
+DEFAULT_MESSAGE = "🔔 **{name}** starts in {{ALERT_MINUTES}} minutes!"
+
+CSV_COLUMNS = ('name', 'date', 'time', 'message')  # plus an optional alert_before
+DURATION = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+class ImportFailed(ValueError):
+    """The file as a whole can't be imported (wrong type, too big, bad header)."""
+
+
+def parse_alerts(data, filename, now):
+    """
+    Parse and validate an uploaded file.
+
+    Returns (entries, rejects): entries are (event_time, name, message,
+    alert_before) tuples that passed the same checks as /add, ready for
+    ReminderService.add_custom_alerts; rejects are (where, reason) pairs.
+    The file is decoded and parsed line by line rather than split up front.
+    """
+    if len(data) > MAX_IMPORT_BYTES:
+        raise ImportFailed(f"File is larger than {MAX_IMPORT_BYTES // 1024} KB")
+
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline="")
+    extension = filename.lower().rsplit(".", 1)[-1]
+    if extension == "csv":
+        rows = _csv_rows(lines)
+    elif extension in ("ics", "ical"):
+        rows = _ics_rows(lines)
+    else:
+        raise ImportFailed("Attach a .csv or .ics file")
+
+    entries = []
+    rejects = []
+    try:
+        for where, row in rows:
+            if len(entries) + len(rejects) >= MAX_IMPORT_ROWS:
+                rejects.append((where, f"Import limit of {MAX_IMPORT_ROWS} rows reached; the rest was skipped"))
+                break
+            try:
+                if isinstance(row, str):
+                    raise InvalidAlert(row)
+                validate_custom_alert(*row, now)
+            except InvalidAlert as e:
+                rejects.append((where, str(e)))
+                continue
+            event_time, name, message, alert_before = row
+            entries.append((event_time, name.strip(), message, alert_before))
+    except UnicodeDecodeError:
+        raise ImportFailed("File is not UTF-8 text") from None
+    except csv.Error as e:  # e.g. a field over the csv module's size limit
+        raise ImportFailed(f"File is not valid CSV: {e}") from None
+    return entries, rejects
+
+
+# === CSV ===
+
+def _csv_rows(lines):
+    """(where, row or reason) per data row of a name,date,time,message[,alert_before] file"""
+    reader = csv.reader(lines)
+    header = [column.strip().lower() for column in next(reader, [])]
+    missing = [column for column in CSV_COLUMNS if column not in header]
+    if missing:
+        raise ImportFailed(f"CSV header is missing column(s): {', '.join(missing)} "
+                           f"(expected {','.join(CSV_COLUMNS)}[,alert_before])")
+    index = {column: header.index(column) for column in header}
+
+    for values in reader:
+        where = f"Row {reader.line_num}"
+        if not any(value.strip() for value in values):
+            continue
+        if len(values) < len(header):
+            values = values + [""] * (len(header) - len(values))
+        yield where, _csv_row(values, index)
+
+
+def _csv_row(values, index):
+    try:
+        event_time = datetime.strptime(f"{values[index['date']].strip()} {values[index['time']].strip()}",
+                                       "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return "Expected date as YYYY-MM-DD and time as HH:MM (UTC)"
+
+    alert_before = DEFAULT_ALERT_BEFORE
+    if 'alert_before' in index and values[index['alert_before']].strip():
+        try:
+            alert_before = normalize_offsets(values[index['alert_before']])
+        except ValueError as e:
+            return str(e)
+    return (event_time, values[index['name']], values[index['message']], alert_before)
+
+
+# === ICS ===
+
+def _unfold(lines):
+    """Content lines with RFC 5545 line folding undone"""
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _split(line):
+    """NAME;PARAM=x:VALUE -> (NAME, {PARAM: x}, VALUE)"""
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    pairs = (param.partition("=") for param in params)
+    return name.upper(), {key.upper(): param for key, _, param in pairs}, value
+
+
+def _unescape(value):
+    return re.sub(r"\\([\\;,nN])", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def _ics_time(value, params):
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        day = datetime.strptime(value, "%Y%m%d")
+        return day.replace(tzinfo=timezone.utc)
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+    moment = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    tzid = params.get("TZID")
+    if tzid is None:
+        return moment.replace(tzinfo=timezone.utc)  # floating time: read as UTC like every other time here
+    try:
+        return moment.replace(tzinfo=ZoneInfo(tzid.strip('"'))).astimezone(timezone.utc)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown time zone {tzid!r}") from None
+
+
+def _ics_minutes_before(value):
+    """Minutes before the start for a -PT15M style trigger, or None"""
+    match = DURATION.match(value)
+    if match is None or match.group(1) != "-":
+        return None
+    weeks, days, hours, minutes, seconds = (int(part or 0) for part in match.groups()[1:])
+    return (weeks * 7 + days) * 1440 + hours * 60 + minutes + (seconds + 59) // 60
+
+
+def _ics_rows(lines):
+    """(where, row or reason) per VEVENT"""
+    event = None
+    in_alarm = False
+    count = 0
+    for line in _unfold(lines):
+        name, params, value = _split(line)
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {}
+            count += 1
+        elif event is None:
+            continue
+        elif name == "BEGIN" and value.upper() == "VALARM":
+            in_alarm = True
+        elif name == "END" and value.upper() == "VALARM":
+            in_alarm = False
+        elif in_alarm:
+            if name == "TRIGGER" and params.get("RELATED", "START") == "START":
+                minutes = _ics_minutes_before(value)
+                if minutes is not None:
+                    event.setdefault('offsets', []).append(minutes)
+        elif name == "END" and value.upper() == "VEVENT":
+            yield _ics_event(event, count)
+            event = None
+        elif name in ("SUMMARY", "DESCRIPTION"):
+            event[name] = _unescape(value)
+        elif name in ("DTSTART", "RRULE"):
+            event[name] = (value, params)
+
+
+def _ics_event(event, count):
+    summary = event.get("SUMMARY", "").strip()
+    where = f"Event {count}" + (f" ({summary[:40]})" if summary else "")
+    if "RRULE" in event:
+        return where, "Recurring events can't be imported as custom alerts"
+    if "DTSTART" not in event:
+        return where, "Event has no start time"
+    try:
+        event_time = _ics_time(*event["DTSTART"])
+    except ValueError as e:
+        return where, f"Unreadable start time: {e}"
+
+    alert_before = event.get('offsets') or DEFAULT_ALERT_BEFORE
+    message = event.get("DESCRIPTION", "").strip() or DEFAULT_MESSAGE.format(name=summary)
+    return where, (event_time, summary, message, alert_before)
+
+
+def format_rejects(rejects, limit=10):
+    """Short multi-line summary of rejected rows"""
+    lines = [f"• {where}: {reason.splitlines()[0]}" for where, reason in rejects[:limit]]
+    if len(rejects) > limit:
+        lines.append(f"…and {len(rejects) - limit} more")
+    return "\n".join(lines)
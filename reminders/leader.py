@@ -0,0 +1,90 @@
+"""Lease-based leader election, so overlapping instances never both schedule and post alerts."""
+import asyncio
+import os
+import socket
+from datetime import timedelta
+
+from reminders.clock import utc_now
+
+LEASE_NAME = 'scheduler'
+LEASE_SECONDS = 15  # A leader that stops renewing is replaced this long after its last renewal
+RENEW_SECONDS = 3  # How often the leader renews and standbys try to take over
+
+
+def default_holder():
+    """Identity of this process in the lease table"""
+    return f"{socket.gethostname()}:{os.getpid()}:{os.urandom(4).hex()}"
+
+
+class LeaderLease:
+    """
+    One named lease row in the state store's SQLite file.
+
+    Every instance tries to take (or renew) the lease every `renew_seconds`.
+    Taking it is a single conditional upsert that only succeeds while nobody
+    else holds an unexpired lease, so two instances can never both win. The
+    winner is the leader until it stops renewing: a standby takes over at
+    most `renew_seconds` after the lease expires, and a leader that can't
+    renew steps down once its own lease has run out. Shutting down releases
+    the lease so a standby takes over on its next attempt.
+
+    `on_elected()` and `on_deposed()` are called (without blocking the
+    renewals) whenever this instance gains or loses the lease.
+    """
+
+    def __init__(self, store, name=LEASE_NAME, holder=None, clock=utc_now, lease_seconds=LEASE_SECONDS,
+                 renew_seconds=RENEW_SECONDS):
+        self.store = store
+        self.name = name
+        self.holder = holder or default_holder()
+        self.clock = clock
+        self.lease = timedelta(seconds=lease_seconds)
+        self.renew_seconds = renew_seconds
+        self.leader = False
+        self.expires_at = None  # end of the lease we last renewed
+        self.on_elected = None
+        self.on_deposed = None
+        self._task = None
+
+    async def renew(self):
+        """Take or renew the lease once; returns whether this instance leads"""
+        now = self.clock()
+        expires_at = now + self.lease
+        try:
+            future = self.store.acquire_lease(self.name, self.holder, now.timestamp(), expires_at.timestamp())
+            held = await asyncio.wrap_future(future)
+        except Exception as e:
+            print(f"⚠️ Could not renew the {self.name} lease: {e!r}")
+            held = self.leader and self.clock() < self.expires_at
+        else:
+            if held:
+                self.expires_at = expires_at
+
+        if held and not self.leader:
+            self.leader = True
+            print(f"👑 {self.holder} holds the {self.name} lease; scheduling alerts")
+            if self.on_elected is not None:
+                self.on_elected()
+        elif not held and self.leader:
+            self.leader = False
+            print(f"⏸️ {self.holder} lost the {self.name} lease; standing by")
+            if self.on_deposed is not None:
+                self.on_deposed()
+        return held
+
+    async def run(self):
+        try:
+            while True:
+                await self.renew()
+                await asyncio.sleep(self.renew_seconds)
+        finally:
+            if self.leader:
+                self.store.release_lease(self.name, self.holder)
+
+    def start(self, on_elected=None, on_deposed=None):
+        """Start contending for the lease on the current event loop (no-op if already running)"""
+        self.on_elected = on_elected
+        self.on_deposed = on_deposed
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
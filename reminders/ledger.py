@@ -0,0 +1,50 @@
+"""Append-only record of delivered alerts, so each one is posted exactly once."""
+from collections import deque
+from datetime import timedelta
+
+RETENTION = timedelta(days=1)  # Minimum age before an entry is compacted away
+
+
+class DeliveryLedger:
+    """
+    (key, occurrence timestamp, offset) of every delivery for one guild.
+
+    `key` is an event ID, "custom:<id>", "daily_summary" or "test_alert";
+    the occurrence is the event time the alert was for and the offset its
+    minutes of warning (0 for jobs without one). Membership is a single set
+    lookup. Entries are also kept in append order with their send
+    timestamps, so compaction pops expired ones off the front instead of
+    scanning.
+    """
+
+    __slots__ = ('_entries', '_order')
+
+    def __init__(self, rows=()):
+        self._entries = set()
+        self._order = deque()
+        for key, occurrence, offset, send_ts in sorted(rows, key=lambda row: row[3]):
+            self.add(key, occurrence, offset, send_ts)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, entry):
+        return entry in self._entries
+
+    def add(self, key, occurrence, offset, send_ts):
+        """Record a delivery; returns False if it was already recorded"""
+        entry = (key, occurrence, offset)
+        if entry in self._entries:
+            return False
+        self._entries.add(entry)
+        self._order.append((send_ts, entry))
+        return True
+
+    def compact(self, before_ts):
+        """Drop entries sent before `before_ts`; returns how many went"""
+        order = self._order
+        removed = 0
+        while order and order[0][0] < before_ts:
+            self._entries.discard(order.popleft()[1])
+            removed += 1
+        return removed
@@ -0,0 +1,99 @@
+"""Connection lifecycle: one-time startup, leadership changes, and pausing deliveries across gateway outages."""
+import asyncio
+
+from reminders.clock import utc_now
+
+
+class Lifecycle:
+    """
+    Ties the gateway's connect/disconnect events to the bot's background work.
+
+    `ready()` starts everything exactly once (outbox, catch-up, engine and any
+    extra `services` with a start() method); later calls do nothing. While
+    any shard is disconnected the engine keeps running but the outbox is
+    paused, so due alerts are buffered (bounded by the outbox) and flushed in
+    order once every shard is back. Every outage is persisted and reported
+    to `on_outage(seconds)`.
+
+    With a `lease` (see reminders.leader) several instances can run at once:
+    only the one holding the lease catches up, runs the engine and accepts
+    changes (`leading`); the rest answer read-only commands. A new leader
+    reloads the store and runs `on_lead()` (startup writes, such as adopting
+    legacy state) before it catches up; one that loses the lease stops its
+    engine.
+
+    `service` is anything with catch_up(), start(), stop(), reload() and a
+    `store` - a single ReminderService or a GuildManager.
+    """
+
+    def __init__(self, service, outbox, services=(), clock=utc_now, on_outage=None, lease=None, on_lead=None):
+        self.service = service
+        self.outbox = outbox
+        self.services = list(services)
+        self.clock = clock
+        self.on_outage = on_outage
+        self.lease = lease
+        self.on_lead = on_lead
+        self.started = False
+        self.leading = False
+        self.down = {}  # shard ID (None without sharding) -> when it disconnected
+        self._leading_task = None
+
+    async def ready(self):
+        """Handle on_ready: start everything the first time, ignore repeats"""
+        if self.started:
+            return
+        self.started = True
+        self.outbox.start()
+        for service in self.services:
+            service.start()
+        if self.lease is None:
+            await self.lead()
+        else:
+            self.lease.start(on_elected=self.elected, on_deposed=self.deposed)
+
+    async def lead(self):
+        """Catch up and start the engine; with a lease, first reload state other instances changed"""
+        self.leading = True
+        if self.lease is not None:
+            self.service.reload()
+        if self.on_lead is not None:
+            await self.on_lead()
+        await self.service.catch_up()
+        if self.leading:
+            self.service.start()
+
+    def elected(self):
+        self._leading_task = asyncio.get_running_loop().create_task(self.lead())
+
+    def deposed(self):
+        """Another instance has the lease: stop scheduling (it catches up on anything due)"""
+        self.leading = False
+        self.service.stop()
+
+    def disconnect(self, shard_id=None):
+        """Handle a (shard) disconnect: stop posting until the gateway is back"""
+        if shard_id not in self.down:
+            self.down[shard_id] = self.clock()
+            self.outbox.pause()
+
+    async def resume(self, shard_id=None):
+        """Handle a (shard) resume: once every shard is back, catch up and flush the buffer in order"""
+        disconnected_at = self.down.pop(shard_id, None)
+        if disconnected_at is None:
+            return
+
+        now = self.clock()
+        seconds = (now - disconnected_at).total_seconds()
+        self.service.store.record_outage(disconnected_at, now)
+        if self.on_outage is not None:
+            self.on_outage(seconds)
+        shard = f"Shard {shard_id}" if shard_id is not None else "Gateway"
+        print(f"🔌 {shard} reconnected after {seconds:.1f}s ({self.outbox.depth} message(s) buffered)")
+
+        if self.down:
+            return
+        if self.leading:
+            # Queued behind whatever was buffered, so the channel still reads in order
+            await self.service.catch_up()
+        self.outbox.resume()
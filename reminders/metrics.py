@@ -0,0 +1,263 @@
+"""Minimal Prometheus metrics and a local asyncio HTTP listener that serves them."""
+import asyncio
+import bisect
+import math
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+TICK_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+LATENESS_BUCKETS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0)
+SEND_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+OUTAGE_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels) + "}"
+
+
+class Metric:
+    """One metric family; each distinct label set gets its own series."""
+
+    kind = 'untyped'
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._series = {}
+
+    def _key(self, labels):
+        return tuple((name, labels[name]) for name in self.label_names)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    """A counter incremented directly, or read from a running total's `callback()` at scrape time."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help, labels=(), callback=None):
+        super().__init__(name, help, labels)
+        self.callback = callback
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._series.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self.header()
+        if self.callback is not None:
+            lines.append(f"{self.name} {format_value(self.callback())}")
+        for key, value in self._series.items():
+            lines.append(f"{self.name}{format_labels(key)} {format_value(value)}")
+        return lines
+
+
+class Gauge(Metric):
+    """A gauge set directly, or read from `callback()` at scrape time."""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help, labels=(), callback=None):
+        super().__init__(name, help, labels)
+        self.callback = callback
+
+    def set(self, value, **labels):
+        self._series[self._key(labels)] = value
+
+    def render(self):
+        lines = self.header()
+        if self.callback is not None:
+            lines.append(f"{self.name} {format_value(self.callback())}")
+        for key, value in self._series.items():
+            lines.append(f"{self.name}{format_labels(key)} {format_value(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=LATENESS_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            # Per-bucket (non-cumulative) counts, then +Inf, sum
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, **labels):
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def render(self):
+        lines = self.header()
+        for key, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = format_labels(key + (('le', format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(key)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Named metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labels=(), callback=None):
+        return self.register(Counter(name, help, labels, callback))
+
+    def gauge(self, name, help, labels=(), callback=None):
+        return self.register(Gauge(name, help, labels, callback))
+
+    def histogram(self, name, help, labels=(), buckets=LATENESS_BUCKETS):
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class SchedulerMetrics:
+    """The bot's metrics. Gauges and counters read from live objects are bound with `watch()`."""
+
+    def __init__(self):
+        self.registry = Registry()
+        self.tick_duration = self.registry.histogram(
+            "reminders_tick_duration_seconds", "Time spent firing due jobs in one scheduler pass",
+            buckets=TICK_BUCKETS)
+        self.fire_lateness = self.registry.histogram(
+            "reminders_fire_lateness_seconds", "Actual minus scheduled send time of each alert fired",
+            labels=('event',), buckets=LATENESS_BUCKETS)
+        self.send_latency = self.registry.histogram(
+            "reminders_send_latency_seconds", "Duration of each Discord post attempt",
+            buckets=SEND_BUCKETS)
+        self.send_failures = self.registry.counter(
+            "reminders_send_failures_total", "Discord post attempts that raised an error",
+            labels=('error',))
+        self.rate_limited = self.registry.counter(
+            "reminders_http_429_total", "HTTP 429 responses from the Discord API")
+        self.outage_duration = self.registry.histogram(
+            "reminders_gateway_outage_seconds", "Duration of each gateway disconnect",
+            buckets=OUTAGE_BUCKETS)
+        self.guilds = None
+        self.custom_alerts = None
+        self.outbox_depth = None
+        self.outbox_dropped = None
+        self.dm_depth = None
+        self.dm_failed = None
+
+    def watch(self, guilds, outbox, direct_messages=None):
+        """Read guild and custom-alert counts and queue depths from live objects at scrape time"""
+        self.guilds = self.registry.gauge(
+            "reminders_guilds", "Guilds with an alert channel set up", callback=lambda: len(guilds))
+        self.custom_alerts = self.registry.gauge(
+            "reminders_custom_alerts", "Pending custom alerts across all guilds", callback=guilds.custom_alert_count)
+        self.outbox_depth = self.registry.gauge(
+            "reminders_outbox_depth", "Messages queued or being delivered", callback=lambda: outbox.depth)
+        self.outbox_dropped = self.registry.counter(
+            "reminders_outbox_dropped_total", "Messages dropped because the outage buffer was full",
+            callback=lambda: outbox.dropped)
+        if direct_messages is not None:
+            self.dm_depth = self.registry.gauge(
+                "reminders_dm_queue_depth", "Subscriber DMs waiting to be sent", callback=lambda: direct_messages.depth)
+            self.dm_failed = self.registry.counter(
+                "reminders_dm_failed_total", "Subscriber DMs that could not be delivered",
+                callback=lambda: direct_messages.failed)
+
+    def on_tick(self, seconds):
+        self.tick_duration.observe(seconds)
+
+    def on_outage(self, seconds):
+        self.outage_duration.observe(seconds)
+
+    def on_fire(self, key, scheduled, actual):
+        # One series per event, not per reminder offset or custom alert
+        event = key.partition("@")[0]
+        if event.startswith("custom:"):
+            event = "custom_alert"
+        self.fire_lateness.observe(max((actual - scheduled).total_seconds(), 0.0), event=event)
+
+    def render(self):
+        return self.registry.render()
+
+
+class MetricsServer:
+    """Serves GET /metrics over plain HTTP from the running event loop."""
+
+    def __init__(self, render, host="127.0.0.1", port=9108):
+        self.render = render
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        """Start listening (no-op if already running)"""
+        if self._server is None:
+            try:
+                self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            except OSError as e:
+                print(f"⚠️ Metrics endpoint not started on {self.host}:{self.port}: {e}")
+                return None
+            print(f"📈 Metrics on http://{self.host}:{self.port}/metrics")
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readline(), 5)
+            # Drain the headers; the request line is all we route on
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] in ("GET", "HEAD") and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+            head = (f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode()
+            writer.write(head if parts[:1] == ["HEAD"] else head + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,279 @@
+"""Outbound queues: channel posts coalesced and paced per route, and paced DM fan-out."""
+import asyncio
+from collections import deque
+
+MAX_MESSAGE_LENGTH = 2000  # Discord's limit for a single message
+COALESCE_SECONDS = 0.5  # Messages for the same channel within this window become one post
+
+# Discord's create-message route allows roughly 5 posts per 5 seconds per channel.
+ROUTE_LIMIT = 5
+ROUTE_PERIOD = 5.0
+
+MAX_CONCURRENT_SENDS = 4  # Channels being posted to at the same time
+SEND_TIMEOUT = 15.0  # Seconds before a single post attempt is abandoned
+MAX_ATTEMPTS = 4  # Including the first try
+RETRY_BACKOFF = 1.0  # Seconds before the first retry; doubles every attempt
+MAX_BUFFERED = 100  # Messages held while paused; the oldest are dropped beyond this
+
+# Direct messages to subscribers go through a fixed pool of workers sharing
+# one conservative rate (opening a DM and posting in it both count).
+DM_WORKERS = 8
+DM_RATE_LIMIT = 5
+DM_RATE_PERIOD = 1.0
+DM_MAX_QUEUED = 20000  # DMs waiting beyond this are dropped
+
+
+class RouteBucket:
+    """Sliding-window limiter: at most `limit` sends per `period` seconds."""
+
+    __slots__ = ('limit', 'period', '_sent')
+
+    def __init__(self, limit=ROUTE_LIMIT, period=ROUTE_PERIOD):
+        self.limit = limit
+        self.period = period
+        self._sent = deque()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            while self._sent and now - self._sent[0] >= self.period:
+                self._sent.popleft()
+            if len(self._sent) < self.limit:
+                self._sent.append(now)
+                return
+            await asyncio.sleep(self._sent[0] + self.period - now)
+
+
+async def send_with_retry(deliver, target, content, retryable=lambda error: True, retry_timeouts=True):
+    """
+    await deliver(target, content) with a timeout and exponential-backoff
+    retries; returns None once delivered, or the last error after giving up.
+
+    A timed-out attempt may still have been delivered, so with
+    `retry_timeouts=False` a timeout is given up on rather than risking the
+    same post twice.
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            await asyncio.wait_for(deliver(target, content), SEND_TIMEOUT)
+            return None
+        except Exception as e:
+            if attempt == MAX_ATTEMPTS or not retryable(e):
+                return e
+            if isinstance(e, asyncio.TimeoutError) and not retry_timeouts:
+                return e
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+
+def split_message(content, limit=MAX_MESSAGE_LENGTH):
+    """Cut one message into pieces under the length limit, at line breaks (or spaces) where possible"""
+    pieces = []
+    while len(content) > limit:
+        cut = content.rfind("\n", 0, limit + 1)
+        if cut <= 0:
+            cut = content.rfind(" ", 0, limit + 1)
+        if cut <= 0:
+            pieces.append(content[:limit])
+            content = content[limit:]
+        else:
+            pieces.append(content[:cut])
+            content = content[cut + 1:]  # the line break or space itself goes
+    if content:
+        pieces.append(content)
+    return pieces
+
+
+def merge_messages(contents, limit=MAX_MESSAGE_LENGTH, separator="\n\n"):
+    """
+    Join messages (with blank lines by default) into as few posts as fit
+    under the length limit. A message over the limit on its own is split
+    with split_message rather than left for Discord to reject.
+    """
+    chunks = []
+    current = ""
+    for content in (piece for content in contents for piece in split_message(content, limit)):
+        if current and len(current) + len(separator) + len(content) <= limit:
+            current += separator + content
+        else:
+            if current:
+                chunks.append(current)
+            current = content
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class Outbox:
+    """
+    Async queue drained by one collector task.
+
+    `deliver(channel_id, content)` does the actual post. Messages for the
+    same channel that arrive within COALESCE_SECONDS of each other are
+    merged, and each channel gets its own RouteBucket. Every batch is
+    delivered by its own task (at most MAX_CONCURRENT_SENDS at once), with
+    a per-post timeout and exponential-backoff retries, so a stalled post
+    never holds up other channels or the scheduler. Posts to one channel
+    stay in order. A post that times out is not retried: it may have gone
+    through, and every alert must be posted at most once.
+
+    While paused (e.g. the gateway is down) nothing is posted; up to
+    `max_buffered` messages wait in the queue and go out in order on resume.
+    """
+
+    def __init__(self, deliver, coalesce_seconds=COALESCE_SECONDS, retryable=lambda error: True,
+                 max_buffered=MAX_BUFFERED):
+        self._deliver = deliver
+        self._retryable = retryable
+        self.coalesce_seconds = coalesce_seconds
+        self.max_buffered = max_buffered
+        self.dropped = 0  # messages discarded because the buffer was full
+        self._running = asyncio.Event()
+        self._running.set()
+        self._queue = asyncio.Queue()
+        self._buckets = {}
+        self._channel_locks = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        self._tasks = set()
+        self._in_flight = 0
+        self._task = None
+
+    @property
+    def depth(self):
+        """Messages queued or currently being delivered"""
+        return self._queue.qsize() + self._in_flight
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def pause(self):
+        """Hold new posts in the queue until resume(); posts already under way finish"""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def enqueue(self, channel_id, content):
+        if self.paused and self._queue.qsize() >= self.max_buffered:
+            self._queue.get_nowait()
+            self.dropped += 1
+            print(f"⚠️ Outbound buffer full ({self.max_buffered}), dropped the oldest queued message")
+        self._queue.put_nowait((channel_id, content))
+
+    def start(self):
+        """Start the sender task on the current event loop (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def _collect(self):
+        """Wait for one message, then gather everything else arriving within the window"""
+        loop = asyncio.get_running_loop()
+        channel_id, content = await self._queue.get()
+        batch = {channel_id: [content]}
+        deadline = loop.time() + self.coalesce_seconds
+        while True:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                channel_id, content = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.setdefault(channel_id, []).append(content)
+        return batch
+
+    async def _run(self):
+        while True:
+            await self._running.wait()
+            batch = await self._collect()
+            for contents in batch.values():
+                self._in_flight += len(contents)
+            # Paused while collecting: hold this batch (ahead of the queue) until resume
+            await self._running.wait()
+            for channel_id, contents in batch.items():
+                task = asyncio.get_running_loop().create_task(self._send_batch(channel_id, contents))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, channel_id, contents):
+        lock = self._channel_locks.setdefault(channel_id, asyncio.Lock())
+        bucket = self._buckets.setdefault(channel_id, RouteBucket())
+        try:
+            async with lock, self._semaphore:
+                for chunk in merge_messages(contents):
+                    await bucket.acquire()
+                    error = await send_with_retry(self._deliver, channel_id, chunk, self._retryable,
+                                                  retry_timeouts=False)
+                    if error is not None:
+                        print(f"⚠️ Failed to send message to channel {channel_id}: {error!r}")
+        finally:
+            self._in_flight -= len(contents)
+
+
+class FanOut:
+    """
+    One message to many recipients (e.g. subscriber DMs).
+
+    A fixed pool of `workers` tasks drains one queue, all sharing a single
+    RouteBucket, so thousands of recipients cost a queue entry each rather
+    than a task each and never hold up the scheduler or channel posts.
+    Failures are retried like channel posts; `on_failure(recipient, error)`
+    hears about the ones that still fail.
+    """
+
+    def __init__(self, deliver, workers=DM_WORKERS, limit=DM_RATE_LIMIT, period=DM_RATE_PERIOD,
+                 retryable=lambda error: True, on_failure=None, max_queued=DM_MAX_QUEUED):
+        self._deliver = deliver
+        self._retryable = retryable
+        self._on_failure = on_failure
+        self.workers = workers
+        self.max_queued = max_queued
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self._bucket = RouteBucket(limit, period)
+        self._queue = asyncio.Queue()
+        self._tasks = []
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def send(self, recipients, content):
+        """Queue `content` for every recipient; returns without waiting"""
+        dropped = 0
+        for recipient in recipients:
+            if self._queue.qsize() >= self.max_queued:
+                dropped += 1
+                continue
+            self._queue.put_nowait((recipient, content))
+        if dropped:
+            self.dropped += dropped
+            print(f"⚠️ Fan-out queue full ({self.max_queued}), dropped {dropped} recipient(s)")
+
+    def start(self):
+        """Start the workers on the current event loop (no-op if already running)"""
+        self._tasks = [task for task in self._tasks if not task.done()]
+        loop = asyncio.get_running_loop()
+        while len(self._tasks) < self.workers:
+            self._tasks.append(loop.create_task(self._work()))
+        return self._tasks
+
+    async def _work(self):
+        while True:
+            recipient, content = await self._queue.get()
+            try:
+                await self._bucket.acquire()
+                error = await send_with_retry(self._deliver, recipient, content, self._retryable)
+                if error is None:
+                    self.delivered += 1
+                else:
+                    self.failed += 1
+                    if self._on_failure is not None:
+                        self._on_failure(recipient, error)
+            except Exception as e:
+                print(f"⚠️ Fan-out to {recipient} failed: {e!r}")
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,131 @@
+"""
+Offline preview of every alert the bot would post in a time window.
+
+Loads the schedule (and optionally a guild's custom alerts from the state
+database) and prints each send time and message, without Discord or a
+running bot.
+
+    python -m reminders preview
+    python -m reminders preview --from 2026-10-19 --to 2026-10-26
+    python -m reminders preview --days 3 --db reminders.db --guild 123456789
+"""
+import argparse
+import heapq
+import os
+from datetime import datetime, timedelta, timezone
+
+from reminders.alerts import AlertStore
+from reminders.events import trigger_key
+from reminders.recurrence import from_timestamp, to_timestamp
+from reminders.schedule import load_schedule
+from reminders.timeline import Timeline, custom_key, day_start, format_daily_summary
+
+
+def _trigger_sends(key, item, offset, start_ts, end_ts):
+    before = offset * 60
+    message = item.render(offset)
+    label = trigger_key(key, offset)
+    for ts in item.recurrence.between_ts(start_ts + before, end_ts + before):
+        yield (ts - before, label, message)
+
+
+def _summary_sends(events, alerts, start_ts, end_ts):
+    timeline = Timeline(events, alerts)
+    day = day_start(from_timestamp(start_ts))
+    if to_timestamp(day) < start_ts:
+        day += timedelta(days=1)
+    while to_timestamp(day) < end_ts:
+        yield (to_timestamp(day), 'daily_summary', format_daily_summary(day, timeline.day(day)))
+        day += timedelta(days=1)
+
+
+def alert_stream(events, alerts, start, end, daily_summary=True):
+    """
+    (send timestamp, trigger key, message) for every alert that would be
+    posted in [start, end), in send order: each offset of every enabled
+    event and recurring custom alert, pending one-time reminders and the
+    00:00 UTC summaries. Like occurrence_stream, a lazy merge of one
+    sequence per trigger.
+    """
+    start_ts, end_ts = to_timestamp(start), to_timestamp(end)
+    streams = [
+        _trigger_sends(event.id, event, offset, start_ts, end_ts)
+        for event in events.enabled() for offset in event.offsets
+    ]
+    streams += [
+        _trigger_sends(custom_key(alert.id), alert, offset, start_ts, end_ts)
+        for alert in alerts.recurring() for offset in alert.offsets
+    ]
+    streams.append(sorted(
+        (send_ts, trigger_key(custom_key(alert.id), offset), alert.render(offset))
+        for alert in alerts for send_ts, _, offset in alert.triggers()
+        if start_ts <= send_ts < end_ts
+    ))
+    if daily_summary:
+        streams.append(_summary_sends(events, alerts, start_ts, end_ts))
+    return heapq.merge(*streams)
+
+
+def load_custom_alerts(path, guild_id=None):
+    """A guild's custom alerts from the state database (the only configured guild if guild_id is None)"""
+    from reminders.store import Store  # sqlite3 and a writer thread pool, only when asked for
+
+    store = Store(path)
+    try:
+        if guild_id is None:
+            guild_ids = list(store.load_guilds()) or [0]
+            if len(guild_ids) > 1:
+                raise ValueError(f"{path} has several guilds; pick one with --guild "
+                                 f"({', '.join(map(str, sorted(guild_ids)))})")
+            guild_id = guild_ids[0]
+        return AlertStore(store.load_custom_alerts(guild_id))
+    finally:
+        store.close()
+
+
+def parse_time(value):
+    """ISO date or date-time, read as UTC"""
+    moment = datetime.fromisoformat(value)
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m reminders preview", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--from", dest="start", type=parse_time, default=None, help="Window start in UTC (default: now)")
+    parser.add_argument("--to", dest="end", type=parse_time, default=None, help="Window end in UTC (default: --days after the start)")
+    parser.add_argument("--days", type=float, default=7, help="Window length when --to is not given (default: 7)")
+    parser.add_argument("--schedule", default=None, help="Schedule file (default: SCHEDULE_PATH or schedule.toml)")
+    parser.add_argument("--db", default=None, help="State database to include custom alerts from")
+    parser.add_argument("--guild", type=int, default=None, help="Guild whose custom alerts to include")
+    parser.add_argument("--no-summary", action="store_true", help="Leave out the 00:00 UTC daily summaries")
+    args = parser.parse_args(argv)
+
+    start = args.start or datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    end = args.end or start + timedelta(days=args.days)
+    if end <= start:
+        parser.error("--to must be after --from")
+    if args.db and not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist")
+
+    try:
+        from reminders import config
+
+        events = load_schedule(args.schedule) if args.schedule else config.EVENTS
+        alerts = load_custom_alerts(args.db, args.guild) if args.db else AlertStore()
+    except ValueError as e:  # ScheduleError, or an ambiguous guild
+        parser.exit(1, f"❌ {e}\n")
+
+    count = 0
+    for send_ts, key, message in alert_stream(events, alerts, start, end,
+                                              daily_summary=config.ENABLE_DAILY_SUMMARY and not args.no_summary):
+        count += 1
+        print(f"{from_timestamp(send_ts).strftime('%Y-%m-%d %H:%M')} UTC  {key}")
+        for line in message.splitlines():
+            print(f"    {line}" if line else "")
+
+    print(f"\n{count} alert(s) from {start.strftime('%Y-%m-%d %H:%M')} to {end.strftime('%Y-%m-%d %H:%M')} UTC")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""Closed-form recurrence: anchor + k * period, computed with integer arithmetic."""
+from datetime import datetime, timedelta, timezone
+import math
+
+WEEK_SECONDS = 7 * 86400
+
+# 1970-01-05 was a Monday; weekly events without a reference count from here.
+EPOCH_MONDAY = datetime(1970, 1, 5, tzinfo=timezone.utc)
+
+
+def to_timestamp(moment):
+    """Whole epoch seconds for a datetime (naive datetimes are treated as UTC)"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return math.floor(moment.timestamp())
+
+
+def from_timestamp(ts):
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+
+class Recurrence:
+    """
+    Occurrences at anchor + k * period for every k >= 0.
+
+    Next/previous lookups are O(1) regardless of how far the reference
+    time is from the anchor.
+    """
+
+    __slots__ = ('anchor', 'period')
+
+    def __init__(self, anchor, period):
+        self.anchor = to_timestamp(anchor)
+        self.period = int(period.total_seconds())
+        if self.period <= 0:
+            raise ValueError("Recurrence period must be positive")
+
+    @classmethod
+    def every(cls, start, hours=0, days=0, weeks=0):
+        """Fixed interval starting at `start` (e.g. every 48 hours)"""
+        return cls(start, timedelta(hours=hours, days=days, weeks=weeks))
+
+    @classmethod
+    def weekly(cls, weekday, hour, minute, weeks=1, reference=None):
+        """
+        Every `weeks` weeks on weekday (0=Monday) at hour:minute UTC.
+
+        `reference` picks which week the cycle starts in; only its date is used.
+        """
+        base = reference.date() if reference is not None else EPOCH_MONDAY.date()
+        first_day = base + timedelta(days=(weekday - base.weekday()) % 7)
+        anchor = datetime(first_day.year, first_day.month, first_day.day, hour, minute, tzinfo=timezone.utc)
+        return cls(anchor, timedelta(weeks=weeks))
+
+    def __repr__(self):
+        return f"Recurrence(anchor={from_timestamp(self.anchor).isoformat()}, period={timedelta(seconds=self.period)})"
+
+    def describe(self):
+        """Human-readable cadence, e.g. 'Every 2 weeks from 2026-02-08 12:00 UTC'"""
+        if self.period % WEEK_SECONDS == 0:
+            weeks = self.period // WEEK_SECONDS
+            cadence = "Every week" if weeks == 1 else f"Every {weeks} weeks"
+        elif self.period % 3600 == 0:
+            cadence = f"Every {self.period // 3600} hours"
+        else:
+            cadence = f"Every {self.period // 60} minutes"
+        return f"{cadence} from {from_timestamp(self.anchor).strftime('%Y-%m-%d %H:%M')} UTC"
+
+    def next_ts(self, ts):
+        """First occurrence strictly after epoch second `ts`"""
+        if ts < self.anchor:
+            return self.anchor
+        return self.anchor + ((ts - self.anchor) // self.period + 1) * self.period
+
+    def previous_ts(self, ts):
+        """Last occurrence at or before epoch second `ts`, or None"""
+        if ts < self.anchor:
+            return None
+        return self.anchor + (ts - self.anchor) // self.period * self.period
+
+    def next_after(self, now):
+        """First occurrence strictly after `now`"""
+        return from_timestamp(self.next_ts(to_timestamp(now)))
+
+    def previous(self, now):
+        """Last occurrence at or before `now`, or None"""
+        ts = self.previous_ts(to_timestamp(now))
+        return from_timestamp(ts) if ts is not None else None
+
+    def between_ts(self, start_ts, end_ts):
+        """Epoch seconds of every occurrence in [start_ts, end_ts) as a range (O(1) to build)"""
+        return range(self.next_ts(start_ts - 1), end_ts, self.period)
+
+    def between(self, start, end):
+        """Yield every occurrence in [start, end) in time order"""
+        for ts in self.between_ts(to_timestamp(start), to_timestamp(end)):
+            yield from_timestamp(ts)
@@ -0,0 +1,190 @@
+"""Recurrence rules for custom alerts: "every N days/weeks" or five-field cron, compiled once."""
+import re
+from datetime import datetime, timedelta, timezone
+
+from reminders.recurrence import Recurrence, from_timestamp, to_timestamp
+
+SEARCH_DAYS = 4 * 366 + 1  # Every cron rule that matches at all matches within four years (Feb 29)
+
+EVERY = re.compile(r"^every\s+(?:(\d+)\s+)?(day|week)s?$", re.IGNORECASE)
+MONTH_NAMES = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+DAY_NAMES = ('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat')
+
+# (name, lowest, highest, names) per cron field
+CRON_FIELDS = (
+    ('minute', 0, 59, None),
+    ('hour', 0, 23, None),
+    ('day of month', 1, 31, None),
+    ('month', 1, 12, MONTH_NAMES),
+    ('day of week', 0, 7, DAY_NAMES),
+)
+
+
+class RuleError(ValueError):
+    """A recurrence rule could not be parsed or never matches."""
+
+
+def _first(mask, start):
+    """Lowest set bit of `mask` at position >= start, or None"""
+    rest = mask >> start
+    if not rest:
+        return None
+    return start + (rest & -rest).bit_length() - 1
+
+
+def _value(text, names, field):
+    if names is not None and text.lower()[:3] in names and not text.isdigit():
+        return names.index(text.lower()[:3]) + (1 if names is MONTH_NAMES else 0)
+    try:
+        return int(text)
+    except ValueError:
+        raise RuleError(f"{field}: {text!r} is not a number") from None
+
+
+def parse_field(text, field, lowest, highest, names=None):
+    """Bitset (bit n = value n) for one cron field such as '*/15', '1-5' or 'mon,wed'"""
+    mask = 0
+    for part in text.split(","):
+        spec, _, step = part.partition("/")
+        step = int(step) if step.isdigit() and int(step) > 0 else (None if step else 1)
+        if step is None:
+            raise RuleError(f"{field}: bad step in {part!r}")
+        if spec == "*":
+            start, end = lowest, highest
+        elif "-" in spec:
+            start, end = (_value(value, names, field) for value in spec.split("-", 1))
+        else:
+            start = _value(spec, names, field)
+            end = highest if step > 1 else start
+        if not (lowest <= start <= end <= highest):
+            raise RuleError(f"{field}: {part!r} is outside {lowest}-{highest}")
+        for value in range(start, end + 1, step):
+            mask |= 1 << value
+    return mask
+
+
+class CronRule:
+    """
+    Five-field cron (minute hour day-of-month month day-of-week, UTC), with
+    each field compiled into a bitset. The minute field must name a single
+    minute, so a rule never fires more than once an hour.
+
+    Finding the next match walks forward a day at a time only across days
+    that are ruled out (skipping whole months where the month bit is
+    clear); within a matching day the next hour and minute are single
+    lowest-set-bit operations. As in cron, when both day fields are
+    restricted a day matches if either does. Occurrences start at `start`.
+    """
+
+    __slots__ = ('text', 'start', 'minutes', 'hours', 'days', 'months', 'weekdays', 'any_day', 'any_weekday')
+
+    def __init__(self, text, start):
+        fields = text.split()
+        if len(fields) != 5:
+            raise RuleError("Cron rules need five fields: minute hour day-of-month month day-of-week")
+        masks = [parse_field(value, *spec) for value, spec in zip(fields, CRON_FIELDS)]
+        self.text = " ".join(fields)
+        self.start = to_timestamp(start)
+        self.minutes, self.hours, self.days, self.months, cron_weekdays = masks
+        # Every match is an @everyone post, so a rule may match at most once an hour
+        if self.minutes & (self.minutes - 1):
+            raise RuleError("Cron rules can fire at most once an hour; give a single minute, e.g. '0 * * * *'")
+        # cron counts Sunday as 0 (or 7); Python weekdays count from Monday.
+        # OR the bits together: '*' sets both 0 and 7, which must not carry.
+        self.weekdays = 0
+        for day in range(8):
+            if cron_weekdays >> day & 1:
+                self.weekdays |= 1 << ((day - 1) % 7)
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+        if self.next_ts(self.start - 1) is None:
+            raise RuleError(f"Cron rule {self.text!r} never matches")
+
+    def __repr__(self):
+        return f"CronRule({self.text!r}, start={from_timestamp(self.start).isoformat()})"
+
+    def describe(self):
+        return f"Cron `{self.text}` (UTC) from {from_timestamp(self.start).strftime('%Y-%m-%d %H:%M')} UTC"
+
+    def _day_matches(self, day):
+        in_month = self.days >> day.day & 1
+        in_week = self.weekdays >> day.weekday() & 1
+        if self.any_day or self.any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_ts(self, ts):
+        """First match strictly after epoch second `ts`, or None if there is none within four years"""
+        ts = max(ts, self.start - 1)
+        moment = from_timestamp(ts - ts % 60 + 60)
+        day = datetime(moment.year, moment.month, moment.day, tzinfo=timezone.utc)
+        hour, minute = moment.hour, moment.minute
+        limit = day + timedelta(days=SEARCH_DAYS)
+
+        while day < limit:
+            if not self.months >> day.month & 1:
+                day = datetime(day.year + day.month // 12, day.month % 12 + 1, 1, tzinfo=timezone.utc)
+                hour = minute = 0
+                continue
+            if self._day_matches(day):
+                found = _first(self.hours, hour)
+                if found != hour:
+                    minute = 0
+                hour = found
+                while hour is not None:
+                    found = _first(self.minutes, minute)
+                    if found is not None:
+                        return to_timestamp(day) + hour * 3600 + found * 60
+                    hour = _first(self.hours, hour + 1)
+                    minute = 0
+            day += timedelta(days=1)
+            hour = minute = 0
+        return None
+
+    def next_after(self, now):
+        ts = self.next_ts(to_timestamp(now))
+        return from_timestamp(ts) if ts is not None else None
+
+    def between_ts(self, start_ts, end_ts):
+        """Epoch seconds of every match in [start_ts, end_ts), lazily"""
+        ts = self.next_ts(start_ts - 1)
+        while ts is not None and ts < end_ts:
+            yield ts
+            ts = self.next_ts(ts)
+
+    def between(self, start, end):
+        for ts in self.between_ts(to_timestamp(start), to_timestamp(end)):
+            yield from_timestamp(ts)
+
+    def rrule(self):
+        """Equivalent RFC 5545 RRULE, or None when cron's either-day-field rule can't be expressed"""
+        if not self.any_day and not self.any_weekday:
+            return None
+        parts = ["FREQ=DAILY"]
+        for name, mask, full in (("BYMONTH", self.months, 0x1FFE), ("BYMONTHDAY", self.days, 0xFFFFFFFE),
+                                 ("BYHOUR", self.hours, 0xFFFFFF), ("BYMINUTE", self.minutes, (1 << 60) - 1)):
+            if mask != full:
+                parts.append(f"{name}={','.join(str(n) for n in range(mask.bit_length()) if mask >> n & 1)}")
+        if self.weekdays != 0x7F:
+            codes = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+            parts.append(f"BYDAY={','.join(codes[n] for n in range(7) if self.weekdays >> n & 1)}")
+        return "RRULE:" + ";".join(parts)
+
+
+def compile_rule(text, anchor):
+    """
+    Compile a custom alert's rule: "every N days", "every N weeks" (from
+    `anchor`, the first event time) or a cron expression (matches at or
+    after `anchor`). Raises RuleError.
+    """
+    text = " ".join(text.split())
+    match = EVERY.match(text)
+    if match:
+        count = int(match.group(1) or 1)
+        if not (1 <= count <= 365):
+            raise RuleError("Repeat every 1-365 days or weeks")
+        unit = match.group(2).lower()
+        return Recurrence.every(anchor, days=count if unit == "day" else 0, weeks=count if unit == "week" else 0)
+    if text.lower().startswith("every"):
+        raise RuleError("Use 'every N days' or 'every N weeks'")
+    return CronRule(text, anchor)
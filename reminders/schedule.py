@@ -0,0 +1,207 @@
+"""Event schedule loaded from a TOML or JSON file, and a watcher that reloads it on change."""
+import json
+import os
+from datetime import date, datetime
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+from reminders.events import EVENT_KINDS, Event, EventRegistry, normalize_offsets
+from reminders.recurrence import Recurrence
+
+POLL_SECONDS = 5.0  # How often the watcher checks the file's modification time
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+DEFAULT_WEEKS = {'weekly': 1, 'biweekly': 2, '4weekly': 4}
+FIELDS = {
+    'id', 'name', 'kind', 'message', 'alert_before', 'enabled',
+    'start', 'every_hours', 'weekday', 'time', 'weeks', 'reference',
+}
+
+
+class ScheduleError(ValueError):
+    """The schedule file could not be read or failed validation."""
+
+
+def parse_datetime(value, field):
+    """TOML datetimes/dates or ISO-8601 strings (from JSON) as datetimes; naive means UTC"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            raise ScheduleError(f"{field}: {value!r} is not an ISO date/time") from None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    raise ScheduleError(f"{field}: expected a date/time, got {value!r}")
+
+
+def parse_weekday(value, field):
+    if isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 6:
+        return value
+    if isinstance(value, str) and value.lower() in WEEKDAYS:
+        return WEEKDAYS.index(value.lower())
+    raise ScheduleError(f"{field}: expected a weekday name or 0-6 (0=Monday), got {value!r}")
+
+
+def parse_time(value, field):
+    try:
+        hour, minute = (int(part) for part in str(value).split(":"))
+    except ValueError:
+        raise ScheduleError(f"{field}: expected HH:MM, got {value!r}") from None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ScheduleError(f"{field}: {value!r} is not a valid time")
+    return hour, minute
+
+
+def positive_int(value, field):
+    if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+        raise ScheduleError(f"{field}: expected a positive whole number, got {value!r}")
+    return value
+
+
+def compile_event(entry, kinds_enabled, where):
+    """Validate one [[events]] entry and build its Event"""
+    if not isinstance(entry, dict):
+        raise ScheduleError(f"{where}: expected a table")
+    unknown = set(entry) - FIELDS
+    if unknown:
+        raise ScheduleError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+    for field in ('id', 'name', 'kind', 'message'):
+        if not isinstance(entry.get(field), str) or not entry[field]:
+            raise ScheduleError(f"{where}: '{field}' is required and must be text")
+
+    where = f"event {entry['id']!r}"
+    kind = entry['kind']
+    if kind not in EVENT_KINDS:
+        raise ScheduleError(f"{where}: unknown kind {kind!r} (expected one of {', '.join(EVENT_KINDS)})")
+
+    alert_before = entry.get('alert_before', 10)
+    if isinstance(alert_before, str):
+        raise ScheduleError(f"{where}: alert_before must be minutes, or a list of minutes for several reminders")
+    try:
+        alert_before = normalize_offsets(alert_before)
+    except (TypeError, ValueError) as e:
+        raise ScheduleError(f"{where}: alert_before: {e}") from None
+
+    if 'start' in entry:
+        hours = positive_int(entry.get('every_hours', 48), f"{where}: every_hours")
+        recurrence = Recurrence.every(parse_datetime(entry['start'], f"{where}: start"), hours=hours)
+    elif 'weekday' in entry:
+        if 'time' not in entry:
+            raise ScheduleError(f"{where}: weekly events need a 'time'")
+        hour, minute = parse_time(entry['time'], f"{where}: time")
+        weeks = positive_int(entry.get('weeks', DEFAULT_WEEKS.get(kind, 1)), f"{where}: weeks")
+        reference = parse_datetime(entry['reference'], f"{where}: reference") if 'reference' in entry else None
+        recurrence = Recurrence.weekly(parse_weekday(entry['weekday'], f"{where}: weekday"), hour, minute,
+                                       weeks=weeks, reference=reference)
+    else:
+        raise ScheduleError(f"{where}: needs either 'start' (interval) or 'weekday' and 'time' (weekly)")
+
+    enabled = entry.get('enabled', True)
+    if not isinstance(enabled, bool):
+        raise ScheduleError(f"{where}: enabled must be true or false")
+
+    return Event(entry['id'], entry['name'], recurrence, entry['message'],
+                 alert_before=alert_before, kind=kind, enabled=enabled and kinds_enabled.get(kind, True))
+
+
+def compile_schedule(data):
+    """Validate parsed schedule data and build an EventRegistry from it"""
+    if not isinstance(data, dict):
+        raise ScheduleError("Schedule must be a table/object at the top level")
+
+    kinds_enabled = data.get('enabled', {})
+    if not isinstance(kinds_enabled, dict):
+        raise ScheduleError("[enabled] must map event kinds to true/false")
+    for kind, value in kinds_enabled.items():
+        if kind not in EVENT_KINDS or not isinstance(value, bool):
+            raise ScheduleError(f"[enabled]: {kind} = {value!r} is not a known kind with true/false")
+
+    entries = data.get('events', [])
+    if not isinstance(entries, list):
+        raise ScheduleError("'events' must be a list of event tables")
+
+    registry = EventRegistry()
+    for index, entry in enumerate(entries):
+        event = compile_event(entry, kinds_enabled, f"events[{index}]")
+        if event.id in registry:
+            raise ScheduleError(f"Duplicate event ID {event.id!r}")
+        registry.add(event)
+    return registry
+
+
+def load_schedule(path):
+    """Read, validate and compile the schedule file (.toml or .json)"""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise ScheduleError(f"Cannot read {path}: {e.strerror}") from None
+
+    try:
+        if str(path).endswith(".json"):
+            data = json.loads(raw)
+        else:
+            data = tomllib.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ScheduleError(f"{path}: {e}") from None
+
+    try:
+        return compile_schedule(data)
+    except ScheduleError as e:
+        raise ScheduleError(f"{path}: {e}") from None
+
+
+class ScheduleWatcher:
+    """
+    Polls the schedule file's modification time and calls `on_change(registry)`
+    with the recompiled schedule whenever it changes. A file that fails to
+    load is reported and the running schedule is kept.
+    """
+
+    def __init__(self, path, on_change, interval=POLL_SECONDS):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stamp = self._read_stamp()
+        self._task = None
+
+    def _read_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def check(self):
+        """Reload if the file changed since the last check; returns True when a new schedule was applied"""
+        stamp = self._read_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            registry = load_schedule(self.path)
+        except ScheduleError as e:
+            print(f"⚠️ Schedule not reloaded, keeping the current one: {e}")
+            return False
+        self.on_change(registry)
+        return True
+
+    async def run(self):
+        import asyncio  # Only the watcher needs it; loading a schedule (e.g. for a preview) stays cheap
+
+        while True:
+            await asyncio.sleep(self.interval)
+            self.check()
+
+    def start(self):
+        """Start polling on the current event loop (no-op if already running)"""
+        import asyncio
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
@@ -0,0 +1,444 @@
+"""Alert scheduling logic: decides what is due and hands messages to a sink."""
+import asyncio
+import io
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+from reminders.alerts import AlertStore
+from reminders.clock import utc_now
+from reminders.engine import DeadlineScheduler
+from reminders.events import trigger_key
+from reminders.ics import write_ics
+from reminders.ledger import RETENTION, DeliveryLedger
+from reminders.outbound import MAX_MESSAGE_LENGTH, merge_messages
+from reminders.recurrence import from_timestamp, to_timestamp
+from reminders.subscriptions import Subscriptions
+from reminders.timeline import Timeline, custom_key, format_daily_summary, occurrences
+
+ENGINE_TICK = 'engine_tick'  # setting holding the engine's last wake-up
+MISSED_HEADER = "⏰ **MISSED WHILE OFFLINE**\n\n"
+
+
+def next_alert_time(recurrence, alert_before, now):
+    """Next send time after `now` for a recurring event alerted `alert_before` minutes early (None if it never recurs)"""
+    event_time = recurrence.next_after(now + timedelta(minutes=alert_before))
+    if event_time is None:
+        return None
+    return event_time - timedelta(minutes=alert_before)
+
+
+def load_engine_tick(store):
+    """The engine's last persisted wake-up, or None"""
+    value = store.get_setting(ENGINE_TICK)
+    return from_timestamp(float(value)) if value is not None else None
+
+
+def save_engine_tick(store, now):
+    store.set_setting(ENGINE_TICK, repr(now.timestamp()))
+
+
+class ReminderService:
+    """
+    Everything that decides when alerts go out, with no Discord dependency.
+
+    `send(message)` is an async sink (the bot's outbound queue, or a recorder
+    in simulations) and `clock()` returns the current UTC time. `direct`, if
+    given, is called as direct(user_ids, message) to DM an event's
+    subscribers when its alert fires; it must not block. `on_fire`, if
+    given, is called as on_fire(key, scheduled_time, actual_time) for every
+    alert that is sent, and `on_tick(seconds)` with the duration of every
+    engine pass.
+
+    One service holds one guild's state. Several services can share one
+    `engine` (see reminders.guilds); their jobs are keyed (guild_id, key)
+    so they never collide. Without one, the service runs its own engine.
+    """
+
+    def __init__(self, events, store, send, clock=utc_now, daily_summary=True, test_alert=False,
+                 grace_minutes=30, collapse_missed=True, on_fire=None, on_tick=None, engine=None, guild_id=0,
+                 direct=None):
+        self.guild_id = guild_id
+        self.events = events
+        self.store = store
+        self.send = send
+        self.clock = clock
+        self.daily_summary = daily_summary
+        self.test_alert = test_alert
+        self.grace_minutes = grace_minutes
+        self.collapse_missed = collapse_missed
+        self.on_fire = on_fire
+        self.direct = direct
+
+        # Every alert already sent, so none is ever sent twice
+        self.ledger = DeliveryLedger(store.load_deliveries(guild_id))
+        self.ledger_retention = max(RETENTION, timedelta(minutes=grace_minutes))
+        self.compact_ledger(clock())
+
+        self.custom_alerts = AlertStore(store.load_custom_alerts(guild_id))
+        self.subscriptions = Subscriptions(store.load_subscriptions(guild_id))
+        # Upcoming occurrences shared by /events, /next and /today;
+        # invalidated whenever events or custom alerts change.
+        self.timeline = Timeline(events, self.custom_alerts)
+        self._ics = None  # ((timeline version, UTC date, name), bytes) of the last calendar export
+        if engine is None:
+            engine = DeadlineScheduler(now=clock, on_wake=self.record_tick, on_tick=on_tick)
+            engine.last_wake = load_engine_tick(store)
+        self.engine = engine
+
+    def job(self, key):
+        """Engine key for one of this guild's jobs"""
+        return (self.guild_id, key)
+
+    # === DELIVERY LEDGER ===
+
+    async def claim(self, key, when, offset=None):
+        """
+        Append the alert for `key` sent at `when` (`offset` minutes before its
+        occurrence) to the delivery ledger, before it is sent. Returns False
+        if the ledger already has it - sent before a restart, or by another
+        instance sharing the store - in which case it must not be sent.
+        """
+        send_ts = to_timestamp(when)
+        minutes = offset or 0
+        occurrence = send_ts + minutes * 60
+        if not self.ledger.add(key, occurrence, minutes, send_ts):
+            return False
+
+        now = self.clock()
+        label = key if offset is None else trigger_key(key, offset)
+        future = self.store.claim_delivery(key, occurrence, minutes, send_ts, now, label, guild_id=self.guild_id)
+        try:
+            claimed = await asyncio.wrap_future(future)
+        except Exception:
+            claimed = True  # The write failure is already reported; this process still won't repeat it
+        self.compact_ledger(now)
+        if claimed and self.on_fire is not None:
+            self.on_fire(label, when, now)
+        return claimed
+
+    def compact_ledger(self, now):
+        """Drop ledger entries too old to ever be sent again, here and in the store"""
+        before = to_timestamp(now - self.ledger_retention)
+        if self.ledger.compact(before):
+            self.store.prune_deliveries(before, guild_id=self.guild_id)
+
+    def record_tick(self, now):
+        """Persist the engine's last wake-up so catch-up knows where it left off"""
+        save_engine_tick(self.store, now)
+
+    def is_stale(self, when, now):
+        """True when a send time is too far in the past to still be worth sending"""
+        return now - when > timedelta(minutes=self.grace_minutes)
+
+    def todays_events(self, now):
+        """All events on now's UTC day as (datetime, name, finished), in time order"""
+        return self.timeline.day(now)
+
+    def occurrences(self, start, end):
+        """Lazily yield (datetime, key, name) for every event and custom alert in [start, end)"""
+        return occurrences(self.events, start, end, self.custom_alerts)
+
+    def export_ics(self, now=None, calendar_name="Events"):
+        """
+        The schedule and pending custom alerts as .ics bytes. Cached until the
+        events or custom alerts change (or the UTC day rolls over, which moves
+        the expansion horizon), so repeated exports cost nothing.
+        """
+        now = now or self.clock()
+        key = (self.timeline.version, now.date(), calendar_name)
+        if self._ics is not None and self._ics[0] == key:
+            return self._ics[1]
+
+        buffer = io.BytesIO()
+        write_ics(buffer, self.events, self.custom_alerts, now, calendar_name=calendar_name,
+                  domain=f"{self.guild_id}.reminders")
+        data = buffer.getvalue()
+        self._ics = (key, data)
+        return data
+
+    # === ARMING ===
+
+    def arm_trigger(self, key, recurrence, offset, now, deliver):
+        """
+        Arm the engine for the next send time of one (recurring item, offset)
+        trigger; `deliver()` posts it. Each offset is its own job, so an
+        event with several reminders puts one entry per reminder in the heap.
+        """
+        trigger = trigger_key(key, offset)
+
+        async def fire(when):
+            # Re-arm before awaiting the claim, so a removal or reload meanwhile disarms the next send
+            self.arm_trigger(key, recurrence, offset, when, deliver)
+            if not self.is_stale(when, self.clock()) and await self.claim(key, when, offset):
+                await deliver()
+
+        send_time = next_alert_time(recurrence, offset, now)
+        if send_time is None:
+            self.engine.cancel(self.job(trigger))
+            return
+        self.engine.schedule(self.job(trigger), send_time, fire)
+
+    def arm_event(self, event, now):
+        """Arm the engine for the next alert of a recurring event, one trigger per offset"""
+        for offset in event.offsets:
+            self.arm_trigger(event.id, event.recurrence, offset, now, partial(self.deliver_event, event, offset))
+
+    async def deliver_event(self, event, offset):
+        await self.send(event.render(offset))
+        self.notify_subscribers(event, offset)
+
+    def disarm_event(self, event):
+        for offset in event.offsets:
+            self.engine.cancel(self.job(trigger_key(event.id, offset)))
+
+    def arm_daily_summary(self, now):
+        """Arm the engine for the next 00:00 UTC summary"""
+        async def fire(when):
+            self.arm_daily_summary(when)
+            if not self.is_stale(when, self.clock()) and await self.claim('daily_summary', when):
+                await self.send(format_daily_summary(when, self.todays_events(when)))
+
+        midnight = datetime(now.year, now.month, now.day, tzinfo=timezone.utc) + timedelta(days=1)
+        self.engine.schedule(self.job('daily_summary'), midnight, fire)
+
+    def arm_test_alert(self, now):
+        """Arm the engine for the next 5-minute test alert, or disarm it"""
+        if not self.test_alert:
+            self.engine.cancel(self.job('test_alert'))
+            return
+
+        async def fire(when):
+            self.arm_test_alert(when)
+            if not self.is_stale(when, self.clock()) and await self.claim('test_alert', when):
+                await self.send("🧪 **TEST ALERT** - Bot is running! Current time: " + when.strftime("%H:%M UTC"))
+
+        next_time = now.replace(second=0, microsecond=0) + timedelta(minutes=5 - now.minute % 5)
+        self.engine.schedule(self.job('test_alert'), next_time, fire)
+
+    def set_test_alert(self, enabled):
+        self.test_alert = enabled
+        self.arm_test_alert(self.clock())
+
+    def arm_custom_alerts(self):
+        """Arm the engine for the earliest pending custom alert"""
+        send_time = self.custom_alerts.next_send_time()
+        if send_time is None:
+            self.engine.cancel(self.job('custom_alerts'))
+            return
+
+        self.engine.schedule(self.job('custom_alerts'), send_time, self.fire_custom_alerts)
+
+    def arm_recurring_alert(self, alert, now):
+        """Arm the engine for the next alert of a recurring custom alert, one trigger per offset"""
+        key = custom_key(alert.id)
+        for offset in alert.offsets:
+            self.arm_trigger(key, alert.recurrence, offset, now, partial(self.send, alert.render(offset)))
+
+    def disarm_recurring_alert(self, alert):
+        for offset in alert.offsets:
+            self.engine.cancel(self.job(trigger_key(custom_key(alert.id), offset)))
+
+    async def pop_due_custom_alerts(self, now):
+        """
+        Take every one-time reminder whose send time has passed (alerts go
+        with their last reminder) and claim it in the ledger. Returns
+        (send_time, message) for the ones still worth sending that hadn't
+        been sent.
+        """
+        due = self.custom_alerts.pop_due(now)
+
+        finished = False
+        ready = []
+        for alert, offset in due:
+            send_time = alert.event_time - timedelta(minutes=offset)
+            if not self.is_stale(send_time, now) and await self.claim(custom_key(alert.id), send_time, offset):
+                ready.append((send_time, alert.render(offset)))
+            if offset == alert.offsets[-1]:
+                self.store.remove_custom_alert(alert.id, guild_id=self.guild_id)
+                finished = True
+        if finished:
+            self.timeline.invalidate()
+
+        return ready
+
+    async def fire_custom_alerts(self, when):
+        """Send every one-time reminder whose send time has passed"""
+        for _, message in await self.pop_due_custom_alerts(self.clock()):
+            await self.send(message)
+
+        self.arm_custom_alerts()
+
+    def arm_all(self, now):
+        """Arm every enabled job; safe to call again since each key is simply re-armed"""
+        if self.daily_summary:
+            self.arm_daily_summary(now)
+
+        self.arm_test_alert(now)
+        self.arm_custom_alerts()
+        for alert in self.custom_alerts.recurring():
+            self.arm_recurring_alert(alert, now)
+
+        for event in self.events.enabled():
+            self.arm_event(event, now)
+
+    def disarm_all(self):
+        """Drop every job this service has armed (e.g. when its guild goes away)"""
+        for key in ('daily_summary', 'test_alert', 'custom_alerts'):
+            self.engine.cancel(self.job(key))
+        for event in self.events:
+            self.disarm_event(event)
+        for alert in self.custom_alerts.recurring():
+            self.disarm_recurring_alert(alert)
+
+    def start(self):
+        """Catch-up must run first; this arms everything and starts the engine"""
+        self.arm_all(self.clock())
+        return self.engine.start()
+
+    def stop(self):
+        self.engine.stop()
+
+    def reload(self):
+        """
+        Re-read custom alerts, subscriptions, the delivery ledger and the last
+        engine tick from the store, which another instance may have changed
+        while this one stood by.
+        """
+        self.disarm_all()
+        self.custom_alerts = AlertStore(self.store.load_custom_alerts(self.guild_id))
+        self.subscriptions = Subscriptions(self.store.load_subscriptions(self.guild_id))
+        self.ledger = DeliveryLedger(self.store.load_deliveries(self.guild_id))
+        self.engine.last_wake = load_engine_tick(self.store)
+        self.timeline.alerts = self.custom_alerts
+        self.timeline.invalidate()
+
+    def replace_events(self, events):
+        """
+        Swap in a new event registry. Custom alerts and the delivery ledger
+        are kept, removed events are disarmed and every remaining event is
+        re-armed from its new recurrence.
+        """
+        now = self.clock()
+        old = self.events
+        self.events = events
+        self.timeline.events = events
+        self.timeline.invalidate()
+
+        # Offsets may have changed too, so every old trigger goes
+        for event in old.enabled():
+            self.disarm_event(event)
+        for event in events.enabled():
+            self.arm_event(event, now)
+
+    # === SUBSCRIPTIONS ===
+
+    def subscribe(self, event_id, user_id):
+        """DM this user whenever the event's alert fires; returns False if already subscribed"""
+        if not self.subscriptions.add(event_id, user_id):
+            return False
+        self.store.add_subscription(event_id, user_id, guild_id=self.guild_id)
+        return True
+
+    def unsubscribe(self, event_id, user_id):
+        if not self.subscriptions.remove(event_id, user_id):
+            return False
+        self.store.remove_subscription(event_id, user_id, guild_id=self.guild_id)
+        return True
+
+    def notify_subscribers(self, event, offset=None):
+        """Hand the event's subscribers to the DM fan-out"""
+        users = self.subscriptions.for_event(event.id)
+        if users and self.direct is not None:
+            self.direct(users, event.render(offset).replace("@everyone", "").strip())
+
+    # === CUSTOM ALERTS ===
+
+    def add_custom_alert(self, event_time, name, message, alert_before, rule=None):
+        """Add a one-time alert, or a recurring one when `rule` is given (see reminders.rules)"""
+        alert = self.custom_alerts.create(event_time, name, message, alert_before, rule)
+        self.store.add_custom_alert(alert, guild_id=self.guild_id)
+        self.timeline.invalidate()
+        if alert.recurrence is not None:
+            self.arm_recurring_alert(alert, self.clock())
+        else:
+            self.arm_custom_alerts()
+        return alert
+
+    def add_custom_alerts(self, entries):
+        """
+        Add many validated (event_time, name, message, alert_before) alerts at
+        once: one index merge, one store transaction and one re-arm.
+        """
+        alerts = self.custom_alerts.create_many(entries)
+        if alerts:
+            self.store.add_custom_alerts(alerts, guild_id=self.guild_id)
+            self.timeline.invalidate()
+            self.arm_custom_alerts()
+        return alerts
+
+    def remove_custom_alert(self, alert_id):
+        """Remove and return the custom alert with this ID, or None"""
+        alert = self.custom_alerts.remove(alert_id)
+        if alert is None:
+            return None
+        self.store.remove_custom_alert(alert_id, guild_id=self.guild_id)
+        self.timeline.invalidate()
+        if alert.recurrence is not None:
+            self.disarm_recurring_alert(alert)
+        else:
+            self.arm_custom_alerts()
+        return alert
+
+    # === MISSED-FIRE CATCH-UP ===
+
+    async def collect_missed(self, now):
+        """
+        Alerts whose send time fell inside the grace window (and after the last
+        persisted engine tick) but were never sent. Claims them in the ledger and
+        evicts overdue custom alerts, so calling this twice never returns an
+        alert twice.
+        """
+        since = now - timedelta(minutes=self.grace_minutes)
+        if self.engine.last_wake is not None:
+            since = max(since, self.engine.last_wake)
+
+        missed = []  # (send_time, message)
+        recurring = [(event.id, event, True) for event in self.events.enabled()]
+        recurring += [(custom_key(alert.id), alert, False) for alert in self.custom_alerts.recurring()]
+
+        for key, item, is_event in recurring:
+            for offset in item.offsets:
+                alert_before = timedelta(minutes=offset)
+                for event_time in item.recurrence.between(since + alert_before, now + alert_before + timedelta(seconds=1)):
+                    send_time = event_time - alert_before
+                    if await self.claim(key, send_time, offset):
+                        missed.append((send_time, item.render(offset)))
+                        if is_event:
+                            # Late, but subscribers get the DM like any other alert
+                            self.notify_subscribers(item, offset)
+
+        missed.extend(await self.pop_due_custom_alerts(now))
+
+        missed.sort(key=lambda x: x[0])
+        return missed
+
+    async def catch_up(self, now=None, prune=True):
+        """Send alerts missed while the bot was offline or the loop was stalled"""
+        now = now or self.clock()
+        missed = await self.collect_missed(now)
+        if prune:
+            self.store.prune_history(now - timedelta(days=30))
+
+        if not missed:
+            return
+
+        print(f"⏰ Catching up on {len(missed)} missed alert(s)" + (f" in guild {self.guild_id}" if self.guild_id else ""))
+
+        if self.collapse_missed and len(missed) > 1:
+            # Each alert was claimed before this point, so a post over Discord's limit would lose them all
+            lines = [f"• **{send_time.strftime('%H:%M UTC')}** - {alert_message}" for send_time, alert_message in missed]
+            for chunk in merge_messages(lines, MAX_MESSAGE_LENGTH - len(MISSED_HEADER), separator="\n"):
+                await self.send(MISSED_HEADER + chunk)
+        else:
+            for _, alert_message in missed:
+                await self.send(alert_message)
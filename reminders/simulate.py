@@ -0,0 +1,162 @@
+"""
+Deterministic simulation of the alert scheduler on a virtual clock.
+
+Drives the real ReminderService through weeks or months of simulated time
+in a fraction of a second, with a recording sink instead of Discord, and
+reports every alert fired, its lateness, and any duplicates or misses.
+
+    python -m reminders.simulate --days 120
+    python -m reminders.simulate --start 2026-03-01 --days 30 --latency 45
+"""
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from reminders.clock import VirtualClock
+from reminders.events import trigger_key
+from reminders.service import ReminderService
+from reminders.store import Store
+
+
+class Simulation:
+    """
+    A ReminderService wired to a VirtualClock, an in-memory store and a
+    recording sink. `wake_latency` delays every engine wake-up to model a
+    slow or stalled event loop.
+    """
+
+    def __init__(self, events, start, wake_latency=timedelta(0), daily_summary=True, test_alert=False,
+                 grace_minutes=30):
+        self.events = events
+        self.start = start
+        self.wake_latency = wake_latency
+        self.clock = VirtualClock(start)
+        self.sent = []  # (time, message)
+        self.fired = []  # (key, scheduled, actual)
+        self.custom_triggers = []  # (trigger key, send time) of every one-time reminder
+        self.store = Store(":memory:")
+        self.service = ReminderService(
+            events, self.store, self._sink, clock=self.clock,
+            daily_summary=daily_summary, test_alert=test_alert,
+            grace_minutes=grace_minutes, on_fire=self._record,
+        )
+
+    async def _sink(self, message):
+        self.sent.append((self.clock(), message))
+
+    def _record(self, key, scheduled, actual):
+        self.fired.append((key, scheduled, actual))
+
+    def add_custom_alert(self, event_time, name, message, alert_before=10):
+        alert = self.service.add_custom_alert(event_time, name, message, alert_before)
+        self.custom_triggers.extend(
+            (trigger_key(f"custom:{alert.id}", offset), alert.event_time - timedelta(minutes=offset))
+            for offset in alert.offsets
+        )
+        return alert
+
+    async def run_until(self, end):
+        """Fire everything due up to `end`, jumping the clock from deadline to deadline"""
+        engine = self.service.engine
+        self.service.arm_all(self.clock())
+        while True:
+            deadline = engine.next_deadline()
+            if deadline is None or deadline > end:
+                break
+            self.clock.set(max(self.clock(), deadline + self.wake_latency))
+            await engine.fire_due()
+        if end > self.clock():
+            self.clock.set(end)
+
+    def expected(self, end):
+        """Every (key, send_time) that should fire in (start, end]"""
+        service = self.service
+        one_second = timedelta(seconds=1)
+        expected = []
+        for event in self.events.enabled():
+            for offset in event.offsets:
+                alert_before = timedelta(minutes=offset)
+                for event_time in event.recurrence.between(self.start + alert_before + one_second, end + alert_before + one_second):
+                    expected.append((trigger_key(event.id, offset), event_time - alert_before))
+        if service.daily_summary:
+            day = datetime(self.start.year, self.start.month, self.start.day, tzinfo=timezone.utc) + timedelta(days=1)
+            while day <= end:
+                expected.append(('daily_summary', day))
+                day += timedelta(days=1)
+        if service.test_alert:
+            tick = self.start.replace(second=0, microsecond=0) + timedelta(minutes=5 - self.start.minute % 5)
+            while tick <= end:
+                expected.append(('test_alert', tick))
+                tick += timedelta(minutes=5)
+        expected.extend((key, send_time) for key, send_time in self.custom_triggers if self.start < send_time <= end)
+        return expected
+
+    def report(self, end):
+        """Summary dict: fires, duplicates, misses and lateness in seconds"""
+        counts = Counter((key, scheduled) for key, scheduled, _ in self.fired)
+        duplicates = sorted(item for item, count in counts.items() if count > 1)
+        misses = sorted(set(self.expected(end)) - set(counts))
+        lateness = [(actual - scheduled).total_seconds() for _, scheduled, actual in self.fired]
+        return {
+            'fires': list(self.fired),
+            'duplicates': duplicates,
+            'misses': misses,
+            'max_lateness': max(lateness, default=0.0),
+            'mean_lateness': sum(lateness) / len(lateness) if lateness else 0.0,
+        }
+
+    async def run(self, end):
+        await self.run_until(end)
+        report = self.report(end)
+        self.store.close()
+        return report
+
+
+def parse_date(value):
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m reminders.simulate", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--start", type=parse_date, default=None, help="Start date/time in UTC (default: now)")
+    parser.add_argument("--days", type=float, default=90, help="Simulated days to run (default: 90)")
+    parser.add_argument("--latency", type=float, default=0, help="Seconds each engine wake-up is delayed by")
+    parser.add_argument("--grace", type=int, default=None, help="Catch-up grace window in minutes")
+    parser.add_argument("--test-alert", action="store_true", help="Also simulate the 5-minute test alert")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    args = parser.parse_args(argv)
+
+    from reminders import config
+
+    start = args.start or datetime.now(timezone.utc).replace(microsecond=0)
+    end = start + timedelta(days=args.days)
+    simulation = Simulation(
+        config.EVENTS, start,
+        wake_latency=timedelta(seconds=args.latency),
+        daily_summary=config.ENABLE_DAILY_SUMMARY,
+        test_alert=args.test_alert,
+        grace_minutes=args.grace if args.grace is not None else config.CATCH_UP_GRACE_MINUTES,
+    )
+    report = asyncio.run(simulation.run(end))
+
+    if not args.quiet:
+        for key, scheduled, actual in report['fires']:
+            late = (actual - scheduled).total_seconds()
+            print(f"{scheduled.strftime('%Y-%m-%d %H:%M:%S')} UTC  {key:<20} late {late:.1f}s")
+        print()
+
+    print(f"Simulated {start.isoformat()} -> {end.isoformat()}")
+    print(f"  Alerts fired:  {len(report['fires'])}")
+    print(f"  Lateness:      max {report['max_lateness']:.1f}s, mean {report['mean_lateness']:.1f}s")
+    print(f"  Duplicates:    {len(report['duplicates'])}")
+    for key, scheduled in report['duplicates']:
+        print(f"    - {key} at {scheduled.isoformat()}")
+    print(f"  Misses:        {len(report['misses'])}")
+    for key, scheduled in report['misses']:
+        print(f"    - {key} at {scheduled.isoformat()}")
+    return 1 if report['duplicates'] or report['misses'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
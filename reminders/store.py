@@ -0,0 +1,334 @@
+"""SQLite (WAL) persistence for guilds, custom alerts, subscriptions, fire history, the delivery ledger, outages, settings and leases."""
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from reminders.alerts import CustomAlert
+from reminders.recurrence import from_timestamp
+
+# Per-guild rows carry a guild_id; 0 is the "default" guild that single-server
+# installs use until their channel's guild adopts it.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guilds (
+    guild_id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    schedule TEXT
+);
+CREATE TABLE IF NOT EXISTS custom_alerts (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    id INTEGER NOT NULL,
+    event_time REAL NOT NULL,
+    name TEXT NOT NULL,
+    message TEXT NOT NULL,
+    alert_before INTEGER NOT NULL,
+    rule TEXT,
+    offsets TEXT,
+    PRIMARY KEY (guild_id, id)
+);
+CREATE TABLE IF NOT EXISTS deliveries (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    key TEXT NOT NULL,
+    occurrence INTEGER NOT NULL,
+    offset_minutes INTEGER NOT NULL,
+    send_time INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, key, occurrence, offset_minutes)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS deliveries_send_time ON deliveries (guild_id, send_time);
+CREATE TABLE IF NOT EXISTS subscriptions (
+    guild_id INTEGER NOT NULL,
+    event_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, event_id, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS subscriptions_user ON subscriptions (guild_id, user_id);
+CREATE TABLE IF NOT EXISTS fire_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    key TEXT NOT NULL,
+    scheduled_at REAL NOT NULL,
+    fired_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fire_history_fired_at ON fire_history (fired_at);
+CREATE TABLE IF NOT EXISTS outages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# Tables whose rows belong to one guild
+GUILD_TABLES = ('custom_alerts', 'deliveries', 'subscriptions', 'fire_history')
+
+
+class Store:
+    """
+    Local state that survives worker restarts.
+
+    The connection is opened on first use. Reads happen once at startup;
+    every write is queued on a single background thread (so writes keep
+    their order and never block the event loop) and committed there.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store")
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # === READS (startup) ===
+
+    def load_guilds(self):
+        """Mapping of guild ID -> (alert channel ID, schedule name or None)"""
+        rows = self.conn.execute("SELECT guild_id, channel_id, schedule FROM guilds")
+        return {guild_id: (channel_id, schedule) for guild_id, channel_id, schedule in rows}
+
+    def load_custom_alerts(self, guild_id=0):
+        """A guild's pending custom alerts as CustomAlert records"""
+        rows = self.conn.execute(
+            "SELECT id, event_time, name, message, alert_before, rule, offsets FROM custom_alerts WHERE guild_id = ?",
+            (guild_id,),
+        )
+        return [
+            CustomAlert(alert_id, from_timestamp(ts), name, message, offsets or alert_before, rule)
+            for alert_id, ts, name, message, alert_before, rule, offsets in rows
+        ]
+
+    def load_deliveries(self, guild_id=0):
+        """A guild's delivery ledger as (key, occurrence, offset, send time) rows of epoch seconds"""
+        return self.conn.execute(
+            "SELECT key, occurrence, offset_minutes, send_time FROM deliveries WHERE guild_id = ?", (guild_id,),
+        ).fetchall()
+
+    def load_subscriptions(self, guild_id=0):
+        """A guild's (event ID, user ID) subscription pairs"""
+        return self.conn.execute("SELECT event_id, user_id FROM subscriptions WHERE guild_id = ?", (guild_id,)).fetchall()
+
+    def get_setting(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    # === WRITES (background) ===
+
+    def submit(self, fn, *args):
+        """Run fn(conn, *args) on the writer thread and commit; returns a concurrent Future"""
+        future = self._executor.submit(self._write, fn, args)
+        future.add_done_callback(_report_failure)
+        return future
+
+    def _write(self, fn, args):
+        conn = self.conn
+        with conn:
+            return fn(conn, *args)
+
+    def set_guild(self, guild_id, channel_id, schedule=None):
+        return self.submit(_set_guild, guild_id, channel_id, schedule)
+
+    def remove_guild(self, guild_id):
+        """Forget a guild and everything stored for it"""
+        return self.submit(_remove_guild, guild_id)
+
+    def adopt_default_guild(self, guild_id):
+        """Move state stored under the default guild (0) to a real guild ID"""
+        return self.submit(_adopt_default_guild, guild_id)
+
+    def add_custom_alert(self, alert, guild_id=0):
+        return self.submit(
+            _insert_custom_alert, guild_id, alert.id, alert.event_time.timestamp(), alert.name, alert.message,
+            alert.alert_before, alert.rule, _offsets(alert),
+        )
+
+    def add_custom_alerts(self, alerts, guild_id=0):
+        """Insert many custom alerts in a single transaction"""
+        rows = [
+            (guild_id, alert.id, alert.event_time.timestamp(), alert.name, alert.message, alert.alert_before, alert.rule,
+             _offsets(alert))
+            for alert in alerts
+        ]
+        return self.submit(_insert_custom_alerts, rows)
+
+    def remove_custom_alert(self, alert_id, guild_id=0):
+        return self.submit(_delete_custom_alert, guild_id, alert_id)
+
+    def add_subscription(self, event_id, user_id, guild_id=0):
+        return self.submit(_add_subscription, guild_id, event_id, user_id)
+
+    def remove_subscription(self, event_id, user_id, guild_id=0):
+        return self.submit(_remove_subscription, guild_id, event_id, user_id)
+
+    def claim_delivery(self, key, occurrence, offset, send_time, fired_at, history_key, guild_id=0):
+        """
+        Append a delivery to the ledger, and to the fire history under
+        `history_key`, unless the ledger already has it - possibly written by
+        another process sharing this file. The future's result is True when
+        this call added it.
+        """
+        return self.submit(
+            _claim_delivery, guild_id, key, occurrence, offset, send_time, fired_at.timestamp(), history_key,
+        )
+
+    def prune_deliveries(self, before, guild_id=0):
+        """Compact the ledger: drop deliveries sent before epoch second `before`"""
+        return self.submit(_prune_deliveries, guild_id, before)
+
+    def record_outage(self, started_at, ended_at):
+        """Persist one gateway outage"""
+        return self.submit(_record_outage, started_at.timestamp(), ended_at.timestamp())
+
+    def prune_history(self, before):
+        """Drop fire history and outages older than `before` so the file stays bounded"""
+        return self.submit(_prune_history, before.timestamp())
+
+    def set_setting(self, key, value):
+        return self.submit(_set_setting, key, value)
+
+    def acquire_lease(self, name, holder, now, expires_at):
+        """
+        Take or renew the lease `name` until epoch second `expires_at`. Only
+        succeeds if `holder` already has it or it expired before `now`; the
+        future's result says whether it did.
+        """
+        return self.submit(_acquire_lease, name, holder, now, expires_at)
+
+    def release_lease(self, name, holder):
+        """Give the lease up early (if `holder` still has it) so a standby needn't wait for it to expire"""
+        return self.submit(_release_lease, name, holder)
+
+    def close(self):
+        """Flush pending writes and close the connection"""
+        self._executor.shutdown(wait=True)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _report_failure(future):
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        print(f"⚠️ State store write failed: {error!r}")
+
+
+def _set_guild(conn, guild_id, channel_id, schedule):
+    conn.execute(
+        "INSERT INTO guilds (guild_id, channel_id, schedule) VALUES (?, ?, ?) "
+        "ON CONFLICT(guild_id) DO UPDATE SET channel_id = excluded.channel_id, schedule = excluded.schedule",
+        (guild_id, channel_id, schedule),
+    )
+
+
+def _remove_guild(conn, guild_id):
+    conn.execute("DELETE FROM guilds WHERE guild_id = ?", (guild_id,))
+    for table in GUILD_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE guild_id = ?", (guild_id,))
+
+
+def _adopt_default_guild(conn, guild_id):
+    for table in GUILD_TABLES:
+        conn.execute(f"UPDATE OR IGNORE {table} SET guild_id = ? WHERE guild_id = 0", (guild_id,))
+        conn.execute(f"DELETE FROM {table} WHERE guild_id = 0")
+
+
+def _offsets(alert):
+    """Stored offsets column: NULL for a single reminder (alert_before says it all)"""
+    return ",".join(map(str, alert.offsets)) if len(alert.offsets) > 1 else None
+
+
+def _insert_custom_alert(conn, guild_id, alert_id, ts, name, message, alert_before, rule, offsets):
+    conn.execute(
+        "INSERT INTO custom_alerts (guild_id, id, event_time, name, message, alert_before, rule, offsets) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (guild_id, alert_id, ts, name, message, alert_before, rule, offsets),
+    )
+
+
+def _insert_custom_alerts(conn, rows):
+    conn.executemany(
+        "INSERT INTO custom_alerts (guild_id, id, event_time, name, message, alert_before, rule, offsets) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def _delete_custom_alert(conn, guild_id, alert_id):
+    conn.execute("DELETE FROM custom_alerts WHERE guild_id = ? AND id = ?", (guild_id, alert_id))
+
+
+def _add_subscription(conn, guild_id, event_id, user_id):
+    conn.execute(
+        "INSERT OR IGNORE INTO subscriptions (guild_id, event_id, user_id) VALUES (?, ?, ?)",
+        (guild_id, event_id, user_id),
+    )
+
+
+def _remove_subscription(conn, guild_id, event_id, user_id):
+    conn.execute(
+        "DELETE FROM subscriptions WHERE guild_id = ? AND event_id = ? AND user_id = ?",
+        (guild_id, event_id, user_id),
+    )
+
+
+def _prune_history(conn, before):
+    conn.execute("DELETE FROM fire_history WHERE fired_at < ?", (before,))
+    conn.execute("DELETE FROM outages WHERE ended_at < ?", (before,))
+
+
+def _record_outage(conn, started_at, ended_at):
+    conn.execute("INSERT INTO outages (started_at, ended_at) VALUES (?, ?)", (started_at, ended_at))
+
+
+def _claim_delivery(conn, guild_id, key, occurrence, offset, send_time, fired_at, history_key):
+    cursor = conn.execute(
+        "INSERT OR IGNORE INTO deliveries (guild_id, key, occurrence, offset_minutes, send_time) VALUES (?, ?, ?, ?, ?)",
+        (guild_id, key, occurrence, offset, send_time),
+    )
+    if not cursor.rowcount:
+        return False
+    conn.execute(
+        "INSERT INTO fire_history (guild_id, key, scheduled_at, fired_at) VALUES (?, ?, ?, ?)",
+        (guild_id, history_key, send_time, fired_at),
+    )
+    return True
+
+
+def _prune_deliveries(conn, guild_id, before):
+    conn.execute("DELETE FROM deliveries WHERE guild_id = ? AND send_time < ?", (guild_id, before))
+
+
+def _set_setting(conn, key, value):
+    conn.execute(
+        "INSERT INTO settings (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def _acquire_lease(conn, name, holder, now, expires_at):
+    cursor = conn.execute(
+        "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+        "WHERE leases.holder = excluded.holder OR leases.expires_at <= ?",
+        (name, holder, expires_at, now),
+    )
+    return cursor.rowcount == 1
+
+
+def _release_lease(conn, name, holder):
+    conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
@@ -0,0 +1,45 @@
+"""Per-guild index of which members want a DM for which event."""
+
+
+class Subscriptions:
+    """
+    event ID -> set of user IDs for one guild.
+
+    Fire time only needs the subscribers of one event, which is a single
+    dict lookup; per-user listings scan the (few) events instead.
+    """
+
+    __slots__ = ('_by_event',)
+
+    def __init__(self, rows=()):
+        self._by_event = {}
+        for event_id, user_id in rows:
+            self.add(event_id, user_id)
+
+    def __len__(self):
+        return sum(len(users) for users in self._by_event.values())
+
+    def add(self, event_id, user_id):
+        """Subscribe; returns False if the user already was"""
+        users = self._by_event.setdefault(event_id, set())
+        if user_id in users:
+            return False
+        users.add(user_id)
+        return True
+
+    def remove(self, event_id, user_id):
+        """Unsubscribe; returns False if the user wasn't subscribed"""
+        users = self._by_event.get(event_id)
+        if not users or user_id not in users:
+            return False
+        users.discard(user_id)
+        if not users:
+            del self._by_event[event_id]
+        return True
+
+    def for_event(self, event_id):
+        return self._by_event.get(event_id, frozenset())
+
+    def for_user(self, user_id):
+        """Event IDs the user is subscribed to, sorted"""
+        return sorted(event_id for event_id, users in self._by_event.items() if user_id in users)
@@ -0,0 +1,177 @@
+"""Occurrence range queries, and the materialized timeline shared by /events, /next and /today."""
+import heapq
+from datetime import datetime, timedelta, timezone
+
+from sortedcontainers import SortedList
+
+from reminders.recurrence import from_timestamp, to_timestamp
+
+DEFAULT_HORIZON = timedelta(days=30)
+
+
+def custom_key(alert_id):
+    return f"custom:{alert_id}"
+
+
+def day_start(now):
+    return datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
+
+
+def format_daily_summary(day, today_events):
+    """Text of the 00:00 UTC summary for `day`"""
+    header = f"📅 **TODAY'S EVENTS** - {day.strftime('%A, %B %d, %Y')}\n\n"
+    if not today_events:
+        return header + "No events scheduled for today. Enjoy your day! ☀️"
+
+    message = header
+    for event_time, event_name, _ in today_events:
+        message += f"• **{event_time.strftime('%H:%M UTC')}** - {event_name}\n"
+    message += f"\n{len(today_events)} event(s) scheduled today! 🎯"
+    return message
+
+
+def _event_occurrences(event, start_ts, end_ts):
+    for ts in event.recurrence.between_ts(start_ts, end_ts):
+        yield (ts, event.id, event.name)
+
+
+def _alert_occurrences(alert, start_ts, end_ts):
+    key = custom_key(alert.id)
+    name = f"🔁 {alert.name}"
+    for ts in alert.recurrence.between_ts(start_ts, end_ts):
+        yield (ts, key, name)
+
+
+def recurring_alert_stream(alerts, start_ts, end_ts):
+    """(timestamp, key, name) for every recurring custom alert in [start_ts, end_ts), in time order"""
+    return heapq.merge(*(_alert_occurrences(alert, start_ts, end_ts) for alert in alerts.recurring()))
+
+
+def occurrence_stream(events, start_ts, end_ts, alerts=None):
+    """
+    (timestamp, key, name) for every enabled event (and custom alert,
+    one-time or recurring) in [start_ts, end_ts), in time order.
+
+    A lazy k-way merge of one arithmetic sequence per event, so the cost is
+    proportional to what is consumed, however wide the window.
+    """
+    streams = [_event_occurrences(event, start_ts, end_ts) for event in events.enabled()]
+    if alerts is not None:
+        # Indexed by send time, which is at most a day before the event time
+        candidates = alerts.send_between(from_timestamp(start_ts - 86400), from_timestamp(end_ts))
+        custom = []
+        for alert in candidates:
+            ts = to_timestamp(alert.event_time)
+            if start_ts <= ts < end_ts:
+                custom.append((ts, custom_key(alert.id), f"🔔 {alert.name}"))
+        custom.sort()
+        streams.append(custom)
+        streams.append(recurring_alert_stream(alerts, start_ts, end_ts))
+    return heapq.merge(*streams)
+
+
+def occurrences(events, start, end, alerts=None):
+    """Yield (datetime, key, name) for every occurrence in [start, end), in time order"""
+    for ts, key, name in occurrence_stream(events, to_timestamp(start), to_timestamp(end), alerts):
+        yield (from_timestamp(ts), key, name)
+
+
+class Timeline:
+    """
+    Sorted (timestamp, key, name) occurrences from the start of the current
+    UTC day up to a rolling horizon.
+
+    Built once, advanced incrementally as time passes (passed days are
+    dropped, new occurrences appended at the horizon) and rebuilt only
+    after invalidate(). One-time custom alerts are always included whatever
+    their date since there are finitely many of them; recurring ones are
+    expanded up to the horizon like events.
+    """
+
+    def __init__(self, events, alerts, horizon=DEFAULT_HORIZON):
+        self.events = events
+        self.alerts = alerts
+        self.horizon = horizon
+        self._entries = SortedList()
+        self._start = None  # epoch seconds, inclusive
+        self._end = None  # epoch seconds, exclusive (recurring events only)
+        self.version = 0  # bumped on every invalidate(), for caches derived from the same data
+
+    def invalidate(self):
+        """Forget everything; the next query rebuilds from scratch"""
+        self._start = None
+        self.version += 1
+
+    def _horizon_end(self, now):
+        """The horizon, stretched so every event and recurring alert has its next occurrence before it"""
+        now_ts = to_timestamp(now)
+        end = now_ts + int(self.horizon.total_seconds())
+        recurrences = [event.recurrence for event in self.events.enabled()]
+        recurrences += [alert.recurrence for alert in self.alerts.recurring()]
+        for recurrence in recurrences:
+            ts = recurrence.next_ts(now_ts)
+            if ts is not None and ts >= end:
+                end = ts + 1
+        return end
+
+    def _recurring(self, start, end):
+        return heapq.merge(occurrence_stream(self.events, start, end), recurring_alert_stream(self.alerts, start, end))
+
+    def _rebuild(self, now):
+        start = to_timestamp(day_start(now))
+        end = self._horizon_end(now)
+        entries = list(self._recurring(start, end))
+        for alert in self.alerts:
+            ts = to_timestamp(alert.event_time)
+            if ts >= start:
+                entries.append((ts, custom_key(alert.id), f"🔔 {alert.name}"))
+        self._entries = SortedList(entries)
+        self._start = start
+        self._end = end
+
+    def advance(self, now):
+        """Bring the timeline up to date for `now`, rebuilding only when invalidated"""
+        start = to_timestamp(day_start(now))
+        if self._start is None or start < self._start:
+            self._rebuild(now)
+            return
+        
+        if start > self._start:
+            del self._entries[:self._entries.bisect_left((start,))]
+            self._start = start
+        
+        end = self._horizon_end(now)
+        if end > self._end:
+            self._entries.update(self._recurring(self._end, end))
+            self._end = end
+
+    def day(self, now):
+        """Occurrences on now's UTC day as (datetime, name, finished), in time order"""
+        self.advance(now)
+        now_ts = to_timestamp(now)
+        end = self._start + 86400
+        return [
+            (from_timestamp(ts), name, ts < now_ts)
+            for ts, _, name in self._entries.irange((self._start,), (end,), inclusive=(True, False))
+        ]
+
+    def upcoming(self, now):
+        """Next occurrence of every event and custom alert as (datetime, key, name), in time order"""
+        self.advance(now)
+        wanted = len(self.events.enabled()) + len(self.alerts)
+        seen = set()
+        result = []
+        for ts, key, name in self._entries.irange((to_timestamp(now) + 1,)):
+            if key not in seen:
+                seen.add(key)
+                result.append((from_timestamp(ts), key, name))
+                if len(seen) == wanted:
+                    break
+        return result
+
+    def next(self, now):
+        """The single next occurrence as (datetime, key, name), or None"""
+        self.advance(now)
+        for ts, key, name in self._entries.irange((to_timestamp(now) + 1,)):
+            return (from_timestamp(ts), key, name)
+        return None
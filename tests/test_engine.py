@@ -0,0 +1,86 @@
+"""DeadlineScheduler fires every deadline exactly once, and the full service does over a simulated week."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from reminders.clock import VirtualClock
+from reminders.engine import DeadlineScheduler
+from reminders.events import Event, EventRegistry
+from reminders.recurrence import Recurrence
+from reminders.simulate import Simulation
+
+START = datetime(2026, 3, 1, 0, 0, 30, tzinfo=timezone.utc)
+
+
+def test_each_deadline_fires_once_in_order():
+    clock = VirtualClock(START)
+    engine = DeadlineScheduler(now=clock)
+    fired = []
+
+    async def record(key, when):
+        fired.append((key, when))
+
+    async def scenario():
+        for minutes in (30, 10, 20, 10):
+            key = f"job{minutes}"
+            engine.schedule(key, START + timedelta(minutes=minutes), lambda when, key=key: record(key, when))
+        engine.schedule("gone", START + timedelta(minutes=5), lambda when: record("gone", when))
+        engine.cancel("gone")
+        engine.schedule("moved", START + timedelta(minutes=1), lambda when: record("moved", when))
+        engine.schedule("moved", START + timedelta(minutes=25), lambda when: record("moved", when))
+
+        clock.set(START + timedelta(minutes=20))
+        await engine.fire_due()
+        await engine.fire_due()
+        clock.set(START + timedelta(hours=1))
+        await engine.fire_due()
+
+    asyncio.run(scenario())
+    assert fired == [
+        ("job10", START + timedelta(minutes=10)),
+        ("job20", START + timedelta(minutes=20)),
+        ("moved", START + timedelta(minutes=25)),
+        ("job30", START + timedelta(minutes=30)),
+    ]
+    assert len(engine) == 0
+
+
+def test_run_loop_wakes_for_deadlines_armed_while_sleeping():
+    fired = []
+
+    async def scenario():
+        engine = DeadlineScheduler()
+        engine.start()
+        await asyncio.sleep(0.01)  # asleep with nothing queued
+        now = datetime.now(timezone.utc)
+
+        async def record(when):
+            fired.append(when)
+
+        engine.schedule("soon", now + timedelta(milliseconds=20), record)
+        await asyncio.sleep(0.1)
+        engine.stop()
+
+    asyncio.run(scenario())
+    assert len(fired) == 1
+
+
+def make_events():
+    return EventRegistry([
+        Event('raid', "Raid", Recurrence.every(START + timedelta(hours=5), days=2), "Raid in {ALERT_MINUTES}",
+              alert_before=[60, 10]),
+        Event('siege', "Siege", Recurrence.weekly(6, 20, 0), "Siege in {ALERT_MINUTES}", kind='weekly'),
+    ])
+
+
+@pytest.mark.parametrize("latency", [0, 45])
+def test_simulated_week_has_no_duplicates_or_misses(latency):
+    simulation = Simulation(make_events(), START, wake_latency=timedelta(seconds=latency), test_alert=True)
+    simulation.add_custom_alert(START + timedelta(days=3, minutes=7), "Once", "Once!", alert_before=[30, 5])
+    report = asyncio.run(simulation.run(START + timedelta(days=8)))
+
+    assert report['fires']
+    assert report['duplicates'] == []
+    assert report['misses'] == []
+    assert report['max_lateness'] <= latency
@@ -0,0 +1,29 @@
+"""GuildManager: single-server state adopted by a real guild."""
+import asyncio
+from datetime import datetime, timezone
+
+from reminders.clock import VirtualClock
+from reminders.events import EventRegistry
+from reminders.guilds import GuildManager
+from reminders.service import ReminderService
+from reminders.store import Store
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+async def no_send(*args):
+    pass
+
+
+def test_adopt_default_moves_legacy_state_to_the_guild():
+    store = Store(":memory:")
+    # A single-server install keeps everything under guild 0
+    legacy = ReminderService(EventRegistry(), store, no_send, clock=VirtualClock(NOW))
+    legacy.add_custom_alert(datetime(2026, 3, 3, tzinfo=timezone.utc), "Raid", "Raid soon", 10)
+
+    guilds = GuildManager(store, no_send, "schedule.toml", default_events=EventRegistry(), clock=VirtualClock(NOW))
+    service = asyncio.run(guilds.adopt_default(42, 99))
+    assert guilds.channels[42] == 99
+    assert [alert.name for alert in service.custom_alerts] == ["Raid"]
+    assert store.load_custom_alerts(0) == []
+    store.close()
@@ -0,0 +1,26 @@
+"""Bulk import parsing: valid rows, rejected rows and files that can't be read at all."""
+from datetime import datetime, timezone
+
+import pytest
+
+from reminders.importer import ImportFailed, parse_alerts
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+HEADER = b"name,date,time,message,alert_before\n"
+
+
+def test_csv_rows_are_parsed_and_rejected_individually():
+    data = HEADER + b"Raid,2026-02-01,10:00,Raid soon,\"60,10\"\nBad,2026-02-30,10:00,Nope,\n"
+    entries, rejects = parse_alerts(data, "alerts.csv", NOW)
+    assert entries == [(datetime(2026, 2, 1, 10, 0, tzinfo=timezone.utc), "Raid", "Raid soon", (60, 10))]
+    assert [where for where, _ in rejects] == ["Row 3"]
+
+
+@pytest.mark.parametrize("data, reason", [
+    (HEADER + b'Huge,2026-02-01,10:00,"' + b"x" * 200_000 + b'",10\n', "not valid CSV"),
+    (HEADER + b"Latin,2026-02-01,10:00,caf\xe9,10\n", "not UTF-8"),
+    (b"title,when\nA,B\n", "missing column"),
+])
+def test_malformed_csv_fails_with_a_message(data, reason):
+    with pytest.raises(ImportFailed, match=reason):
+        parse_alerts(data, "alerts.csv", NOW)
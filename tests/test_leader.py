@@ -0,0 +1,108 @@
+"""Leader lease: one holder at a time, renewal, expiry and hand-over; what a new leader does first."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from reminders.clock import VirtualClock
+from reminders.leader import LEASE_SECONDS, LeaderLease
+from reminders.lifecycle import Lifecycle
+from reminders.store import Store
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def make_leases(store, clock):
+    events = []
+    leases = []
+    for holder in ("a", "b"):
+        lease = LeaderLease(store, holder=holder, clock=clock)
+        lease.on_elected = lambda holder=holder: events.append(("elected", holder))
+        lease.on_deposed = lambda holder=holder: events.append(("deposed", holder))
+        leases.append(lease)
+    return leases, events
+
+
+def test_only_one_instance_holds_the_lease():
+    store = Store(":memory:")
+    clock = VirtualClock(NOW)
+    (a, b), events = make_leases(store, clock)
+
+    async def scenario():
+        assert await a.renew()
+        assert not await b.renew()
+        clock.advance(timedelta(seconds=LEASE_SECONDS - 1))
+        assert await a.renew()  # renewing pushes the expiry out again
+        clock.advance(timedelta(seconds=LEASE_SECONDS - 1))
+        assert not await b.renew()
+
+    asyncio.run(scenario())
+    assert events == [("elected", "a")]
+    store.close()
+
+
+def test_standby_takes_over_an_expired_lease():
+    store = Store(":memory:")
+    clock = VirtualClock(NOW)
+    (a, b), events = make_leases(store, clock)
+
+    async def scenario():
+        await a.renew()
+        clock.advance(timedelta(seconds=LEASE_SECONDS + 1))
+        assert await b.renew()
+        assert not await a.renew()
+
+    asyncio.run(scenario())
+    assert events == [("elected", "a"), ("elected", "b"), ("deposed", "a")]
+    store.close()
+
+
+def test_released_lease_is_taken_at_once():
+    store = Store(":memory:")
+    clock = VirtualClock(NOW)
+    (a, b), _ = make_leases(store, clock)
+
+    async def scenario():
+        await a.renew()
+        await asyncio.wrap_future(store.release_lease(a.name, a.holder))
+        assert await b.renew()
+
+    asyncio.run(scenario())
+    store.close()
+
+
+class RecordingService:
+    def __init__(self, calls):
+        self.calls = calls
+        self.store = None
+
+    def reload(self):
+        self.calls.append("reload")
+
+    async def catch_up(self):
+        self.calls.append("catch_up")
+
+    def start(self):
+        self.calls.append("start")
+
+    def stop(self):
+        self.calls.append("stop")
+
+
+class IdleOutbox:
+    def start(self):
+        pass
+
+
+def test_new_leader_reloads_and_runs_startup_writes_before_catching_up():
+    calls = []
+
+    async def on_lead():
+        calls.append("on_lead")
+
+    lifecycle = Lifecycle(RecordingService(calls), IdleOutbox(), lease=object(), on_lead=on_lead)
+    asyncio.run(lifecycle.lead())
+    assert calls == ["reload", "on_lead", "catch_up", "start"]
+    assert lifecycle.leading
+
+    lifecycle.deposed()
+    assert calls[-1] == "stop"
+    assert not lifecycle.leading
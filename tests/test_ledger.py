@@ -0,0 +1,71 @@
+"""Delivery ledger: every alert is claimed once, across restarts and instances sharing a file."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from reminders.clock import VirtualClock
+from reminders.events import EventRegistry
+from reminders.ledger import DeliveryLedger
+from reminders.service import ReminderService
+from reminders.store import Store
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+async def no_send(message):
+    pass
+
+
+def make_service(store, clock):
+    return ReminderService(EventRegistry(), store, no_send, clock=clock, daily_summary=False)
+
+
+def test_ledger_add_and_compact():
+    ledger = DeliveryLedger([("raid", 200, 10, 150), ("raid", 100, 10, 50)])
+    assert len(ledger) == 2
+    assert not ledger.add("raid", 100, 10, 50)
+    assert ledger.add("raid", 100, 60, 40)
+    # Compaction follows append order; rows loaded at startup are sorted by send time first
+    assert ledger.compact(100) == 1
+    assert ("raid", 100, 10) not in ledger
+    assert ("raid", 200, 10) in ledger
+
+
+def test_claim_is_granted_once():
+    clock = VirtualClock(NOW)
+    service = make_service(Store(":memory:"), clock)
+    when = NOW + timedelta(minutes=5)
+
+    async def claims():
+        return [await service.claim("raid", when, 10), await service.claim("raid", when, 10),
+                await service.claim("raid", when, 60)]
+
+    assert asyncio.run(claims()) == [True, False, True]
+    service.store.close()
+
+
+def test_claims_survive_a_restart(tmp_path):
+    path = str(tmp_path / "state.db")
+    clock = VirtualClock(NOW)
+    when = NOW + timedelta(minutes=5)
+
+    first = make_service(Store(path), clock)
+    assert asyncio.run(first.claim("daily_summary", when))
+    first.store.close()
+
+    restarted = make_service(Store(path), clock)
+    assert not asyncio.run(restarted.claim("daily_summary", when))
+    restarted.store.close()
+
+
+def test_instances_sharing_a_file_never_both_claim(tmp_path):
+    path = str(tmp_path / "state.db")
+    clock = VirtualClock(NOW)
+    when = NOW + timedelta(minutes=5)
+    # Both load their (empty) ledgers before either claims
+    one = make_service(Store(path), clock)
+    other = make_service(Store(path), clock)
+
+    assert asyncio.run(one.claim("custom:1", when, 0))
+    assert not asyncio.run(other.claim("custom:1", when, 0))
+    one.store.close()
+    other.store.close()
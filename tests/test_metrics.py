@@ -0,0 +1,22 @@
+"""Prometheus exposition of the scheduler metrics."""
+from types import SimpleNamespace
+
+from reminders.metrics import SchedulerMetrics
+
+
+class FakeGuilds(list):
+    def custom_alert_count(self):
+        return 3
+
+
+def test_running_totals_are_exported_as_counters():
+    metrics = SchedulerMetrics()
+    outbox = SimpleNamespace(depth=2, dropped=5)
+    direct_messages = SimpleNamespace(depth=0, failed=7)
+    metrics.watch(FakeGuilds([1]), outbox, direct_messages)
+    text = metrics.render()
+
+    assert "# TYPE reminders_outbox_dropped_total counter\nreminders_outbox_dropped_total 5\n" in text
+    assert "# TYPE reminders_dm_failed_total counter\nreminders_dm_failed_total 7\n" in text
+    assert "# TYPE reminders_outbox_depth gauge\nreminders_outbox_depth 2\n" in text
+    assert "# TYPE reminders_custom_alerts gauge\nreminders_custom_alerts 3\n" in text
@@ -0,0 +1,116 @@
+"""Outbound posts: merging and splitting, retries and timeouts."""
+import asyncio
+
+from reminders import outbound
+from reminders.outbound import MAX_MESSAGE_LENGTH, merge_messages, send_with_retry, split_message
+
+
+def test_short_messages_are_merged():
+    assert merge_messages(["a", "b", "c"]) == ["a\n\nb\n\nc"]
+    assert merge_messages(["a", "b"], separator="\n") == ["a\nb"]
+
+
+def test_merging_never_crosses_the_limit():
+    contents = ["x" * 900] * 5
+    chunks = merge_messages(contents)
+    assert [len(chunk) for chunk in chunks] == [1802, 1802, 900]
+
+
+def test_oversized_message_is_split_at_line_breaks():
+    lines = [f"line {index} " + "y" * 90 for index in range(60)]
+    content = "\n".join(lines)
+    pieces = split_message(content)
+    assert len(pieces) > 1
+    assert all(len(piece) <= MAX_MESSAGE_LENGTH for piece in pieces)
+    assert "\n".join(pieces) == content
+
+
+def test_unbroken_text_is_cut_at_the_limit():
+    assert split_message("z" * 4500) == ["z" * 2000, "z" * 2000, "z" * 500]
+    assert split_message("word " * 10, limit=12) == ["word word", "word word", "word word", "word word", "word word "]
+
+
+def test_merge_splits_oversized_content():
+    chunks = merge_messages(["short", "q" * 2500, "tail"])
+    assert all(len(chunk) <= MAX_MESSAGE_LENGTH for chunk in chunks)
+    assert "".join(chunk.replace("\n\n", "") for chunk in chunks) == "short" + "q" * 2500 + "tail"
+
+
+def test_timed_out_post_is_not_retried(monkeypatch):
+    monkeypatch.setattr(outbound, "SEND_TIMEOUT", 0.01)
+    monkeypatch.setattr(outbound, "RETRY_BACKOFF", 0)
+    attempts = []
+
+    async def slow(target, content):
+        attempts.append(content)
+        await asyncio.sleep(1)
+
+    error = asyncio.run(send_with_retry(slow, 1, "hello", retry_timeouts=False))
+    assert isinstance(error, asyncio.TimeoutError)
+    assert attempts == ["hello"]
+
+    attempts.clear()
+    asyncio.run(send_with_retry(slow, 1, "hello"))
+    assert len(attempts) == outbound.MAX_ATTEMPTS
+
+
+def run_outbox(scenario, **options):
+    """Run `scenario(outbox)` against an Outbox whose deliveries (and attempts) are recorded"""
+    posts = []
+    attempts = []
+    failures = options.pop("failures", {})
+
+    async def deliver(channel_id, content):
+        attempts.append((channel_id, content))
+        pending = failures.get(content)
+        if pending:
+            raise pending.pop(0)
+        posts.append((channel_id, content))
+
+    async def main():
+        outbox = outbound.Outbox(deliver, coalesce_seconds=0.01, **options)
+        outbox.start()
+        await scenario(outbox)
+        await asyncio.sleep(0.05)  # past the coalescing window
+        while outbox.depth:
+            await asyncio.sleep(0.01)
+        return outbox
+
+    return asyncio.run(main()), posts, attempts
+
+
+def test_outbox_coalesces_per_channel():
+    async def scenario(outbox):
+        for content in ("one", "two", "three"):
+            outbox.enqueue(1, content)
+        outbox.enqueue(2, "other")
+
+    _, posts, _ = run_outbox(scenario)
+    assert sorted(posts) == [(1, "one\n\ntwo\n\nthree"), (2, "other")]
+
+
+def test_outbox_retries_transient_errors_only(monkeypatch):
+    monkeypatch.setattr(outbound, "RETRY_BACKOFF", 0)
+
+    async def scenario(outbox):
+        outbox.enqueue(1, "flaky")
+        await asyncio.sleep(0.05)
+        outbox.enqueue(1, "rejected")
+
+    failures = {"flaky": [ConnectionError(), ConnectionError()], "rejected": [ValueError()]}
+    _, posts, attempts = run_outbox(scenario, failures=failures,
+                                    retryable=lambda error: not isinstance(error, ValueError))
+    assert posts == [(1, "flaky")]
+    assert attempts == [(1, "flaky")] * 3 + [(1, "rejected")]
+
+
+def test_paused_outbox_drops_the_oldest_beyond_its_buffer():
+    async def scenario(outbox):
+        outbox.pause()
+        for content in ("a", "b", "c"):
+            outbox.enqueue(1, content)
+        outbox.resume()
+
+    outbox, posts, _ = run_outbox(scenario, max_buffered=2)
+    assert outbox.dropped == 1
+    assert posts == [(1, "b\n\nc")]
@@ -0,0 +1,84 @@
+"""CronRule.next_ts against a brute-force matcher that walks the calendar minute by minute."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from reminders.recurrence import to_timestamp
+from reminders.rules import CRON_FIELDS, CronRule, RuleError, parse_field
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+RULES = (
+    "0 */6 * * *",
+    "30 6 1,15 * *",
+    "0 0 31 * *",
+    "0 9 * * *",
+    "15 10 * * 0",
+    "15 10 * * 7",
+    "0 12 * * 0,7",
+    "20 8-9 * * mon-fri",
+    "0 18 * * sat,sun",
+    "0 0 1 * 0",
+    "45 23 29 2 *",
+    "0 7 13 * fri",
+    "5 4 * jan,jul sun",
+)
+
+REFERENCES = (
+    datetime(2026, 3, 22, 7, 0, tzinfo=timezone.utc),  # a Sunday
+    datetime(2026, 5, 30, 23, 59, tzinfo=timezone.utc),
+    datetime(2026, 10, 31, 12, 0, tzinfo=timezone.utc),
+    datetime(2026, 12, 31, 23, 30, tzinfo=timezone.utc),
+    datetime(2027, 2, 27, 0, 0, tzinfo=timezone.utc),
+)
+
+
+def brute_force_next(text, after, limit=timedelta(days=5 * 366)):
+    """First minute strictly after `after` that matches, checking each field directly"""
+    minutes, hours, days, months, weekdays = (
+        parse_field(value, *spec) for value, spec in zip(text.split(), CRON_FIELDS)
+    )
+    fields = text.split()
+    moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    end = after + limit
+    while moment < end:
+        cron_weekday = moment.isoweekday() % 7  # Sunday = 0
+        in_month = days >> moment.day & 1
+        in_week = weekdays >> cron_weekday & 1 or (cron_weekday == 0 and weekdays >> 7 & 1)
+        if fields[2] == "*" or fields[4] == "*":
+            day_ok = in_month and in_week
+        else:
+            day_ok = in_month or in_week
+        if not (months >> moment.month & 1 and day_ok):
+            moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            continue
+        if hours >> moment.hour & 1 and minutes >> moment.minute & 1:
+            return moment
+        moment += timedelta(minutes=1)
+    return None
+
+
+@pytest.mark.parametrize("text", RULES)
+@pytest.mark.parametrize("after", REFERENCES)
+def test_next_ts_matches_brute_force(text, after):
+    rule = CronRule(text, START)
+    expected = brute_force_next(text, after)
+    assert rule.next_ts(to_timestamp(after)) == to_timestamp(expected)
+
+
+def test_sunday_matches_for_every_spelling():
+    saturday_night = to_timestamp(datetime(2026, 3, 21, 23, 0, tzinfo=timezone.utc))
+    sunday_noon = to_timestamp(datetime(2026, 3, 22, 12, 0, tzinfo=timezone.utc))
+    for weekdays in ("*", "0", "7", "0,7", "0-7", "sun"):
+        assert CronRule(f"0 12 * * {weekdays}", START).next_ts(saturday_night) == sunday_noon
+
+
+def test_rrule_keeps_sunday():
+    assert "BYDAY" not in CronRule("0 9 * * *", START).rrule()
+    assert CronRule("0 9 * * 0", START).rrule().endswith("BYDAY=SU")
+
+
+@pytest.mark.parametrize("text", ["* * * * *", "*/30 * * * *", "0,15 9 * * *", "0-1 0 1 1 *"])
+def test_rules_firing_more_than_hourly_are_rejected(text):
+    with pytest.raises(RuleError, match="once an hour"):
+        CronRule(text, START)
@@ -0,0 +1,54 @@
+"""ReminderService catch-up on a virtual clock and an in-memory store."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from reminders.clock import VirtualClock
+from reminders.events import EventRegistry
+from reminders.outbound import MAX_MESSAGE_LENGTH
+from reminders.service import ReminderService
+from reminders.store import Store
+
+START = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def make_service(clock, **options):
+    sent = []
+
+    async def sink(message):
+        sent.append(message)
+
+    service = ReminderService(EventRegistry(), Store(":memory:"), sink, clock=clock, daily_summary=False, **options)
+    return service, sent
+
+
+def test_collapsed_catch_up_stays_under_the_message_limit():
+    clock = VirtualClock(START)
+    service, sent = make_service(clock)
+    messages = [f"{index} " + "x" * 1790 for index in range(3)]
+    for index, message in enumerate(messages):
+        service.add_custom_alert(START + timedelta(minutes=5 + index), f"Alert {index}", message, 0)
+
+    clock.advance(timedelta(minutes=20))
+    asyncio.run(service.catch_up(prune=False))
+    service.store.close()
+
+    assert len(sent) == 3
+    assert all(len(post) <= MAX_MESSAGE_LENGTH for post in sent)
+    assert all(post.startswith("⏰ **MISSED WHILE OFFLINE**") for post in sent)
+    for message, post in zip(messages, sent):
+        assert message in post
+
+
+def test_short_missed_alerts_share_one_post():
+    clock = VirtualClock(START)
+    service, sent = make_service(clock)
+    for index in range(3):
+        service.add_custom_alert(START + timedelta(minutes=5 + index), f"Alert {index}", f"Alert {index} now", 0)
+
+    clock.advance(timedelta(minutes=20))
+    asyncio.run(service.catch_up(prune=False))
+    asyncio.run(service.catch_up(prune=False))
+    service.store.close()
+
+    assert len(sent) == 1
+    assert [line.split(" - ")[1] for line in sent[0].splitlines()[2:]] == ["Alert 0 now", "Alert 1 now", "Alert 2 now"]
@@ -0,0 +1,31 @@
+"""Timeline horizon: every recurring item shows up, however far off its next occurrence is."""
+from datetime import datetime, timedelta, timezone
+
+from reminders.alerts import AlertStore
+from reminders.events import Event, EventRegistry
+from reminders.recurrence import Recurrence
+from reminders.timeline import Timeline
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def make_timeline():
+    events = EventRegistry([Event('raid', "Raid", Recurrence.every(NOW + timedelta(hours=1), days=2), "Raid!")])
+    alerts = AlertStore()
+    alerts.create(datetime(2026, 1, 1, tzinfo=timezone.utc), "New Year", "Happy new year", 0, "0 0 1 1 *")
+    return Timeline(events, alerts)
+
+
+def test_rare_cron_alert_is_upcoming():
+    timeline = make_timeline()
+    upcoming = timeline.upcoming(NOW)
+    assert [key for _, key, _ in upcoming] == ['raid', 'custom:1']
+    assert upcoming[1][0] == datetime(2027, 1, 1, tzinfo=timezone.utc)
+
+
+def test_horizon_keeps_up_as_time_passes():
+    timeline = make_timeline()
+    timeline.upcoming(NOW)
+    later = datetime(2027, 1, 1, 0, 1, tzinfo=timezone.utc)
+    assert [(moment, key) for moment, key, _ in timeline.upcoming(later)][1] == \
+        (datetime(2028, 1, 1, tzinfo=timezone.utc), 'custom:1')